@@ -0,0 +1,12 @@
+"""
+Reproducible benchmarks, run from backend/ against a local database.
+
+- `benchmarks.api`: seeded dataset plus a concurrent load run of the main
+  read endpoints through gunicorn, compared against a stored baseline.
+- `benchmarks.pipeline`: sessions/hour through real Celery workers, with the
+  AI providers replaced by the stand-ins in `benchmarks.providers`.
+- `benchmarks.openai_stub`: an OpenAI-compatible HTTP server, so the real
+  providers and the `openai` client can be load- and chaos-tested offline.
+- `benchmarks.scale`: millions of rows for index and query work, loaded by
+  `manage.py seed_scale` with parallel COPY batches.
+"""
@@ -0,0 +1,255 @@
+"""
+API load benchmark: seeded data, a local gunicorn, concurrent clients.
+
+    python -m benchmarks.api seed --therapists 5 --patients 40 --sessions 3
+    python -m benchmarks.api run --concurrency 8 --requests 400
+    python -m benchmarks.api run --save-baseline      # record benchmarks/baseline.json
+    python -m benchmarks.api run --baseline benchmarks/baseline.json
+
+`run` starts gunicorn on a free port (or targets --base-url) with
+PERF_INSTRUMENTATION on and sampling at 100%, so the Server-Timing header
+carries each request's SQL query count. Endpoints are driven one at a time
+so each gets its own throughput and latency numbers; with --baseline the
+command exits non-zero on a regression.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+import django
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = BACKEND_DIR / "benchmarks" / "baseline.json"
+RESULTS_DIR = BACKEND_DIR / "benchmarks" / "results"
+
+# name -> URL template; {session} is a completed session of the requesting therapist
+ENDPOINTS = {
+    "session_list": "/api/v1/sessions/",
+    "session_retrieve": "/api/v1/sessions/{session}/",
+    "dashboard": "/api/v1/dashboard/",
+    "patient_list": "/api/v1/patients/",
+    "report_pdf": "/api/v1/sessions/{session}/report/pdf/",
+}
+
+SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+def setup_django() -> None:
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    django.setup()
+
+
+# --- server ---------------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, threads: int) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "PERF_INSTRUMENTATION": "1",
+        "PERF_SAMPLE_RATE": "1",
+        "PERF_SERVER_TIMING": "1",
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn", "core.wsgi:application",
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(workers),
+            "--threads", str(threads),
+            "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    return process, f"http://127.0.0.1:{port}"
+
+
+def wait_until_ready(base_url: str, timeout: float = 30.0) -> None:
+    import requests
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"{base_url}/api/v1/auth/me/", timeout=5)
+            return
+        except requests.RequestException:  # not listening yet, or still importing the app
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not come up within {timeout:.0f}s")
+
+
+# --- load -----------------------------------------------------------------
+
+def build_targets():
+    """(access token, completed session ids) per seeded therapist."""
+    from benchmarks.seed import bench_therapists
+    from therapy_sessions.models import TherapySession
+    from users.tokens import TherapistRefreshToken
+
+    targets = []
+    for user in bench_therapists():
+        session_ids = list(
+            TherapySession.objects.filter(therapist=user, status="completed").values_list("pk", flat=True)
+        )
+        if session_ids:
+            targets.append((str(TherapistRefreshToken.for_user(user).access_token), session_ids))
+    if not targets:
+        raise SystemExit("No seeded benchmark data; run `python -m benchmarks.api seed` first.")
+    return targets
+
+
+def drive(base_url: str, path_template: str, targets, total: int, concurrency: int, seed: int):
+    """Issue `total` requests over `concurrency` threads; returns latencies, query counts, errors, wall time."""
+    import requests
+
+    local = threading.local()
+    rng = random.Random(seed)
+    plan = []
+    for _ in range(total):
+        token, session_ids = rng.choice(targets)
+        plan.append((token, path_template.format(session=rng.choice(session_ids))))
+
+    def fetch(item):
+        token, path = item
+        http = getattr(local, "session", None)
+        if http is None:
+            http = local.session = requests.Session()  # keep-alive per client thread
+        started = time.perf_counter()
+        try:
+            response = http.get(base_url + path, headers={"Authorization": f"Bearer {token}"}, timeout=60)
+            response.content  # include the body transfer
+        except requests.RequestException:
+            return None, None
+        elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code != 200:
+            return None, None
+        match = SERVER_TIMING_QUERIES.search(response.headers.get("Server-Timing", ""))
+        return elapsed, int(match.group(1)) if match else None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(fetch, plan))
+    wall = time.perf_counter() - started
+
+    latencies = [ms for ms, _ in outcomes if ms is not None]
+    queries = [q for ms, q in outcomes if q is not None]
+    return latencies, queries, len(outcomes) - len(latencies), wall
+
+
+def run(options) -> int:
+    from benchmarks.stats import compare, format_row, load_results, save_results, summarize
+
+    endpoints = options.endpoints or list(ENDPOINTS)
+
+    server = None
+    base_url = options.base_url
+    if not base_url:
+        server, base_url = start_server(options.workers, options.threads)
+    try:
+        wait_until_ready(base_url)
+        targets = build_targets()
+        summaries = {}
+        for name in endpoints:
+            template = ENDPOINTS[name]
+            drive(base_url, template, targets, options.warmup, options.concurrency, options.seed)
+            latencies, queries, errors, wall = drive(
+                base_url, template, targets, options.requests, options.concurrency, options.seed
+            )
+            summaries[name] = summarize(latencies, errors, wall, queries)
+            print(format_row(name, summaries[name]))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    results = {
+        "meta": {
+            "created_at": datetime.now(dt_timezone.utc).isoformat(timespec="seconds"),
+            "concurrency": options.concurrency,
+            "requests": options.requests,
+            "workers": options.workers,
+            "threads": options.threads,
+            "base_url": options.base_url or "local gunicorn",
+        },
+        "endpoints": summaries,
+    }
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    save_results(RESULTS_DIR / f"api-{stamp}.json", results)
+
+    if options.save_baseline:
+        save_results(options.baseline or DEFAULT_BASELINE, results)
+        print(f"baseline written to {options.baseline or DEFAULT_BASELINE}")
+        return 0
+
+    if options.baseline:
+        regressions = compare(summaries, load_results(options.baseline)["endpoints"], options.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"no regressions against {options.baseline} (tolerance {options.tolerance:.0%})")
+    return 0
+
+
+def seed(options) -> int:
+    from benchmarks.seed import describe, seed_dataset
+
+    started = time.perf_counter()
+    result = seed_dataset(
+        therapists=options.therapists,
+        patients_per_therapist=options.patients,
+        sessions_per_patient=options.sessions,
+        transcript_words=options.transcript_words,
+        seed=options.seed,
+    )
+    print(f"seeded {describe(result)} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.api", description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="Replace the benchmark dataset.")
+    seed_parser.add_argument("--therapists", type=int, default=5)
+    seed_parser.add_argument("--patients", type=int, default=40, help="Patients per therapist.")
+    seed_parser.add_argument("--sessions", type=int, default=3, help="Sessions per patient.")
+    seed_parser.add_argument("--transcript-words", type=int, default=4000)
+    seed_parser.add_argument("--seed", type=int, default=42)
+
+    run_parser = commands.add_parser("run", help="Load the API and report latency/throughput.")
+    run_parser.add_argument("--endpoints", nargs="+", choices=list(ENDPOINTS))
+    run_parser.add_argument("--concurrency", type=int, default=8)
+    run_parser.add_argument("--requests", type=int, default=400, help="Measured requests per endpoint.")
+    run_parser.add_argument("--warmup", type=int, default=20)
+    run_parser.add_argument("--workers", type=int, default=4, help="gunicorn workers (local server only).")
+    run_parser.add_argument("--threads", type=int, default=1, help="gunicorn threads per worker.")
+    run_parser.add_argument("--base-url", help="Benchmark a running server instead of starting gunicorn.")
+    run_parser.add_argument("--baseline", help="Compare against this results file.")
+    run_parser.add_argument("--save-baseline", action="store_true", help="Write the results as the baseline.")
+    run_parser.add_argument("--tolerance", type=float, default=0.2)
+    run_parser.add_argument("--seed", type=int, default=42)
+
+    options = parser.parse_args(argv)
+    setup_django()
+    return {"seed": seed, "run": run}[options.command](options)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Deterministic synthetic values for benchmark data: every generator takes a
+`random.Random` so a seed reproduces the same rows.
+"""
+from __future__ import annotations
+
+import io
+import math
+import random
+import wave
+from datetime import date, timedelta
+
+from patients.utils import EGYPT_MOBILE_PREFIXES
+
+FIRST_NAMES = [
+    "Ahmed", "Mohamed", "Mahmoud", "Omar", "Youssef", "Mostafa", "Karim", "Hassan",
+    "Mona", "Salma", "Nour", "Aya", "Mariam", "Yasmin", "Heba", "Dina",
+    "أحمد", "محمد", "محمود", "عمر", "يوسف", "مصطفى", "منى", "سلمى", "نور", "مريم",
+]
+LAST_NAMES = [
+    "Ali", "Ibrahim", "Hussein", "Abdelrahman", "Saleh", "Fathy", "Kamal", "Naguib",
+    "علي", "إبراهيم", "حسين", "صالح", "فتحي", "كمال", "نجيب", "عبدالله",
+]
+
+# governorate codes used in digits 8-9 of the national ID
+GOVERNORATE_CODES = ["01", "02", "03", "04", "11", "12", "13", "14", "15", "16", "17", "18", "19",
+                     "21", "22", "23", "24", "25", "26", "27", "28", "29", "31", "32", "33", "34", "35", "88"]
+
+# Egyptian colloquial session vocabulary; transcripts are sampled sentences from these
+TRANSCRIPT_SENTENCES = [
+    "الأسبوع ده كان صعب شوية في الشغل",
+    "بقيت بنام متأخر ومش بقدر أصحى بدري",
+    "حاسس إن الضغط زاد عليا من ساعة ما بدأت المشروع الجديد",
+    "اتكلمت مع أخويا عن الموضوع اللي قلناه المرة اللي فاتت",
+    "جربت تمرين التنفس اللي اتفقنا عليه وساعدني شوية",
+    "لسه بحس بقلق قبل الاجتماعات",
+    "مراتي لاحظت إني بقيت عصبي أكتر من الأول",
+    "رجعت أمشي الصبح نص ساعة كل يوم",
+    "مش عارف أركز في المذاكرة زي زمان",
+    "الكلام مع أهلي بقى أسهل من الأول",
+    "فيه أيام بحس إني كويس وأيام تانية لا",
+    "كتبت الأفكار اللي بتيجي لي قبل النوم زي ما قلتي",
+    "الأكل بقى قليل ومش بحس بجوع",
+    "قدرت أقول لا لمديري لأول مرة",
+    "حسيت براحة بعد ما اتكلمت عن الموضوع ده",
+    "الخوف من الزحمة لسه موجود بس أقل",
+]
+
+SUMMARY_SENTENCES = [
+    "The client reported moderate improvement in sleep after applying the agreed routine.",
+    "Work-related stress remains the main trigger for anxiety symptoms.",
+    "Breathing exercises were practised twice daily with partial benefit.",
+    "Family communication has improved, with fewer conflicts reported this week.",
+    "The client described persistent worry before meetings and social situations.",
+    "Appetite has decreased and should be monitored over the next sessions.",
+    "Thought records were completed and reviewed together in session.",
+    "The client set a boundary at work for the first time and felt relieved afterwards.",
+]
+KEY_POINTS = [
+    "Sleep onset delayed by roughly two hours",
+    "Anxiety peaks before work meetings",
+    "Daily 30-minute walks resumed",
+    "Reduced appetite over the past week",
+    "Improved communication with family",
+    "Completed thought records between sessions",
+    "Concentration difficulties while studying",
+    "Reports fewer avoidance behaviours in crowds",
+]
+# shaped like reporting.schema.RiskFlag
+RISK_FLAGS = [
+    {"type": "hopelessness", "severity": "medium", "note": "Passive hopelessness statements"},
+    {"type": "eating", "severity": "low", "note": "Significant weight loss"},
+    {"type": "isolation", "severity": "low", "note": "Social withdrawal"},
+    {"type": "self-harm", "severity": "high", "note": "Expressed a wish not to wake up"},
+]
+TREATMENT_STEPS = [
+    "Continue the daily breathing exercise",
+    "Keep a sleep diary for one week",
+    "Gradual exposure to one social situation",
+    "Review thought records next session",
+    "Schedule one pleasant activity per day",
+    "Discuss appetite changes with the GP",
+]
+
+
+def full_name(rng: random.Random) -> str:
+    # three words, as the patient serializer requires
+    return " ".join([rng.choice(FIRST_NAMES), rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)])
+
+
+def national_id(rng: random.Random, serial: int) -> str:
+    """14 digits: century, YYMMDD birth date, governorate, then a sequence built from `serial`."""
+    birth = date(1950, 1, 1) + timedelta(days=rng.randrange(365 * 55))
+    century = "2" if birth.year < 2000 else "3"
+    return f"{century}{birth:%y%m%d}{rng.choice(GOVERNORATE_CODES)}{serial % 100_000:05d}"
+
+
+def mobile_phone(serial: int) -> str:
+    """A valid local mobile number, unique per `serial` (up to 400M)."""
+    prefix = EGYPT_MOBILE_PREFIXES[serial % len(EGYPT_MOBILE_PREFIXES)]
+    return f"{prefix}{serial // len(EGYPT_MOBILE_PREFIXES):08d}"
+
+
+# (sentence, word count), counted once: transcripts are generated by the million
+_TRANSCRIPT_SENTENCE_WORDS = [(sentence, len(sentence.split())) for sentence in TRANSCRIPT_SENTENCES]
+_MAX_SENTENCE_WORDS = max(words for _, words in _TRANSCRIPT_SENTENCE_WORDS)
+
+
+def arabic_transcript(rng: random.Random, words: int) -> str:
+    sentences = []
+    count = 0
+    while count < words:
+        # draw as many sentences as can't overshoot `words`, in one call
+        for sentence, sentence_words in rng.choices(
+            _TRANSCRIPT_SENTENCE_WORDS, k=(words - count) // _MAX_SENTENCE_WORDS + 1
+        ):
+            sentences.append(sentence)
+            count += sentence_words
+            if count >= words:
+                break
+    return "، ".join(sentences) + "."
+
+
+def report_fields(rng: random.Random, risky: bool = False) -> dict:
+    """Content for a completed SessionReport; sizes roughly match what the provider returns."""
+    return {
+        "generated_summary": " ".join(rng.choices(SUMMARY_SENTENCES, k=rng.randint(6, 12))),
+        "key_points": rng.sample(KEY_POINTS, rng.randint(4, 7)),
+        "risk_flags": rng.sample(RISK_FLAGS, rng.randint(1, 3)) if risky else [],
+        "treatment_plan": rng.sample(TREATMENT_STEPS, rng.randint(3, 5)),
+        "model_name": "benchmark-seed",
+    }
+
+
+def wav_bytes(seconds: float, sample_rate: int = 16_000, frequency: float = 220.0) -> bytes:
+    """A mono 16-bit tone; stands in for a recording wherever only size and duration matter."""
+    period = [
+        int(8000 * math.sin(2 * math.pi * frequency * i / sample_rate)).to_bytes(2, "little", signed=True)
+        for i in range(sample_rate)
+    ]
+    second = b"".join(period)
+    frames = second * int(seconds) + second[: int(seconds % 1 * sample_rate) * 2]
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(frames)
+    return buffer.getvalue()
@@ -0,0 +1,334 @@
+"""
+OpenAI-compatible stub server: the real WhisperTranscriptionService and
+OpenAIReportProvider, talking HTTP through the `openai` client, against
+canned but schema-valid outputs.
+
+    python -m benchmarks.openai_stub --port 8089 \\
+        --providers '{"transcribe": {"median": 12, "rate_limit_rate": 0.05}}'
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=stub celery -A core worker
+
+Implements POST /v1/audio/transcriptions and POST /v1/responses, both with
+`stream` support (server-sent events). Latency, 500s and 429s (with
+Retry-After) are drawn per request from the same profiles as
+benchmarks.providers. GET /stats returns per-operation counters and
+throughput; POST /reset zeroes them.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from benchmarks.providers import ProviderProfile
+
+WAV_BYTES_PER_SECOND = 32_000  # 16 kHz mono 16-bit, as uploaded recordings are normalised
+STREAM_CHUNKS = 8
+
+
+class StubStats:
+    """Thread-safe request counters per operation."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.monotonic()
+            self.operations: Dict[str, Dict[str, int]] = {}
+
+    def begin(self, operation: str) -> None:
+        with self._lock:
+            counters = self.operations.setdefault(operation, {
+                "requests": 0, "ok": 0, "rate_limited": 0, "errors": 0, "in_flight": 0, "peak_in_flight": 0,
+            })
+            counters["requests"] += 1
+            counters["in_flight"] += 1
+            counters["peak_in_flight"] = max(counters["peak_in_flight"], counters["in_flight"])
+
+    def end(self, operation: str, status: int) -> None:
+        outcome = "ok" if status == 200 else "rate_limited" if status == 429 else "errors"
+        with self._lock:
+            counters = self.operations[operation]
+            counters["in_flight"] -= 1
+            counters[outcome] += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            return {
+                "uptime_s": round(elapsed, 1),
+                "operations": {
+                    name: {**counters, "ok_per_s": round(counters["ok"] / elapsed, 2) if elapsed else 0.0}
+                    for name, counters in self.operations.items()
+                },
+            }
+
+
+# --- canned outputs (benchmarks.data needs Django set up) -------------------
+
+def transcript_text(rng: random.Random, audio_bytes: int) -> str:
+    from benchmarks import data
+    from benchmarks.providers import WORDS_PER_MINUTE
+
+    minutes = audio_bytes / WAV_BYTES_PER_SECOND / 60
+    return data.arabic_transcript(rng, max(20, int(minutes * WORDS_PER_MINUTE)))
+
+
+def report_json(rng: random.Random) -> str:
+    """A reporting.schema.ReportSchema document."""
+    from benchmarks import data
+
+    content = data.report_fields(rng, risky=rng.random() < 0.1)
+    return json.dumps({
+        "summary": content["generated_summary"],
+        "key_points": content["key_points"],
+        "risk_flags": content["risk_flags"],
+        "treatment_plan": content["treatment_plan"],
+    }, ensure_ascii=False)
+
+
+def response_object(model: str, text: str, status: str = "completed") -> Dict:
+    """A Responses API `response` with one assistant message holding `text`."""
+    output = []
+    if status == "completed":
+        output.append({
+            "id": f"msg_{uuid.uuid4().hex}",
+            "type": "message",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        })
+    return {
+        "id": f"resp_{uuid.uuid4().hex}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": model,
+        "status": status,
+        "output": output,
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": 0,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": len(text.split()),
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": len(text.split()),
+        },
+    }
+
+
+def chunks(text: str, count: int = STREAM_CHUNKS) -> List[str]:
+    size = max(1, -(-len(text) // count))
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+# --- server ---------------------------------------------------------------
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so client connection reuse is visible
+    server: "StubServer"
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler signature
+        pass
+
+    def do_GET(self):
+        if self.path == "/stats":
+            return self._send_json(200, self.server.stats.snapshot())
+        self._send_error(404, "not_found", f"Unknown path {self.path}")
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path == "/reset":
+            self.server.stats.reset()
+            return self._send_json(200, {"reset": True})
+        handlers = {"/v1/audio/transcriptions": self._transcription, "/v1/responses": self._response}
+        handler = handlers.get(self.path)
+        if handler is None:
+            return self._send_error(404, "not_found", f"Unknown path {self.path}")
+        handler(body)
+
+    # --- operations
+
+    def _transcription(self, body: bytes) -> None:
+        form = self._multipart(body)
+        stream = form.get("stream") == b"true"
+        with self.server.operation("transcribe") as (status, seconds, rng):
+            if not self._injected(status, seconds):
+                text = transcript_text(rng, len(form.get("file", b"")))
+                if stream:
+                    self._send_events(seconds, [
+                        ("transcript.text.delta", {"type": "transcript.text.delta", "delta": part})
+                        for part in chunks(text)
+                    ] + [("transcript.text.done", {"type": "transcript.text.done", "text": text})])
+                else:
+                    time.sleep(seconds)
+                    self._send_json(200, {"text": text})
+
+    def _response(self, body: bytes) -> None:
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return self._send_error(400, "invalid_request_error", "Body is not JSON")
+        model = payload.get("model") or "stub"
+        with self.server.operation("report") as (status, seconds, rng):
+            if self._injected(status, seconds):
+                return
+            text = report_json(rng)
+            if not payload.get("stream"):
+                time.sleep(seconds)
+                return self._send_json(200, response_object(model, text))
+
+            created = response_object(model, "", status="in_progress")
+            completed = response_object(model, text)
+            completed["id"] = created["id"]
+            item_id = completed["output"][0]["id"]
+            delta = {"item_id": item_id, "output_index": 0, "content_index": 0, "logprobs": []}
+            events = [("response.created", {"type": "response.created", "response": created})]
+            events += [
+                ("response.output_text.delta", {"type": "response.output_text.delta", "delta": part, **delta})
+                for part in chunks(text)
+            ]
+            events += [
+                ("response.output_text.done", {"type": "response.output_text.done", "text": text, **delta}),
+                ("response.completed", {"type": "response.completed", "response": completed}),
+            ]
+            self._send_events(seconds, events)
+
+    # --- helpers
+
+    def _injected(self, status: int, seconds: float) -> bool:
+        """Answer a drawn 429/500 after its latency; False when the call should succeed."""
+        if status == 200:
+            return False
+        time.sleep(seconds)
+        if status == 429:
+            self._send_error(429, "rate_limit_exceeded", "Rate limit reached (stub)",
+                             headers={"Retry-After": f"{self.server.retry_after:g}"})
+        else:
+            self._send_error(500, "server_error", "Injected upstream error (stub)")
+        return True
+
+    def _multipart(self, body: bytes) -> Dict[str, bytes]:
+        content_type = self.headers.get("Content-Type", "")
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+        )
+        if not message.is_multipart():
+            return {}
+        return {
+            part.get_param("name", header="content-disposition"): part.get_payload(decode=True) or b""
+            for part in message.iter_parts()
+        }
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, code: str, message: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self._send_json(status, {"error": {"message": message, "type": code, "code": code, "param": None}},
+                        headers=headers)
+
+    def _send_events(self, seconds: float, events) -> None:
+        """First event after a fifth of the latency, the rest spread over the remainder."""
+        time.sleep(seconds * 0.2)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")  # no chunked encoding: the stream ends with the connection
+        self.end_headers()
+        self.close_connection = True
+        pause = seconds * 0.8 / max(1, len(events) - 1)
+        for index, (name, event) in enumerate(events):
+            if index:
+                time.sleep(pause)
+            event = {**event, "sequence_number": index}
+            self.wfile.write(f"event: {name}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, profiles: Dict[str, "ProviderProfile"], seed: Optional[int] = None,
+                 retry_after: float = 1.0):
+        super().__init__(address, StubHandler)
+        self.profiles = profiles
+        self.retry_after = retry_after
+        self.stats = StubStats()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def operation(self, name: str):
+        return _Operation(self, name)
+
+
+class _Operation:
+    """Draws the call's outcome, seeds its output, and keeps the counters."""
+
+    def __init__(self, server: StubServer, name: str):
+        self.server = server
+        self.name = name
+
+    def __enter__(self):
+        with self.server._rng_lock:
+            status, seconds = self.server.profiles[self.name].draw(self.server._rng)
+            rng = random.Random(self.server._rng.random())
+        self.status = status
+        self.server.stats.begin(self.name)
+        return status, seconds, rng
+
+    def __exit__(self, exc_type, exc, tb):
+        self.server.stats.end(self.name, 500 if exc_type else self.status)
+        return False
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.openai_stub", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--providers", default="{}", help="Latency/failure profiles as JSON (see benchmarks.providers).")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s.")
+    parser.add_argument("--seed", type=int)
+    options = parser.parse_args(argv)
+
+    from benchmarks.api import setup_django
+
+    setup_django()
+    from benchmarks.providers import load_profiles
+
+    server = StubServer((options.host, options.port), load_profiles(options.providers),
+                        seed=options.seed, retry_after=options.retry_after)
+    print(f"OpenAI stub listening on {server.base_url}; counters at GET /stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+"""
+Pipeline throughput benchmark: real Celery workers and Redis, simulated providers.
+
+    python -m benchmarks.pipeline --sessions 200 --audio-seconds 60 \\
+        --worker prefork:4 --worker threads:8 --worker solo:1 \\
+        --providers '{"transcribe": {"median": 12, "rate_limit_rate": 0.05}}'
+
+For every --worker (pool:concurrency) the harness recreates N uploaded
+sessions with generated WAV audio, starts `celery worker` with
+TRANSCRIPTION_SERVICE_CLASS / REPORT_PROVIDER_CLASS pointed at
+benchmarks.providers, enqueues `transcribe_session` for each session, and
+waits until every session completes or fails. It reports sessions/hour, the
+per-stage latencies from SessionProcessingTimeline, and Postgres load
+(transactions/s, rows read and written per second, peak active backends).
+With --openai-base-url the workers keep the real Whisper and OpenAI
+providers and send their requests to that URL instead, e.g. a running
+`python -m benchmarks.openai_stub`.
+Needs CELERY_BROKER_URL and the benchmark database to be the worker's.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from benchmarks.api import BACKEND_DIR, RESULTS_DIR, setup_django
+
+PIPELINE_EMAIL = "therapist@pipeline.bench.local"
+POLL_SECONDS = 2.0
+
+
+def prepare_sessions(count: int, audio_seconds: float, seed: int):
+    """Fresh pipeline therapist with `count` uploaded sessions; returns their ids."""
+    from django.contrib.auth import get_user_model
+    from django.core.files.base import ContentFile
+    from django.utils import timezone
+
+    from benchmarks import data
+    from benchmarks.seed import BENCH_PASSWORD
+    from patients.models import Patient
+    from therapy_sessions.models import SessionAudio, TherapySession
+    from users.models import TherapistProfile
+
+    User = get_user_model()
+    rng = random.Random(seed)
+
+    User.objects.filter(email=PIPELINE_EMAIL).delete()
+    therapist = User.objects.create_user(email=PIPELINE_EMAIL, password=BENCH_PASSWORD, is_verified=True)
+    TherapistProfile.objects.create(user=therapist, is_completed=True)
+    patient = Patient.objects.create(
+        therapist=therapist,
+        full_name=data.full_name(rng),
+        patient_id=data.national_id(rng, 0),
+        contact_phone=data.mobile_phone(0),
+    )
+    sessions = TherapySession.objects.bulk_create([
+        TherapySession(therapist=therapist, patient=patient, session_date=timezone.now(), status="uploaded")
+        for _ in range(count)
+    ])
+
+    audio = data.wav_bytes(audio_seconds)
+    for session in sessions:
+        SessionAudio.objects.create(
+            session=session,
+            audio_file=ContentFile(audio, name="recording.wav"),
+            original_filename="recording.wav",
+            language_code="ar",
+            duration_seconds=int(audio_seconds),
+        )
+    return [session.pk for session in sessions]
+
+
+# --- worker ---------------------------------------------------------------
+
+def start_worker(pool: str, concurrency: int, providers: str,
+                 openai_base_url: str = "") -> tuple[subprocess.Popen, str]:
+    from django.conf import settings
+
+    name = f"bench-{pool}-{concurrency}-{os.getpid()}@%h"
+    if openai_base_url:
+        # the real Whisper/OpenAI providers, talking to benchmarks.openai_stub
+        env = {
+            **os.environ,
+            "TRANSCRIPTION_SERVICE_CLASS": "",
+            "REPORT_PROVIDER_CLASS": "",
+            "OPENAI_BASE_URL": openai_base_url,
+            "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY") or "stub",
+        }
+    else:
+        env = {
+            **os.environ,
+            "TRANSCRIPTION_SERVICE_CLASS": "benchmarks.providers.SimulatedTranscriptionService",
+            "REPORT_PROVIDER_CLASS": "benchmarks.providers.SimulatedReportProvider",
+            "BENCH_PROVIDERS": providers,
+        }
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "celery", "-A", "core", "worker",
+            f"--pool={pool}",
+            f"--concurrency={concurrency}",
+            "--prefetch-multiplier=1",
+            "-Q", f"celery,{settings.URGENT_REPORT_QUEUE}",
+            "-n", name,
+            "--without-gossip", "--without-mingle",
+            "--loglevel=WARNING",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    return process, name.replace("%h", socket.gethostname())
+
+
+def wait_for_worker(name: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    from core.celery import app
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Worker exited with code {process.returncode}")
+        if app.control.ping(destination=[name], timeout=1.0):
+            return
+    raise RuntimeError(f"Worker {name} did not answer within {timeout:.0f}s")
+
+
+def stop_worker(process: subprocess.Popen) -> None:
+    process.terminate()  # warm shutdown: finish the running tasks
+    try:
+        process.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+# --- measurement ----------------------------------------------------------
+
+def db_counters():
+    """Cumulative Postgres counters for this database, plus backends currently active."""
+    from django.db import connection
+
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT xact_commit + xact_rollback, tup_inserted + tup_updated + tup_deleted,"
+            " tup_returned + tup_fetched FROM pg_stat_database WHERE datname = current_database()"
+        )
+        transactions, written, read = cursor.fetchone()
+        cursor.execute(
+            "SELECT count(*) FROM pg_stat_activity WHERE datname = current_database() AND state = 'active'"
+        )
+        active = cursor.fetchone()[0]
+    return {"transactions": transactions, "rows_written": written, "rows_read": read, "active": active}
+
+
+def db_load(before, after, peak_active: int, seconds: float):
+    if not before or not after or not seconds:
+        return {}
+    return {
+        "transactions_per_s": round((after["transactions"] - before["transactions"]) / seconds, 1),
+        "rows_written_per_s": round((after["rows_written"] - before["rows_written"]) / seconds, 1),
+        "rows_read_per_s": round((after["rows_read"] - before["rows_read"]) / seconds, 1),
+        "peak_active_backends": peak_active,
+    }
+
+
+def stage_latencies(session_ids):
+    """p50/p95/p99 seconds per pipeline stage, from the timeline stamps."""
+    from benchmarks.stats import percentile
+    from dashboard.services.latency import LATENCY_STAGES
+    from therapy_sessions.models import SessionProcessingTimeline
+
+    fields = {field for pair in LATENCY_STAGES.values() for field in pair}
+    rows = list(SessionProcessingTimeline.objects.filter(session_id__in=session_ids).values(*fields))
+
+    latencies = {}
+    for stage, (start, end) in LATENCY_STAGES.items():
+        durations = [(row[end] - row[start]).total_seconds() for row in rows if row[start] and row[end]]
+        if durations:
+            latencies[stage] = {
+                "p50_s": round(percentile(durations, 50), 2),
+                "p95_s": round(percentile(durations, 95), 2),
+                "p99_s": round(percentile(durations, 99), 2),
+            }
+    return latencies
+
+
+def run_config(pool: str, concurrency: int, options) -> dict:
+    from django.db import close_old_connections
+
+    from core.celery import app
+    from therapy_sessions.models import TherapySession
+    from therapy_sessions.services.timeline import mark_stage
+    from therapy_sessions.tasks import transcribe_session
+
+    session_ids = prepare_sessions(options.sessions, options.audio_seconds, options.seed)
+    app.control.purge()
+
+    process, name = start_worker(pool, concurrency, options.providers, options.openai_base_url)
+    try:
+        wait_for_worker(name, process)
+
+        before = db_counters()
+        peak_active = before["active"] if before else 0
+        started = time.monotonic()
+        TherapySession.objects.filter(pk__in=session_ids).update(status="transcribing")
+        for session_id in session_ids:
+            mark_stage(session_id, "uploaded")
+            transcribe_session.delay(session_id)
+
+        pending = set(session_ids)
+        while pending and time.monotonic() - started < options.timeout:
+            time.sleep(POLL_SECONDS)
+            close_old_connections()
+            done = TherapySession.objects.filter(pk__in=pending, status__in=["completed", "failed"])
+            pending -= set(done.values_list("pk", flat=True))
+            sample = db_counters()
+            if sample:
+                peak_active = max(peak_active, sample["active"])
+        elapsed = time.monotonic() - started
+        after = db_counters()
+    finally:
+        stop_worker(process)
+
+    statuses = TherapySession.objects.filter(pk__in=session_ids)
+    completed = statuses.filter(status="completed").count()
+    return {
+        "pool": pool,
+        "concurrency": concurrency,
+        "sessions": len(session_ids),
+        "completed": completed,
+        "failed": statuses.filter(status="failed").count(),
+        "timed_out": len(pending),
+        "seconds": round(elapsed, 1),
+        "sessions_per_hour": round(completed / elapsed * 3600, 1) if elapsed else 0.0,
+        "stages": stage_latencies(session_ids),
+        "db": db_load(before, after, peak_active, elapsed),
+    }
+
+
+def format_config(result: dict) -> str:
+    lines = [
+        f"{result['pool']}:{result['concurrency']:<3} {result['sessions_per_hour']:8.1f} sessions/h  "
+        f"completed={result['completed']} failed={result['failed']} timed_out={result['timed_out']} "
+        f"in {result['seconds']:.0f}s"
+    ]
+    for stage, values in result["stages"].items():
+        lines.append(
+            f"    {stage:<14} p50={values['p50_s']:7.2f}s p95={values['p95_s']:7.2f}s p99={values['p99_s']:7.2f}s"
+        )
+    if result["db"]:
+        db = result["db"]
+        lines.append(
+            f"    db: {db['transactions_per_s']} tx/s, {db['rows_written_per_s']} rows written/s, "
+            f"{db['rows_read_per_s']} rows read/s, peak {db['peak_active_backends']} active backends"
+        )
+    return "\n".join(lines)
+
+
+def parse_worker(value: str) -> tuple[str, int]:
+    pool, _, concurrency = value.partition(":")
+    if pool not in {"prefork", "threads", "solo", "gevent", "eventlet"}:
+        raise argparse.ArgumentTypeError(f"unknown pool {pool!r}")
+    return pool, int(concurrency or 1)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.pipeline", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--audio-seconds", type=float, default=60.0)
+    parser.add_argument("--worker", type=parse_worker, action="append",
+                        help="pool:concurrency, repeatable (default prefork:4).")
+    parser.add_argument("--providers", default="{}", help="Provider profiles as JSON (see benchmarks.providers).")
+    parser.add_argument("--openai-base-url", default="",
+                        help="Use the real providers against this OpenAI-compatible URL (benchmarks.openai_stub).")
+    parser.add_argument("--timeout", type=float, default=1800.0, help="Seconds to wait per worker config.")
+    parser.add_argument("--seed", type=int, default=42)
+    options = parser.parse_args(argv)
+
+    setup_django()
+    from benchmarks.providers import dump_profiles, load_profiles
+    from benchmarks.stats import save_results
+
+    options.providers = dump_profiles(load_profiles(options.providers))  # validate before starting workers
+
+    results = []
+    for pool, concurrency in options.worker or [("prefork", 4)]:
+        result = run_config(pool, concurrency, options)
+        print(format_config(result))
+        results.append(result)
+
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    save_results(RESULTS_DIR / f"pipeline-{stamp}.json", {
+        "meta": {
+            "created_at": datetime.now(dt_timezone.utc).isoformat(timespec="seconds"),
+            "sessions": options.sessions,
+            "audio_seconds": options.audio_seconds,
+            "providers": options.openai_base_url or options.providers,
+        },
+        "configs": results,
+    })
+    return 0 if all(not r["timed_out"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
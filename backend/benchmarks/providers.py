@@ -0,0 +1,159 @@
+"""
+Provider stand-ins for the pipeline benchmark: no network, but the latency,
+failures and rate limiting of the real Whisper and report calls.
+
+Selected with TRANSCRIPTION_SERVICE_CLASS / REPORT_PROVIDER_CLASS and tuned
+by the BENCH_PROVIDERS environment variable (JSON, read in every worker
+process), one profile per operation:
+
+    {"transcribe": {"latency": "lognormal", "median": 12, "sigma": 0.5,
+                    "failure_rate": 0.01, "rate_limit_rate": 0.05},
+     "report": {"latency": "uniform", "low": 3, "high": 9}}
+
+Latency is in seconds: `median` is the fixed value, the lognormal median or
+the exponential mean; `low`/`high` bound the uniform distribution.
+"""
+from __future__ import annotations
+
+import json
+import os
+import random
+import time
+import wave
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, Optional, Tuple
+
+from benchmarks import data
+from therapy_sessions.services.reporting.base import BaseReportProvider, GeneratedReport
+from therapy_sessions.services.transcription.base import BaseTranscriptionService, validate_transcription_output
+
+PROFILES_ENV = "BENCH_PROVIDERS"
+WORDS_PER_MINUTE = 130  # conversational Arabic
+
+DEFAULT_PROFILES = {
+    "transcribe": {"latency": "lognormal", "median": 8.0, "sigma": 0.4},
+    "report": {"latency": "lognormal", "median": 5.0, "sigma": 0.3},
+}
+
+
+class SimulatedProviderError(Exception):
+    """An upstream 5xx."""
+
+    status_code = 500
+
+
+class SimulatedRateLimitError(SimulatedProviderError):
+    """An upstream 429; `retry_after` mirrors the Retry-After header."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: float = 1.0):
+        super().__init__(f"Rate limit reached, retry after {retry_after:g}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class ProviderProfile:
+    latency: str = "fixed"  # fixed | uniform | lognormal | exponential
+    median: float = 0.0
+    sigma: float = 0.5
+    low: float = 0.0
+    high: float = 0.0
+    failure_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+
+    def sample_latency(self, rng: random.Random) -> float:
+        if self.latency == "uniform":
+            return rng.uniform(self.low, self.high)
+        if self.latency == "lognormal":
+            return rng.lognormvariate(0, self.sigma) * self.median
+        if self.latency == "exponential":
+            return rng.expovariate(1 / self.median) if self.median else 0.0
+        return self.median
+
+    def draw(self, rng: random.Random) -> Tuple[int, float]:
+        """(HTTP status, seconds) for one call; 429s are rejected quickly, 500s after the full latency."""
+        roll = rng.random()
+        if roll < self.rate_limit_rate:
+            return 429, min(self.sample_latency(rng), 0.2)
+        if roll < self.rate_limit_rate + self.failure_rate:
+            return 500, self.sample_latency(rng)
+        return 200, self.sample_latency(rng)
+
+    def call(self, rng: random.Random, sleep=time.sleep) -> None:
+        """Spend one call's latency, then raise if this call is drawn as a 429 or an error."""
+        status, seconds = self.draw(rng)
+        sleep(seconds)
+        if status == 429:
+            raise SimulatedRateLimitError()
+        if status >= 500:
+            raise SimulatedProviderError("Simulated upstream error")
+
+
+def load_profiles(raw: Optional[str] = None) -> Dict[str, ProviderProfile]:
+    configured = json.loads(raw if raw is not None else os.getenv(PROFILES_ENV) or "{}")
+    known = {f.name for f in fields(ProviderProfile)}
+    profiles = {}
+    for operation, defaults in DEFAULT_PROFILES.items():
+        values = {**defaults, **configured.get(operation, {})}
+        unknown = set(values) - known
+        if unknown:
+            raise ValueError(f"Unknown {operation} profile keys: {', '.join(sorted(unknown))}")
+        profiles[operation] = ProviderProfile(**values)
+    return profiles
+
+
+def dump_profiles(profiles: Dict[str, ProviderProfile]) -> str:
+    return json.dumps({operation: asdict(profile) for operation, profile in profiles.items()})
+
+
+def _audio_minutes(audio_path: str) -> float:
+    try:
+        with wave.open(audio_path, "rb") as wav:
+            return wav.getnframes() / wav.getframerate() / 60
+    except (wave.Error, EOFError):
+        # compressed formats: assume ~32 kbit/s
+        return os.path.getsize(audio_path) / 4000 / 60
+
+
+class SimulatedTranscriptionService(BaseTranscriptionService):
+    def __init__(self):
+        self.profile = load_profiles()["transcribe"]
+        self.rng = random.Random()
+
+    def transcribe(self, audio_path: str, language: str = "ar") -> Dict:
+        self.profile.call(self.rng)
+        words = max(20, int(_audio_minutes(audio_path) * WORDS_PER_MINUTE))
+        text = data.arabic_transcript(self.rng, words)
+        result = {
+            "raw_text": text,
+            "cleaned_text": text,
+            "language": language or "ar",
+            "word_count": len(text.split()),
+            "model_name": "simulated-whisper",
+        }
+        validate_transcription_output(result)
+        return result
+
+
+class SimulatedReportProvider(BaseReportProvider):
+    def __init__(self):
+        self.profile = load_profiles()["report"]
+        self.rng = random.Random()
+
+    def generate(
+        self,
+        *,
+        transcript_text: str,
+        session_context: Optional[Dict[str, Any]] = None,
+        language: str = "ar",
+    ) -> GeneratedReport:
+        self.profile.call(self.rng)
+        content = data.report_fields(self.rng, risky=self.rng.random() < 0.1)
+        return GeneratedReport(
+            summary=content["generated_summary"],
+            key_points=content["key_points"],
+            risk_flags=content["risk_flags"],
+            treatment_plan=content["treatment_plan"],
+            model_name="simulated-report",
+        )
@@ -0,0 +1,355 @@
+"""
+Large synthetic datasets for index and query work (`manage.py seed_scale`).
+
+Rows are generated per patient from a `random.Random` seeded with the seed
+and the patient's serial, so a seed and the three totals reproduce the same
+content whatever the batch size or number of workers. Patients are loaded in chunks; each chunk (the
+patients, their sessions, transcripts, reports and timelines) is one
+transaction of PostgreSQL COPYs, and chunks run in parallel worker
+processes with their own connections.
+
+Scale therapists are recognised by SCALE_EMAIL_DOMAIN and replaced on every
+run. Signals do not fire for COPY: search vectors stay NULL (run
+`rebuild_search_index --missing-only`) and dashboard counters are rebuilt
+on first read.
+"""
+from __future__ import annotations
+
+import io
+import json
+import multiprocessing
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from benchmarks import data
+from benchmarks.seed import BENCH_PASSWORD
+from patients.models import Patient
+from therapy_sessions.models import (
+    SessionProcessingTimeline,
+    SessionReport,
+    SessionTranscript,
+    TherapySession,
+)
+from users.models import TherapistProfile
+from users.services import purge_patients, purge_sessions
+
+User = get_user_model()
+
+SCALE_EMAIL_DOMAIN = "scale.bench.local"
+MAX_PATIENTS_PER_THERAPIST = 100_000  # national IDs carry the serial in 5 digits
+
+# share of sessions per status, every TherapySession status represented
+STATUS_WEIGHTS = {
+    "completed": 78,
+    "empty": 5,
+    "uploaded": 3,
+    "recorded": 2,
+    "transcribing": 3,
+    "analyzing": 3,
+    "failed": 6,
+}
+
+@dataclass
+class ScaleOptions:
+    therapists: int
+    patients: int
+    sessions: int
+    transcript_words: int = 1500
+    days: int = 365
+    seed: int = 42
+
+
+@dataclass
+class ChunkResult:
+    patients: int = 0
+    sessions: int = 0
+    transcripts: int = 0
+    reports: int = 0
+    timelines: int = 0
+
+    def add(self, other: "ChunkResult") -> None:
+        for name in self.__dataclass_fields__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+
+# --- COPY -----------------------------------------------------------------
+
+NULL = r"\N"
+# COPY text format: backslash escapes, tab-separated, one row per line
+_ESCAPES = [("\\", "\\\\"), ("\t", "\\t"), ("\n", "\\n"), ("\r", "\\r")]
+
+
+def _encode(value) -> str:
+    if value is None:
+        return NULL
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value, ensure_ascii=False)
+    elif not isinstance(value, str):
+        return str(value)
+    for char, escaped in _ESCAPES:
+        if char in value:
+            value = value.replace(char, escaped)
+    return value
+
+
+def copy_rows(cursor, model, rows: List[Dict]) -> int:
+    """
+    COPY `rows` (attname -> value) into `model`'s table. Fields missing from
+    the rows get their model default; the primary key is only sent when the
+    rows carry one.
+    """
+    if not rows:
+        return 0
+    fields = [
+        field for field in model._meta.concrete_fields
+        if not field.primary_key or field.attname in rows[0]
+    ]
+    defaults = {field.attname: field.get_default() for field in fields}
+
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join([_encode(row.get(field.attname, defaults[field.attname])) for field in fields]))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+    cursor.copy_expert(f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) FROM STDIN", buffer)
+    return len(rows)
+
+
+def reserve_ids(cursor, model, count: int) -> List[int]:
+    """`count` primary keys from the table's sequence; safe across concurrent workers."""
+    table = model._meta.db_table
+    cursor.execute(
+        "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+        [table, model._meta.pk.column, count],
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+# --- generation -----------------------------------------------------------
+
+def sessions_of(serial: int, options: ScaleOptions) -> range:
+    """Session serials owned by patient `serial`: the totals split as evenly as possible."""
+    return range(serial * options.sessions // options.patients, (serial + 1) * options.sessions // options.patients)
+
+
+def therapist_of(serial: int, options: ScaleOptions) -> int:
+    return serial * options.therapists // options.patients
+
+
+def generate_patient(serial: int, therapist_id: int, options: ScaleOptions, now: datetime):
+    """A patient row and its sessions, each session with its transcript/report/timeline rows or None."""
+    rng = random.Random(f"{options.seed}:{serial}")
+    statuses, weights = zip(*STATUS_WEIGHTS.items())
+
+    first_seen = now - timedelta(days=rng.randrange(options.days), minutes=rng.randrange(24 * 60))
+    patient = {
+        "therapist_id": therapist_id,
+        "full_name": data.full_name(rng),
+        "patient_id": data.national_id(rng, serial),
+        "gender": rng.choice(["male", "female"]),
+        "contact_phone": data.mobile_phone(serial),
+        "created_at": first_seen,
+        "updated_at": first_seen,
+    }
+
+    sessions = []
+    for _ in sessions_of(serial, options):
+        status = rng.choices(statuses, weights)[0]
+        session_date = first_seen + (now - first_seen) * rng.random()
+        duration = rng.choice([45, 50, 60])
+        session = {
+            "therapist_id": therapist_id,
+            "session_date": session_date,
+            "duration_minutes": duration,
+            "status": status,
+            "notes_before": "Follow-up on last week's homework.",
+            "created_at": session_date,
+            "updated_at": session_date,
+        }
+
+        failed_stage = rng.choice(["transcribe", "analyze"]) if status == "failed" else ""
+        if failed_stage:
+            session["last_error_stage"] = failed_stage
+            session["last_error_message"] = "Provider timed out"
+
+        uploaded = session_date + timedelta(minutes=duration)
+        transcribed = uploaded + timedelta(seconds=5 + rng.lognormvariate(0, 0.4) * duration * 6)
+        analyzed = transcribed + timedelta(seconds=5 + rng.lognormvariate(0, 0.3) * 20)
+
+        transcript = report = timeline = None
+        if status in ("completed", "analyzing") or failed_stage == "analyze":
+            words = rng.randint(options.transcript_words // 2, options.transcript_words * 3 // 2)
+            text = data.arabic_transcript(rng, words)
+            transcript = {
+                "raw_transcript": text,
+                "cleaned_transcript": text,
+                "language_code": "ar",
+                "word_count": len(text.split()),
+                "model_name": "benchmark-scale",
+                "status": "completed",
+                "created_at": transcribed,
+                "updated_at": transcribed,
+            }
+        if status == "completed":
+            report = {
+                **data.report_fields(rng, risky=rng.random() < 0.1),
+                "model_name": "benchmark-scale",
+                "status": "completed",
+                "created_at": analyzed,
+                "updated_at": analyzed,
+            }
+            session["updated_at"] = analyzed
+            timeline = {
+                "uploaded_at": uploaded,
+                "transcription_started_at": uploaded + timedelta(seconds=rng.uniform(1, 5)),
+                "transcription_finished_at": transcribed,
+                "analysis_started_at": transcribed + timedelta(seconds=rng.uniform(1, 5)),
+                "analysis_finished_at": analyzed,
+                "completed_at": analyzed,
+                "created_at": uploaded,
+                "updated_at": analyzed,
+            }
+        elif failed_stage:
+            failed_at = transcribed if failed_stage == "transcribe" else analyzed
+            if failed_stage == "analyze":
+                report = {"status": "failed", "created_at": failed_at, "updated_at": failed_at}
+            session["updated_at"] = failed_at
+            timeline = {
+                "uploaded_at": uploaded,
+                "failed_at": failed_at,
+                "failed_stage": "transcription" if failed_stage == "transcribe" else "analysis",
+                "created_at": uploaded,
+                "updated_at": failed_at,
+            }
+        sessions.append((session, transcript, report, timeline))
+    return patient, sessions
+
+
+def load_chunk(serials: range, therapist_ids: List[int], options: ScaleOptions, now: datetime) -> ChunkResult:
+    """Generate and COPY the patients in `serials` with everything they own, in one transaction."""
+    generated = [
+        generate_patient(serial, therapist_ids[therapist_of(serial, options)], options, now)
+        for serial in serials
+    ]
+    result = ChunkResult()
+    with transaction.atomic(), connection.cursor() as cursor:
+        patient_ids = iter(reserve_ids(cursor, Patient, len(generated)))
+        session_ids = iter(reserve_ids(cursor, TherapySession, sum(len(s) for _, s in generated)))
+
+        patients, sessions, transcripts, reports, timelines = [], [], [], [], []
+        for patient, patient_sessions in generated:
+            patient["id"] = next(patient_ids)
+            patients.append(patient)
+            for session, transcript, report, timeline in patient_sessions:
+                session["id"] = next(session_ids)
+                session["patient_id"] = patient["id"]
+                sessions.append(session)
+                for rows, row in ((transcripts, transcript), (reports, report), (timelines, timeline)):
+                    if row is not None:
+                        row["session_id"] = session["id"]
+                        rows.append(row)
+
+        result.patients = copy_rows(cursor, Patient, patients)
+        result.sessions = copy_rows(cursor, TherapySession, sessions)
+        result.transcripts = copy_rows(cursor, SessionTranscript, transcripts)
+        result.reports = copy_rows(cursor, SessionReport, reports)
+        result.timelines = copy_rows(cursor, SessionProcessingTimeline, timelines)
+    return result
+
+
+def _load_chunk_task(args) -> ChunkResult:
+    return load_chunk(*args)
+
+
+def _init_worker() -> None:
+    import django
+
+    django.setup()  # no-op under fork; spawned workers start from scratch
+
+
+# --- dataset --------------------------------------------------------------
+
+def scale_therapists():
+    return User.objects.filter(email__endswith=f"@{SCALE_EMAIL_DOMAIN}").order_by("pk")
+
+
+def clear_scale_dataset() -> int:
+    """
+    Remove the scale therapists. Their sessions and patients go first through
+    the account-deletion service's chunked raw DELETEs: a cascading ORM delete
+    would load every row to send signals.
+    """
+    therapist_ids = list(scale_therapists().values_list("pk", flat=True))
+    if not therapist_ids:
+        return 0
+    purge_sessions(TherapySession.objects.filter(therapist_id__in=therapist_ids))
+    purge_patients(Patient.objects.filter(therapist_id__in=therapist_ids))
+    scale_therapists().delete()
+    return len(therapist_ids)
+
+
+def create_therapists(count: int) -> List[int]:
+    password = make_password(BENCH_PASSWORD)  # hashed once, it is the slow part
+    users = User.objects.bulk_create([
+        User(email=f"therapist-{i:06d}@{SCALE_EMAIL_DOMAIN}", password=password, is_therapist=True, is_verified=True)
+        for i in range(count)
+    ], batch_size=1000)
+    TherapistProfile.objects.bulk_create([
+        TherapistProfile(user=user, specialization="CBT", is_completed=True) for user in users
+    ], batch_size=1000)
+    return [user.pk for user in users]
+
+
+def chunks(options: ScaleOptions, batch_size: int) -> Iterator[range]:
+    """Patient serial ranges holding about `batch_size` sessions each."""
+    per_chunk = max(1, batch_size * options.patients // max(options.sessions, 1))
+    for start in range(0, options.patients, per_chunk):
+        yield range(start, min(start + per_chunk, options.patients))
+
+
+def seed_scale(options: ScaleOptions, workers: int = 1, batch_size: int = 5000,
+               progress=None, now: Optional[datetime] = None) -> ChunkResult:
+    """
+    Replace the scale dataset. `progress(total_so_far)` is called after each
+    chunk; `now` anchors the generated dates (defaults to the current time).
+    """
+    if options.patients > options.therapists * MAX_PATIENTS_PER_THERAPIST:
+        raise ValueError(f"At most {MAX_PATIENTS_PER_THERAPIST} patients per therapist.")
+
+    now = now or timezone.now()
+    clear_scale_dataset()
+    therapist_ids = create_therapists(options.therapists)
+
+    tasks = [(serials, therapist_ids, options, now) for serials in chunks(options, batch_size)]
+    total = ChunkResult()
+
+    def collect(results):
+        for result in results:
+            total.add(result)
+            if progress:
+                progress(total)
+
+    if workers <= 1:
+        collect(map(_load_chunk_task, tasks))
+    else:
+        connections.close_all()  # forked workers must not share the parent's connection
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            collect(pool.imap_unordered(_load_chunk_task, tasks))
+
+    with connection.cursor() as cursor:
+        for model in (Patient, TherapySession, SessionTranscript, SessionReport, SessionProcessingTimeline):
+            cursor.execute(f"ANALYZE {model._meta.db_table}")
+    return total
@@ -0,0 +1,157 @@
+"""
+Seed the dataset the API benchmark runs against.
+
+Benchmark therapists are recognised by BENCH_EMAIL_DOMAIN; seeding deletes
+them (and everything they own) first, so a given seed and size always
+produce the same rows.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from benchmarks import data
+from patients.models import Patient
+from therapy_sessions.models import SessionReport, SessionTranscript, TherapySession
+from therapy_sessions.services.search import rebuild_search_vectors
+from users.models import TherapistProfile
+
+User = get_user_model()
+
+BENCH_EMAIL_DOMAIN = "bench.local"
+BENCH_PASSWORD = "bench-password"
+BATCH_SIZE = 500
+
+# share of sessions per status; only completed sessions carry a transcript and report
+STATUS_WEIGHTS = {
+    "completed": 80,
+    "empty": 6,
+    "uploaded": 3,
+    "transcribing": 3,
+    "analyzing": 3,
+    "failed": 5,
+}
+
+
+@dataclass
+class SeedResult:
+    therapists: int
+    patients: int
+    sessions: int
+    transcripts: int
+    reports: int
+
+
+def bench_therapists():
+    return User.objects.filter(email__endswith=f"@{BENCH_EMAIL_DOMAIN}").order_by("pk")
+
+
+def clear_dataset() -> int:
+    deleted, _ = bench_therapists().delete()
+    return deleted
+
+
+def seed_dataset(
+    therapists: int = 5,
+    patients_per_therapist: int = 40,
+    sessions_per_patient: int = 3,
+    transcript_words: int = 4000,
+    seed: int = 42,
+) -> SeedResult:
+    """
+    `transcript_words` defaults to about a 45-minute session; raw and
+    cleaned transcripts are both stored, as the pipeline does.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    statuses, weights = zip(*STATUS_WEIGHTS.items())
+
+    clear_dataset()
+
+    with transaction.atomic():
+        password = make_password(BENCH_PASSWORD)  # hashed once, it is the slow part
+        users = User.objects.bulk_create([
+            User(
+                email=f"therapist-{i:03d}@{BENCH_EMAIL_DOMAIN}",
+                password=password,
+                is_therapist=True,
+                is_verified=True,
+            )
+            for i in range(therapists)
+        ])
+        TherapistProfile.objects.bulk_create([
+            TherapistProfile(user=user, specialization="CBT", is_completed=True) for user in users
+        ])
+
+        patients = Patient.objects.bulk_create(
+            [
+                Patient(
+                    therapist=user,
+                    full_name=data.full_name(rng),
+                    patient_id=data.national_id(rng, serial),
+                    gender=rng.choice(["male", "female"]),
+                    contact_phone=data.mobile_phone(serial),
+                )
+                for t, user in enumerate(users)
+                for serial in range(t * patients_per_therapist, (t + 1) * patients_per_therapist)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+        sessions = TherapySession.objects.bulk_create(
+            [
+                TherapySession(
+                    therapist_id=patient.therapist_id,
+                    patient=patient,
+                    session_date=now - timedelta(days=rng.randrange(180), minutes=rng.randrange(600)),
+                    duration_minutes=rng.choice([45, 50, 60]),
+                    status=rng.choices(statuses, weights)[0],
+                    notes_before="Follow-up on last week's homework.",
+                )
+                for patient in patients
+                for _ in range(sessions_per_patient)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+        completed = [s for s in sessions if s.status == "completed"]
+        transcripts, reports = [], []
+        for session in completed:
+            text = data.arabic_transcript(rng, rng.randint(transcript_words // 2, transcript_words * 3 // 2))
+            transcripts.append(SessionTranscript(
+                session=session,
+                raw_transcript=text,
+                cleaned_transcript=text,
+                language_code="ar",
+                word_count=len(text.split()),
+                model_name="benchmark-seed",
+                status="completed",
+            ))
+            reports.append(SessionReport(
+                session=session,
+                status="completed",
+                **data.report_fields(rng, risky=rng.random() < 0.1),
+            ))
+        SessionTranscript.objects.bulk_create(transcripts, batch_size=BATCH_SIZE // 5)
+        SessionReport.objects.bulk_create(reports, batch_size=BATCH_SIZE)
+
+    # bulk_create skips the indexing signals
+    rebuild_search_vectors([s.pk for s in sessions])
+
+    return SeedResult(
+        therapists=len(users),
+        patients=len(patients),
+        sessions=len(sessions),
+        transcripts=len(transcripts),
+        reports=len(reports),
+    )
+
+
+def describe(result: SeedResult) -> str:
+    return ", ".join(f"{count} {name}" for name, count in asdict(result).items())
@@ -0,0 +1,76 @@
+"""Latency summaries and baseline comparison shared by the benchmark runners."""
+from __future__ import annotations
+
+import json
+import statistics
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+
+def percentile(values: Sequence[float], pct: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def summarize(latencies_ms: List[float], errors: int, wall_seconds: float,
+              queries: Optional[List[int]] = None) -> Dict[str, float]:
+    """Successful-request latency percentiles, throughput, and SQL queries per request."""
+    summary = {
+        "requests": len(latencies_ms) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(latencies_ms) / wall_seconds, 2) if wall_seconds else 0.0,
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+    }
+    if queries:
+        summary["queries_per_request"] = round(statistics.fmean(queries), 1)
+    return summary
+
+
+def format_row(name: str, summary: Dict[str, float]) -> str:
+    queries = summary.get("queries_per_request")
+    return (
+        f"{name:<18} n={summary['requests']:<5} err={summary['errors']:<3} "
+        f"{summary['throughput_rps']:8.1f} req/s  p50={summary['p50_ms']:7.1f}ms "
+        f"p95={summary['p95_ms']:7.1f}ms p99={summary['p99_ms']:7.1f}ms"
+        + (f"  queries={queries:g}" if queries is not None else "")
+    )
+
+
+def load_results(path) -> Dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def save_results(path, results: Dict) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def compare(current: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float = 0.2) -> List[str]:
+    """
+    Regressions of `current` against `baseline` (both name -> summary): p95
+    or p99 slower, or throughput lower, by more than `tolerance`; any
+    increase in queries per request; any errors where the baseline had none.
+    """
+    regressions = []
+    for name, now in current.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            if before.get(key) and now[key] > before[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {before[key]:.1f} -> {now[key]:.1f}")
+        if before.get("throughput_rps") and now["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {before['throughput_rps']:.1f} -> {now['throughput_rps']:.1f} req/s"
+            )
+        if "queries_per_request" in before and now.get("queries_per_request", 0) > before["queries_per_request"]:
+            regressions.append(
+                f"{name}: queries/request {before['queries_per_request']:g} -> {now['queries_per_request']:g}"
+            )
+        if now["errors"] and not before.get("errors"):
+            regressions.append(f"{name}: {now['errors']} errors (baseline had none)")
+    return regressions
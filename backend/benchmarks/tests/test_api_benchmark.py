@@ -0,0 +1,54 @@
+import pytest
+
+from benchmarks.seed import bench_therapists, seed_dataset
+from benchmarks.stats import compare, summarize
+from patients.models import Patient
+from patients.utils import EGYPT_MOBILE_PREFIXES
+from therapy_sessions.models import SessionReport, TherapySession
+
+
+def _dataset():
+    return sorted(
+        TherapySession.objects.filter(therapist__in=bench_therapists())
+        .values_list("patient__patient_id", "status", "transcript__word_count")
+    )
+
+
+@pytest.mark.django_db
+class TestSeed:
+    def test_same_seed_same_rows(self):
+        result = seed_dataset(therapists=2, patients_per_therapist=5, sessions_per_patient=2,
+                              transcript_words=200, seed=7)
+        first = _dataset()
+        seed_dataset(therapists=2, patients_per_therapist=5, sessions_per_patient=2,
+                     transcript_words=200, seed=7)
+
+        assert result.sessions == 20
+        assert _dataset() == first
+        assert SessionReport.objects.filter(session__therapist__in=bench_therapists()).count() == result.reports
+
+    def test_patients_pass_field_rules(self):
+        seed_dataset(therapists=1, patients_per_therapist=20, sessions_per_patient=1, transcript_words=50)
+
+        for national_id, phone, name in Patient.objects.values_list("patient_id", "contact_phone", "full_name"):
+            assert len(national_id) == 14 and national_id.isdigit()
+            assert len(phone) == 11 and phone.startswith(EGYPT_MOBILE_PREFIXES)
+            assert len(name.split()) == 3
+
+
+class TestCompare:
+    def test_flags_latency_throughput_and_query_regressions(self):
+        baseline = {"session_list": summarize([10.0] * 50, 0, 1.0, [3] * 50)}
+        current = {"session_list": summarize([10.0] * 45 + [40.0] * 5, 0, 2.0, [4] * 50)}
+
+        regressions = compare(current, baseline, tolerance=0.2)
+
+        assert any("p99_ms" in line for line in regressions)
+        assert any("throughput" in line for line in regressions)
+        assert any("queries/request 3 -> 4" in line for line in regressions)
+
+    def test_within_tolerance(self):
+        baseline = {"patient_list": summarize([10.0] * 50, 0, 1.0, [2] * 50)}
+        current = {"patient_list": summarize([11.0] * 50, 0, 1.1, [2] * 50)}
+
+        assert compare(current, baseline, tolerance=0.2) == []
@@ -0,0 +1,96 @@
+import json
+import threading
+import urllib.request
+
+import openai
+import pytest
+
+from benchmarks import data
+from benchmarks.openai_stub import StubServer
+from benchmarks.providers import load_profiles
+from therapy_sessions.services import openai_client as openai_client_module
+from therapy_sessions.services.openai_client import openai_client
+from therapy_sessions.services.reporting.llm import OpenAIReportProvider
+from therapy_sessions.services.reporting.schema import ReportSchema
+from therapy_sessions.services.transcription.whisper import WhisperTranscriptionService
+
+NO_LATENCY = '{"transcribe": {"latency": "fixed", "median": 0}, "report": {"latency": "fixed", "median": 0}}'
+ALWAYS_429 = '{"transcribe": {"median": 0, "rate_limit_rate": 1}, "report": {"median": 0, "rate_limit_rate": 1}}'
+
+
+def start_stub(profiles: str) -> StubServer:
+    server = StubServer(("127.0.0.1", 0), load_profiles(profiles), seed=1, retry_after=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def stub(settings):
+    server = start_stub(NO_LATENCY)
+    settings.OPENAI_BASE_URL = server.base_url
+    settings.OPENAI_API_KEY = "stub-key"
+    settings.OPENAI_MAX_RETRIES = 0
+    openai_client_module._clients.clear()
+    yield server
+    openai_client_module._clients.clear()
+    server.shutdown()
+    server.server_close()
+
+
+def get_json(url: str):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return json.loads(response.read())
+
+
+def test_whisper_service_transcribes_through_the_stub(stub, tmp_path):
+    audio = tmp_path / "recording.wav"
+    audio.write_bytes(data.wav_bytes(30))
+
+    result = WhisperTranscriptionService().transcribe(str(audio))
+
+    assert result["model_name"] == "whisper-1"
+    assert result["word_count"] >= 20
+    assert get_json(stub.base_url.replace("/v1", "/stats"))["operations"]["transcribe"]["ok"] == 1
+
+
+def test_report_provider_parses_the_stub_response(stub):
+    report = OpenAIReportProvider().generate(transcript_text="الأسبوع ده كان صعب شوية في الشغل")
+
+    assert report.summary
+    assert report.key_points and report.treatment_plan
+    assert report.raw["status"] == "completed"
+
+
+def test_streamed_response_ends_with_a_schema_valid_report(stub):
+    events = list(openai_client("stub-key").responses.create(model="stub", input="hi", stream=True))
+
+    assert events[0].type == "response.created"
+    assert events[-1].type == "response.completed"
+    deltas = "".join(event.delta for event in events if event.type == "response.output_text.delta")
+    assert ReportSchema.model_validate_json(deltas) == ReportSchema.model_validate_json(events[-1].response.output_text)
+
+
+def test_injected_429_surfaces_as_rate_limit_error(settings):
+    server = start_stub(ALWAYS_429)
+    settings.OPENAI_BASE_URL = server.base_url
+    settings.OPENAI_MAX_RETRIES = 1
+    openai_client_module._clients.clear()
+    try:
+        with pytest.raises(openai.RateLimitError):
+            openai_client("stub-key").responses.create(model="stub", input="hi")
+        counters = get_json(server.base_url.replace("/v1", "/stats"))["operations"]["report"]
+    finally:
+        openai_client_module._clients.clear()
+        server.shutdown()
+        server.server_close()
+
+    assert counters["requests"] == 2  # the client retried once, honouring Retry-After
+    assert counters["rate_limited"] == 2
+    assert counters["in_flight"] == 0
+
+
+def test_client_is_shared_per_configuration(stub, settings):
+    assert openai_client("stub-key") is openai_client("stub-key")
+
+    settings.OPENAI_TIMEOUT = 5
+    assert openai_client("stub-key") is not openai_client_module._clients[("stub-key", stub.base_url, 120.0, 0)]
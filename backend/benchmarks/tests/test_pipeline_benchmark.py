@@ -0,0 +1,92 @@
+import random
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from benchmarks import data
+from benchmarks.pipeline import stage_latencies
+from benchmarks.providers import (
+    ProviderProfile,
+    SimulatedProviderError,
+    SimulatedRateLimitError,
+    SimulatedReportProvider,
+    load_profiles,
+)
+from therapy_sessions.models import SessionProcessingTimeline, SessionTranscript
+from therapy_sessions.services.reporting import get_report_provider
+from therapy_sessions.tasks import transcribe_session
+
+NO_LATENCY = '{"transcribe": {"latency": "fixed", "median": 0}, "report": {"latency": "fixed", "median": 0}}'
+
+
+class TestProviderProfile:
+    def test_draws_rate_limits_and_failures_at_configured_rates(self):
+        profile = ProviderProfile(latency="fixed", median=1.0, failure_rate=0.1, rate_limit_rate=0.2)
+        rng = random.Random(1)
+        outcomes = {"ok": 0, "429": 0, "500": 0}
+        slept = []
+
+        for _ in range(2000):
+            try:
+                profile.call(rng, sleep=slept.append)
+                outcomes["ok"] += 1
+            except SimulatedRateLimitError:
+                outcomes["429"] += 1
+            except SimulatedProviderError:
+                outcomes["500"] += 1
+
+        assert 350 < outcomes["429"] < 450
+        assert 150 < outcomes["500"] < 250
+        assert max(slept) == 1.0 and min(slept) == 0.2  # 429s are rejected quickly
+
+    def test_lognormal_median(self):
+        profile = ProviderProfile(latency="lognormal", median=10.0, sigma=0.5)
+        rng = random.Random(3)
+        samples = sorted(profile.sample_latency(rng) for _ in range(2001))
+
+        assert 9.0 < samples[1000] < 11.0
+
+    def test_unknown_profile_keys_are_rejected(self):
+        with pytest.raises(ValueError):
+            load_profiles('{"report": {"p95": 3}}')
+        assert load_profiles('{"report": {"median": 2}}')["report"].latency == "lognormal"
+
+
+@pytest.mark.django_db
+class TestProviderSettings:
+    @pytest.fixture
+    def audio_bytes(self):
+        return data.wav_bytes(6)
+
+    def test_transcription_uses_configured_service(self, settings, monkeypatch, session_a, audio_a,
+                                                   django_capture_on_commit_callbacks):
+        settings.TRANSCRIPTION_SERVICE_CLASS = "benchmarks.providers.SimulatedTranscriptionService"
+        monkeypatch.setenv("BENCH_PROVIDERS", NO_LATENCY)
+
+        with django_capture_on_commit_callbacks():
+            result = transcribe_session.apply(args=[session_a.id]).get()
+
+        assert result["ok"]
+        transcript = SessionTranscript.objects.get(session=session_a)
+        assert transcript.model_name == "simulated-whisper"
+        assert transcript.word_count >= 13  # 6s at 130 words/minute
+
+    def test_report_provider_setting(self, settings):
+        settings.REPORT_PROVIDER_CLASS = "benchmarks.providers.SimulatedReportProvider"
+        assert isinstance(get_report_provider(), SimulatedReportProvider)
+
+    def test_stage_latencies_from_timeline(self, session_a):
+        start = timezone.now()
+        SessionProcessingTimeline.objects.create(
+            session=session_a,
+            uploaded_at=start,
+            transcription_started_at=start + timedelta(seconds=2),
+            transcription_finished_at=start + timedelta(seconds=12),
+        )
+
+        latencies = stage_latencies([session_a.id])
+
+        assert latencies["queue_wait"]["p50_s"] == 2.0
+        assert latencies["transcription"]["p95_s"] == 10.0
+        assert "end_to_end" not in latencies
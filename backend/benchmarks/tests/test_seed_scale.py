@@ -0,0 +1,53 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from benchmarks.scale import ScaleOptions, scale_therapists, seed_scale
+from patients.models import Patient
+from therapy_sessions.models import SessionProcessingTimeline, SessionReport, SessionTranscript, TherapySession
+
+pytestmark = pytest.mark.django_db
+
+
+def _dataset():
+    return sorted(
+        TherapySession.objects.filter(therapist__in=scale_therapists())
+        .values_list("patient__patient_id", "patient__contact_phone", "status", "transcript__word_count")
+    )
+
+
+def test_same_seed_same_rows_whatever_the_batch_size():
+    options = ScaleOptions(therapists=3, patients=30, sessions=200, transcript_words=100, seed=7)
+
+    result = seed_scale(options, batch_size=25)
+    first = _dataset()
+    seed_scale(options, batch_size=1000)
+
+    assert _dataset() == first
+    assert result.sessions == 200 and result.patients == 30
+    assert scale_therapists().count() == 3  # the previous run's therapists were replaced
+
+
+def test_sessions_span_every_status_with_matching_children():
+    call_command("seed_scale", therapists=2, patients=40, sessions=400, transcript_words=50, workers=1)
+
+    sessions = TherapySession.objects.filter(therapist__in=scale_therapists())
+    assert set(sessions.values_list("status", flat=True)) == {code for code, _ in TherapySession.STATUS_CHOICES}
+
+    completed = sessions.filter(status="completed")
+    assert SessionTranscript.objects.filter(session__in=completed).count() == completed.count()
+    assert SessionReport.objects.filter(session__in=completed, status="completed").count() == completed.count()
+    assert SessionProcessingTimeline.objects.filter(session__in=completed, completed_at__isnull=False).count() == (
+        completed.count()
+    )
+    assert not SessionTranscript.objects.filter(session__in=sessions.filter(status="empty")).exists()
+    assert SessionReport.objects.filter(session__in=completed).exclude(risk_flags=[]).exists()
+
+    # rows written by COPY load back through the ORM and its validation
+    for patient in Patient.objects.filter(therapist__in=scale_therapists())[:5]:
+        patient.full_clean()
+
+
+def test_rejects_more_patients_than_national_ids_allow():
+    with pytest.raises(CommandError):
+        call_command("seed_scale", therapists=1, patients=100_001, sessions=0, workers=1)
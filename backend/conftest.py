@@ -2,9 +2,12 @@
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.utils import timezone
 from rest_framework.test import APIClient
+import itertools
 import os
 
 from therapy_sessions.models import TherapySession, SessionAudio
@@ -105,29 +108,65 @@ def duplicate_email_user(db):
 # =========================================================
 
 @pytest.fixture
-def patient_a(db, therapist_a):
+def make_patient(db):
     """
-    Patient owned by therapist_a.
-    Adjust fields if your Patient model uses different names.
+    Creates patients with the same name and a fresh national ID / phone per
+    call, so several can share a therapist. Pass fields to override.
     """
-    return Patient.objects.create(
-        therapist=therapist_a,
-        full_name="Patient A",
-    )
+    created = itertools.count()
+
+    def _make(therapist, **fields):
+        n = next(created)
+        fields = {
+            "full_name": "Salma Hassan Omar",
+            "patient_id": str(29801011234567 + n),
+            "contact_phone": f"0101234{5678 + n:04d}",
+            **fields,
+        }
+        return Patient.objects.create(therapist=therapist, **fields)
+    return _make
 
 
 @pytest.fixture
-def session_a(db, therapist_a, patient_a):
-    """
-    TherapySession owned by therapist_a for patient_a.
-    Adjust fields if your TherapySession model differs.
-    """
-    return TherapySession.objects.create(
-        therapist=therapist_a,
-        patient=patient_a,
-        session_date=timezone.now(),
-        status="scheduled",
+def make_session(db, make_patient):
+    """Creates a session (for a new patient unless one is given)."""
+    def _make(therapist, patient=None, **fields):
+        return TherapySession.objects.create(
+            therapist=therapist,
+            patient=patient or make_patient(therapist),
+            session_date=timezone.now(),
+            **fields,
+        )
+    return _make
+
+
+@pytest.fixture
+def patient_a(db, therapist_a, make_patient):
+    """Patient owned by therapist_a."""
+    return make_patient(therapist_a)
+
+
+@pytest.fixture
+def session_a(db, therapist_a, patient_a, make_session):
+    """TherapySession owned by therapist_a for patient_a."""
+    return make_session(therapist_a, patient=patient_a)
+
+
+@pytest.fixture
+def audio_bytes():
+    """Content of audio_a's stored file; override in a test module to change it."""
+    return b"x" * 1000
+
+
+@pytest.fixture
+def audio_a(db, settings, tmp_path, session_a, audio_bytes):
+    """A recording for session_a, stored under a per-test MEDIA_ROOT."""
+    settings.MEDIA_ROOT = str(tmp_path)
+    name = default_storage.save(
+        f"recordings/patient_{session_a.patient_id}/session_{session_a.id}/audio.webm",
+        ContentFile(audio_bytes),
     )
+    return SessionAudio.objects.create(session=session_a, audio_file=name, original_filename="audio.webm")
 
 
 @pytest.fixture
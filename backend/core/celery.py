@@ -9,4 +9,11 @@ app = Celery("core")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 
 # auto-discover tasks.py in installed apps
-app.autodiscover_tasks()
\ No newline at end of file
+app.autodiscover_tasks()
+# task runtime/outcome metrics and the worker's /metrics port (core.metrics)
+from core.metrics import connect_celery_signals  # noqa: E402
+# trace context through message headers (core.tracing)
+from core.tracing import connect_celery_signals as connect_tracing_signals  # noqa: E402
+
+connect_celery_signals()
+connect_tracing_signals()
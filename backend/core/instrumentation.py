@@ -0,0 +1,265 @@
+"""
+Opt-in per-request performance instrumentation (PERF_INSTRUMENTATION=1).
+
+A sampled request (PERF_SAMPLE_RATE) records wall time, SQL count and time
+(connection.execute_wrapper), cache hits reported via record_cache_lookup(),
+serializer time (PerformanceViewMixin) and response size. It gets a
+Server-Timing header, slow requests are logged with their most repeated
+SQL, and every sample feeds the per-route histograms behind route_stats().
+An unsampled request costs one random() call.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger("core.performance")
+
+# upper bounds in milliseconds, Prometheus style (+Inf is implied)
+DURATION_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+SLOW_LOG_TOP_SQL = 5
+
+_current: contextvars.ContextVar[Optional["RequestMetrics"]] = contextvars.ContextVar(
+    "request_metrics", default=None
+)
+
+_IN_LIST_RE = re.compile(r"IN \((?:%s, )*%s\)")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def sql_fingerprint(sql: str) -> str:
+    """Collapse IN lists and literals so repeats of one query group together."""
+    return _LITERAL_RE.sub("?", _IN_LIST_RE.sub("IN (...)", sql))
+
+
+class RequestMetrics:
+    __slots__ = (
+        "started", "total", "db_count", "db_time", "sql",
+        "cache_hits", "cache_misses", "serializer_time", "response_bytes",
+    )
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.db_count = 0
+        self.db_time = 0.0
+        self.sql: Dict[str, List[float]] = defaultdict(list)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.serializer_time = 0.0
+        self.response_bytes = 0
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.db_count += 1
+            self.db_time += elapsed
+            self.sql[sql].append(elapsed)
+
+    def finish(self, response) -> None:
+        self.total = time.perf_counter() - self.started
+        if getattr(response, "streaming", False):
+            self.response_bytes = int(response.get("Content-Length") or 0)
+        else:
+            self.response_bytes = len(response.content)
+
+    def repeated_sql(self, limit: int = SLOW_LOG_TOP_SQL) -> List[Tuple[str, int, float]]:
+        """(fingerprint, count, total ms) for queries run more than once, most frequent first."""
+        grouped: Dict[str, List[float]] = defaultdict(list)
+        for sql, timings in self.sql.items():
+            grouped[sql_fingerprint(sql)].extend(timings)
+        repeated = [(fp, len(t), sum(t) * 1000) for fp, t in grouped.items() if len(t) > 1]
+        repeated.sort(key=lambda row: (row[1], row[2]), reverse=True)
+        return repeated[:limit]
+
+    def server_timing(self) -> str:
+        parts = [
+            f"total;dur={self.total * 1000:.1f}",
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.db_count} queries"',
+        ]
+        if self.serializer_time:
+            parts.append(f"serializer;dur={self.serializer_time * 1000:.1f}")
+        if self.cache_hits or self.cache_misses:
+            parts.append(f'cache;desc="{self.cache_hits} hit, {self.cache_misses} miss"')
+        return ", ".join(parts)
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+def record_cache_lookup(hits: int = 0, misses: int = 0) -> None:
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.cache_hits += hits
+        metrics.cache_misses += misses
+
+
+@contextmanager
+def serializer_timer():
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serializer_time += time.perf_counter() - start
+
+
+class RouteHistograms:
+    """Per (method, route) duration histogram plus DB/size totals; process local."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], Dict] = {}
+
+    def observe(self, method: str, route: str, status_code: int, metrics: RequestMetrics) -> None:
+        duration_ms = metrics.total * 1000
+        bucket = next((i for i, bound in enumerate(DURATION_BUCKETS_MS) if duration_ms <= bound), len(DURATION_BUCKETS_MS))
+        with self._lock:
+            stats = self._routes.get((method, route))
+            if stats is None:
+                stats = self._routes[(method, route)] = {
+                    "buckets": [0] * (len(DURATION_BUCKETS_MS) + 1),
+                    "count": 0,
+                    "sum_ms": 0.0,
+                    "db_queries": 0,
+                    "db_ms": 0.0,
+                    "response_bytes": 0,
+                    "errors": 0,
+                }
+            stats["buckets"][bucket] += 1
+            stats["count"] += 1
+            stats["sum_ms"] += duration_ms
+            stats["db_queries"] += metrics.db_count
+            stats["db_ms"] += metrics.db_time * 1000
+            stats["response_bytes"] += metrics.response_bytes
+            if status_code >= 500:
+                stats["errors"] += 1
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            items = [(key, dict(stats, buckets=list(stats["buckets"]))) for key, stats in self._routes.items()]
+
+        rows = []
+        for (method, route), stats in sorted(items):
+            cumulative, running = {}, 0
+            for bound, n in zip(list(DURATION_BUCKETS_MS) + ["+Inf"], stats["buckets"]):
+                running += n
+                cumulative[str(bound)] = running
+            rows.append({
+                "method": method,
+                "route": route,
+                "count": stats["count"],
+                "sum_ms": round(stats["sum_ms"], 3),
+                "buckets_ms": cumulative,
+                "db_queries": stats["db_queries"],
+                "db_ms": round(stats["db_ms"], 3),
+                "response_bytes": stats["response_bytes"],
+                "errors": stats["errors"],
+            })
+        return rows
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+route_histograms = RouteHistograms()
+
+
+def route_stats() -> Dict:
+    return {
+        "sample_rate": float(getattr(settings, "PERF_SAMPLE_RATE", 1.0)),
+        "routes": route_histograms.snapshot(),
+    }
+
+
+def route_label(request) -> str:
+    """URL pattern of the resolved view; shared by the performance and Prometheus middlewares."""
+    match = getattr(request, "resolver_match", None)
+    # unmatched paths share one label so scanners can't blow up the cardinality
+    return match.route if match is not None and match.route else "<unmatched>"
+
+
+class PerformanceMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "PERF_INSTRUMENTATION", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = float(getattr(settings, "PERF_SAMPLE_RATE", 1.0))
+        self.slow_ms = float(getattr(settings, "PERF_SLOW_REQUEST_MS", 500))
+        self.server_timing = getattr(settings, "PERF_SERVER_TIMING", True)
+
+    def __call__(self, request):
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(metrics.db_wrapper))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        metrics.finish(response)
+        route = route_label(request)
+        route_histograms.observe(request.method, route, response.status_code, metrics)
+
+        if self.server_timing:
+            response["Server-Timing"] = metrics.server_timing()
+
+        if metrics.total * 1000 >= self.slow_ms:
+            logger.warning(
+                "slow request %s %s: %.0fms, %d queries (%.0fms), serializer %.0fms, %d bytes; repeated SQL: %s",
+                request.method, route, metrics.total * 1000, metrics.db_count, metrics.db_time * 1000,
+                metrics.serializer_time * 1000, metrics.response_bytes,
+                "; ".join(f"{n}x {ms:.0f}ms {fp[:300]}" for fp, n, ms in metrics.repeated_sql()) or "none",
+            )
+        return response
+
+
+_timed_serializer_classes: Dict[type, type] = {}
+
+
+def _timed_serializer_class(cls: type) -> type:
+    timed = _timed_serializer_classes.get(cls)
+    if timed is None:
+        class Timed(cls):
+            @property
+            def data(self):
+                with serializer_timer():
+                    return super().data
+
+        Timed.__name__, Timed.__qualname__ = cls.__name__, cls.__qualname__
+        timed = _timed_serializer_classes[cls] = Timed
+    return timed
+
+
+class PerformanceViewMixin:
+    """DRF view mixin: times `.data` of serializers built via get_serializer() in sampled requests."""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if _current.get() is not None:
+            serializer.__class__ = _timed_serializer_class(type(serializer))
+        return serializer
@@ -0,0 +1,207 @@
+"""
+Prometheus metrics for the web app and the Celery workers.
+
+Request and task metrics are plain prometheus_client histograms/counters.
+With PROMETHEUS_MULTIPROC_DIR set (an empty directory per host, shared by
+the gunicorn workers or prefork children) every process writes its own
+files and a scrape aggregates them. Queue depth and sessions per status are
+read live when /metrics is scraped.
+"""
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db.models import Count
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from opentelemetry.trace import SpanKind
+from prometheus_client.core import GaugeMetricFamily
+
+from core.instrumentation import route_label
+from core.tracing import span
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+TASK_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+TASK_SECONDS = Histogram(
+    "celery_task_duration_seconds",
+    "Celery task runtime by task and final state.",
+    ["task", "state"],
+    buckets=TASK_BUCKETS,
+)
+TASK_EVENTS = Counter(
+    "celery_task_events",
+    "Celery task outcomes (success, failure, retry).",
+    ["task", "event"],
+)
+PROVIDER_SECONDS = Histogram(
+    "provider_request_duration_seconds",
+    "Latency of calls to external AI providers.",
+    ["provider", "operation", "outcome"],
+    buckets=TASK_BUCKETS,
+)
+
+TASK_EVENT_BY_STATE = {"SUCCESS": "success", "FAILURE": "failure", "RETRY": "retry"}
+
+
+def _multiprocess_dir() -> str:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR", "")
+
+
+def base_registry() -> CollectorRegistry:
+    if _multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def mark_process_dead(pid: int) -> None:
+    """Call from gunicorn child_exit / Celery process shutdown in multiprocess mode."""
+    if _multiprocess_dir():
+        multiprocess.mark_process_dead(pid)
+
+
+@contextmanager
+def observe_provider(provider: str, operation: str):
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with span(f"provider.{operation}", kind=SpanKind.CLIENT, **{"provider.name": provider}):
+            yield
+        outcome = "ok"
+    finally:
+        PROVIDER_SECONDS.labels(provider, operation, outcome).observe(time.perf_counter() - start)
+
+
+def queue_depths():
+    """(queue, messages waiting) for every configured Celery queue; unreachable broker yields nothing."""
+    from core.celery import app
+
+    depths = []
+    try:
+        with app.connection_for_read() as conn:
+            conn.ensure_connection(max_retries=1)
+            channel = conn.default_channel
+            for queue in settings.METRICS_QUEUES:
+                try:
+                    depths.append((queue, channel.queue_declare(queue=queue, passive=True).message_count))
+                except Exception:
+                    continue  # queue not declared yet
+    except Exception:
+        return []
+    return depths
+
+
+class LiveStateCollector:
+    """Gauges computed at scrape time, in the scraping process only."""
+
+    def collect(self):
+        from therapy_sessions.models import TherapySession
+
+        sessions = GaugeMetricFamily("therapy_sessions_by_status", "Therapy sessions per status.", labels=["status"])
+        for row in TherapySession.objects.values("status").annotate(n=Count("id")).order_by():
+            sessions.add_metric([row["status"]], row["n"])
+        yield sessions
+
+        depth = GaugeMetricFamily("celery_queue_depth", "Messages waiting per Celery queue.", labels=["queue"])
+        for queue, count in queue_depths():
+            depth.add_metric([queue], count)
+        yield depth
+
+
+live_registry = CollectorRegistry(auto_describe=False)
+live_registry.register(LiveStateCollector())
+
+
+def metrics_view(request):
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token:
+        # fail closed: every scrape runs a GROUP BY and opens a broker connection
+        return HttpResponse(status=404)
+    if request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponse(status=401)
+
+    body = generate_latest(base_registry()) + generate_latest(live_registry)
+    return HttpResponse(body, content_type=CONTENT_TYPE_LATEST)
+
+
+def _status_class(code: int) -> str:
+    return f"{code // 100}xx"
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        route = route_label(request)
+        HTTP_REQUEST_SECONDS.labels(request.method, route, _status_class(response.status_code)).observe(
+            time.perf_counter() - start
+        )
+        return response
+
+
+# ---------- Celery ----------
+_task_started = {}
+
+
+def _task_name(task) -> str:
+    return getattr(task, "name", "unknown").rsplit(".", 1)[-1]
+
+
+def on_task_prerun(task_id=None, task=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+def on_task_postrun(task_id=None, task=None, state=None, **kwargs):
+    name = _task_name(task)
+    start = _task_started.pop(task_id, None)
+    if start is not None:
+        TASK_SECONDS.labels(name, state or "UNKNOWN").observe(time.perf_counter() - start)
+    event = TASK_EVENT_BY_STATE.get(state)
+    if event:
+        TASK_EVENTS.labels(name, event).inc()
+
+
+def on_worker_process_shutdown(pid=None, **kwargs):
+    mark_process_dead(pid or os.getpid())
+
+
+def on_worker_ready(**kwargs):
+    port = getattr(settings, "CELERY_METRICS_PORT", 0)
+    if port:
+        from prometheus_client import start_http_server
+
+        start_http_server(port, registry=base_registry())
+
+
+def connect_celery_signals() -> None:
+    from celery import signals
+
+    signals.task_prerun.connect(on_task_prerun, weak=False)
+    signals.task_postrun.connect(on_task_postrun, weak=False)
+    signals.worker_process_shutdown.connect(on_worker_process_shutdown, weak=False)
+    signals.worker_ready.connect(on_worker_ready, weak=False)
@@ -16,6 +16,10 @@ from dotenv import load_dotenv
 
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# empty uses api.openai.com; point at `python -m benchmarks.openai_stub` for load/chaos runs
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "")
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "120"))  # seconds per request
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))  # client-side, on 429/5xx/timeouts
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -74,6 +78,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "users.apps.UsersConfig",
     "rest_framework_simplejwt",
@@ -85,7 +90,7 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -100,10 +105,47 @@ SIMPLE_JWT = {
     
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    'TOKEN_REFRESH_SERIALIZER': 'users.serializers.TherapistTokenRefreshSerializer',
 
 }
 
+# Refresh-token JTIs (outstanding/blacklisted): cache-backed when Redis is configured.
+# Keep the DB fallback on until `purge_token_tables --migrate` has run.
+TOKEN_STORE_BACKEND = os.getenv(
+    "TOKEN_STORE_BACKEND",
+    "users.services.token_store.CacheTokenStore" if os.getenv("REDIS_CACHE_URL")
+    else "users.services.token_store.DatabaseTokenStore",
+)
+TOKEN_STORE_CACHE = os.getenv("TOKEN_STORE_CACHE", "default")
+TOKEN_STORE_DB_FALLBACK = os.getenv("TOKEN_STORE_DB_FALLBACK", "1") == "1"
+
+# Prometheus exposition at /metrics (core.metrics). Set PROMETHEUS_MULTIPROC_DIR for
+# gunicorn/prefork; /metrics answers 404 until METRICS_TOKEN is set, then requires it as a Bearer token
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+CELERY_METRICS_PORT = int(os.getenv("CELERY_METRICS_PORT", "0"))  # worker-side exposition
+
+# End-to-end tracing (core.tracing): upload request -> Celery tasks -> storage/provider spans.
+# "file" appends OTLP/JSON lines to TRACING_FILE; "otlp" ships to OTEL_EXPORTER_OTLP_ENDPOINT
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "0") == "1"
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "file")
+TRACING_FILE = os.getenv("TRACING_FILE", str(BASE_DIR / "traces" / "spans.jsonl"))
+TRACING_SAMPLE_RATE = float(os.getenv("TRACING_SAMPLE_RATE", "1.0"))
+TRACING_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "therapy-ai-backend")
+
+# Per-request timing/SQL instrumentation (core.instrumentation); opt-in and sampled
+PERF_INSTRUMENTATION = os.getenv("PERF_INSTRUMENTATION", "0") == "1"
+PERF_SAMPLE_RATE = float(os.getenv("PERF_SAMPLE_RATE", "0.1"))
+PERF_SLOW_REQUEST_MS = int(os.getenv("PERF_SLOW_REQUEST_MS", "500"))
+PERF_SERVER_TIMING = os.getenv("PERF_SERVER_TIMING", "1") == "1"
+
+# seconds an authenticated user (with its therapist profile) stays cached
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+
 MIDDLEWARE = [
+    "core.metrics.MetricsMiddleware",
+    # disabled (MiddlewareNotUsed) unless PERF_INSTRUMENTATION=1
+    "core.instrumentation.PerformanceMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -148,6 +190,22 @@ DATABASES = {
     }
 }
 
+# Shared cache (dashboard counters); per-process memory when Redis is not configured
+REDIS_CACHE_URL = os.getenv("REDIS_CACHE_URL")
+if REDIS_CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 
 
 # Password validation
@@ -207,9 +265,74 @@ CELERY_TASK_ACKS_LATE = True
 CELERY_TASK_REJECT_ON_WORKER_LOST = True
 CELERY_WORKER_PREFETCH_MULTIPLIER = 1
 
+# Local-storage audio playback: "nginx" (X-Accel-Redirect) or "apache" (X-Sendfile)
+# hands the bytes to the front proxy; empty streams them from Django with Range support
+AUDIO_SENDFILE = os.getenv("AUDIO_SENDFILE", "")
+AUDIO_ACCEL_REDIRECT_PREFIX = os.getenv("AUDIO_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+AUDIO_STREAM_URL_TTL = int(os.getenv("AUDIO_STREAM_URL_TTL", "3600"))
+
+# Cold tiering of completed sessions' audio (see therapy_sessions.services.storage.tiering)
+AUDIO_COLD_AFTER_DAYS = int(os.getenv("AUDIO_COLD_AFTER_DAYS", "30"))
+AUDIO_COLD_PREFIX = os.getenv("AUDIO_COLD_PREFIX", "cold/")
+AUDIO_COLD_STORAGE_CLASS = os.getenv("AUDIO_COLD_STORAGE_CLASS", "GLACIER_IR")  # S3 only
+AUDIO_OPUS_BITRATE = os.getenv("AUDIO_OPUS_BITRATE", "24k")
+
+# Staging area for resumable chunked uploads; must be on the same filesystem
+# as MEDIA_ROOT (shared volume across web nodes). Defaults to MEDIA_ROOT/.resumable
+RESUMABLE_UPLOAD_DIR = os.getenv("RESUMABLE_UPLOAD_DIR", "")
+
+# Sessions flagged by the local risk screen get their report generated from this queue
+URGENT_REPORT_QUEUE = os.getenv("URGENT_REPORT_QUEUE", "reports_urgent")
+
+# queues whose depth /metrics reports
+METRICS_QUEUES = ["celery", URGENT_REPORT_QUEUE]
+
+CELERY_BEAT_SCHEDULE = {
+    # repairs drift in the incrementally maintained dashboard counters
+    "reconcile-dashboard-counters": {
+        "task": "dashboard.tasks.reconcile_dashboard_counters",
+        "schedule": timedelta(minutes=15),
+    },
+    # hourly/daily stage-latency percentiles for the analytics endpoint
+    "rollup-processing-latency": {
+        "task": "dashboard.tasks.rollup_processing_latency",
+        "schedule": timedelta(minutes=10),
+    },
+    "expire-resumable-uploads": {
+        "task": "therapy_sessions.tasks.expire_resumable_uploads",
+        "schedule": timedelta(hours=1),
+    },
+    "collect-storage-garbage": {
+        "task": "therapy_sessions.tasks.collect_storage_garbage",
+        "schedule": timedelta(minutes=5),
+    },
+    "sweep-orphaned-recordings": {
+        "task": "therapy_sessions.tasks.sweep_orphaned_recordings",
+        "schedule": timedelta(days=1),
+    },
+    # safety net; enqueue_email also kicks a drain right after commit
+    "drain-email-outbox": {
+        "task": "users.tasks.drain_email_outbox",
+        "schedule": timedelta(minutes=1),
+    },
+    "purge-token-tables": {
+        "task": "users.tasks.purge_token_tables",
+        "schedule": timedelta(days=1),
+    },
+    "tier-cold-audio": {
+        "task": "therapy_sessions.tasks.tier_cold_audio",
+        "schedule": timedelta(hours=6),
+    },
+}
+
 
 USE_MOCK_AI = False
 
+# Dotted paths overriding the AI providers; empty keeps Whisper and OpenAI/mock (USE_MOCK_AI).
+# The pipeline benchmark points these at the stand-ins in benchmarks.providers
+TRANSCRIPTION_SERVICE_CLASS = os.getenv("TRANSCRIPTION_SERVICE_CLASS", "")
+REPORT_PROVIDER_CLASS = os.getenv("REPORT_PROVIDER_CLASS", "")
+
 # Email (used by Celery workers)
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 
@@ -227,6 +350,13 @@ DEFAULT_FROM_EMAIL = os.getenv(
     f"Therapy AI <{EMAIL_HOST_USER}>"
 )
 
+# OAuth client IDs accepted as the audience of Google ID tokens (comma separated)
+GOOGLE_CLIENT_IDS = [
+    client_id.strip()
+    for client_id in os.getenv("GOOGLE_CLIENT_IDS", os.getenv("GOOGLE_CLIENT_ID", "")).split(",")
+    if client_id.strip()
+]
+
 # Frontend URL (used in verification links)
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
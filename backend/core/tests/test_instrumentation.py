@@ -0,0 +1,92 @@
+import logging
+import pytest
+
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from core.instrumentation import route_histograms, sql_fingerprint
+from users.models import TherapistProfile
+
+API = "/api/v1"
+
+
+@pytest.fixture
+def instrumented(settings):
+    settings.PERF_INSTRUMENTATION = True
+    settings.PERF_SAMPLE_RATE = 1.0
+    settings.PERF_SLOW_REQUEST_MS = 100_000
+    route_histograms.reset()
+    yield settings
+    route_histograms.reset()
+
+
+def _client(user):
+    client = APIClient()  # fresh handler: middleware settings are read when it loads
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def client_a(therapist_a, make_patient):
+    TherapistProfile.objects.create(user=therapist_a, is_completed=True)
+    for _ in range(3):
+        make_patient(therapist_a)
+    return _client(therapist_a)
+
+
+def test_fingerprint_collapses_in_lists_and_literals():
+    a = 'SELECT * FROM "patient" WHERE "id" IN (%s, %s, %s) AND "name" = \'x\' LIMIT 21'
+    b = 'SELECT * FROM "patient" WHERE "id" IN (%s) AND "name" = \'y\' LIMIT 5'
+    assert sql_fingerprint(a) == sql_fingerprint(b)
+
+
+@pytest.mark.django_db
+class TestPerformanceMiddleware:
+    def test_disabled_by_default(self, settings, client_a):
+        settings.PERF_INSTRUMENTATION = False
+        res = client_a.get(f"{API}/patients/")
+        assert "Server-Timing" not in res
+
+    def test_server_timing_and_route_histogram(self, instrumented, client_a):
+        res = client_a.get(f"{API}/patients/")
+
+        assert res.status_code == 200
+        timing = res["Server-Timing"]
+        assert timing.startswith("total;dur=")
+        assert "queries" in timing
+        assert "serializer;dur=" in timing
+
+        (row,) = [r for r in route_histograms.snapshot() if r["method"] == "GET"]
+        assert "patients" in row["route"]
+        assert row["count"] == 1
+        assert row["db_queries"] >= 1
+        assert row["buckets_ms"]["+Inf"] == 1
+        assert row["response_bytes"] == len(res.content)
+
+    def test_unsampled_requests_are_untouched(self, instrumented, therapist_a, client_a):
+        instrumented.PERF_SAMPLE_RATE = 0.0
+
+        res = _client(therapist_a).get(f"{API}/patients/")
+
+        assert "Server-Timing" not in res
+        assert route_histograms.snapshot() == []
+
+    def test_slow_requests_are_logged(self, instrumented, therapist_a, client_a, caplog):
+        instrumented.PERF_SLOW_REQUEST_MS = 0
+
+        with caplog.at_level(logging.WARNING, logger="core.performance"):
+            _client(therapist_a).get(f"{API}/patients/")
+
+        (record,) = caplog.records
+        assert "slow request GET" in record.getMessage()
+
+    def test_stats_endpoint_is_staff_only(self, instrumented, client_a):
+        client_a.get(f"{API}/patients/")
+        assert client_a.get(f"{API}/dashboard/route-performance/").status_code == 403
+
+        staff = get_user_model().objects.create_user(email="ops@test.com", password="pass1234", is_staff=True)
+        res = _client(staff).get(f"{API}/dashboard/route-performance/")
+
+        assert res.status_code == 200
+        assert res.data["sample_rate"] == 1.0
+        assert any("patients" in r["route"] for r in res.data["routes"])
@@ -0,0 +1,75 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+from prometheus_client import REGISTRY
+
+from core.metrics import on_task_postrun, on_task_prerun, observe_provider
+
+
+def _sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.fixture
+def no_broker():
+    with patch("core.metrics.queue_depths", return_value=[("celery", 7), ("reports_urgent", 0)]):
+        yield
+
+
+@pytest.fixture
+def scrape(client, settings):
+    settings.METRICS_TOKEN = "s3cret"
+    return lambda: client.get("/metrics", HTTP_AUTHORIZATION="Bearer s3cret")
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    def test_exposes_live_gauges(self, scrape, session_a, no_broker):
+        res = scrape()
+
+        assert res.status_code == 200
+        body = res.content.decode()
+        assert 'therapy_sessions_by_status{status="empty"} 1.0' in body
+        assert 'celery_queue_depth{queue="celery"} 7.0' in body
+
+    def test_records_http_requests_by_route(self, scrape, no_broker):
+        labels = {"method": "GET", "route": "metrics", "status": "2xx"}
+        before = _sample("http_request_duration_seconds_count", labels)
+
+        scrape()
+
+        assert _sample("http_request_duration_seconds_count", labels) == before + 1
+
+    def test_closed_without_a_token(self, client, settings, no_broker):
+        settings.METRICS_TOKEN = ""
+        with patch("core.metrics.LiveStateCollector.collect") as collect:
+            assert client.get("/metrics").status_code == 404
+        collect.assert_not_called()
+
+    def test_token_required_when_configured(self, client, settings, no_broker):
+        settings.METRICS_TOKEN = "s3cret"
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer s3cret").status_code == 200
+
+
+class TestCeleryMetrics:
+    def test_task_runtime_and_outcome(self):
+        task = MagicMock()
+        task.name = "therapy_sessions.tasks.transcribe_session"
+        labels = {"task": "transcribe_session", "event": "retry"}
+        before = _sample("celery_task_events_total", labels)
+
+        on_task_prerun(task_id="t1", task=task)
+        on_task_postrun(task_id="t1", task=task, state="RETRY")
+
+        assert _sample("celery_task_events_total", labels) == before + 1
+        assert _sample("celery_task_duration_seconds_count", {"task": "transcribe_session", "state": "RETRY"}) >= 1
+
+    def test_provider_latency_records_errors(self):
+        labels = {"provider": "OpenAIReportProvider", "operation": "report", "outcome": "error"}
+        before = _sample("provider_request_duration_seconds_count", labels)
+
+        with pytest.raises(RuntimeError), observe_provider("OpenAIReportProvider", "report"):
+            raise RuntimeError("timeout")
+
+        assert _sample("provider_request_duration_seconds_count", labels) == before + 1
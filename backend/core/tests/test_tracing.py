@@ -0,0 +1,146 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from core.metrics import observe_provider
+from core.tracing import (
+    OTLPJsonFileExporter,
+    configure_tracing,
+    on_before_task_publish,
+    on_commit,
+    on_task_postrun,
+    on_task_prerun,
+    shutdown_tracing,
+    span,
+)
+
+API = "/api/v1"
+BASE = f"{API}/sessions"
+
+
+@pytest.fixture
+def exported():
+    exporter = InMemorySpanExporter()
+    configure_tracing(exporter, processor_class=SimpleSpanProcessor)
+    yield exporter
+    shutdown_tracing()
+
+
+def _by_name(exporter):
+    return {s.name: s for s in exporter.get_finished_spans()}
+
+
+def _run_task(name, headers, body=lambda: None):
+    """What the worker does with a published message: prerun, task body, postrun."""
+    task = SimpleNamespace(name=name, request=SimpleNamespace(retries=0, **headers))
+    on_task_prerun(task_id=headers["id"], task=task)
+    body()
+    on_task_postrun(task_id=headers["id"], task=task, state="SUCCESS")
+
+
+@pytest.mark.django_db
+class TestUploadTrace:
+    def test_trace_follows_upload_into_tasks(self, auth_client_a, session_a, make_audio_file, exported,
+                                             django_capture_on_commit_callbacks):
+        published = []
+
+        def publish(name):
+            def delay(session_id):
+                headers = {"id": f"task-{len(published)}"}
+                on_before_task_publish(sender=name, headers=headers, routing_key="celery")
+                published.append(headers)
+            return delay
+
+        with patch("therapy_sessions.tasks.transcribe_session.delay", side_effect=publish("transcribe_session")), \
+             patch("therapy_sessions.tasks.generate_waveform_peaks.delay"), \
+             django_capture_on_commit_callbacks(execute=True):
+            res = auth_client_a.post(
+                f"{BASE}/{session_a.id}/upload-audio/",
+                data={"audio_file": make_audio_file(), "language_code": "en"},
+                format="multipart",
+            )
+        assert res.status_code == 201
+
+        report_headers = {"id": "report"}
+
+        def transcribe():
+            with observe_provider("FakeWhisper", "transcribe"):
+                pass
+            on_before_task_publish(sender="generate_session_report", headers=report_headers, routing_key="celery")
+
+        _run_task("therapy_sessions.tasks.transcribe_session", published[0], transcribe)
+
+        spans = _by_name(exported)
+        request = spans["session.upload_audio"]
+        assert spans["db.transaction upload_audio"].parent.span_id == request.context.span_id
+        assert spans["storage.save"].parent.span_id == spans["db.transaction upload_audio"].context.span_id
+
+        task_span = spans["celery.task transcribe_session"]
+        assert task_span.parent.span_id == spans["celery.publish transcribe_session"].context.span_id
+        assert spans["provider.transcribe"].parent.span_id == task_span.context.span_id
+        assert spans["celery.publish generate_session_report"].parent.span_id == task_span.context.span_id
+        assert {s.context.trace_id for s in spans.values()} == {request.context.trace_id}
+        assert format(request.context.trace_id, "032x") in report_headers["traceparent"]
+
+    def test_incoming_traceparent_is_continued(self, auth_client_a, session_a, make_audio_file, exported):
+        trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+        with patch("therapy_sessions.tasks.transcribe_session.delay"), \
+             patch("therapy_sessions.tasks.generate_waveform_peaks.delay"):
+            auth_client_a.post(
+                f"{BASE}/{session_a.id}/upload-audio/",
+                data={"audio_file": make_audio_file()},
+                format="multipart",
+                HTTP_TRACEPARENT=f"00-{trace_id}-00f067aa0ba902b7-01",
+            )
+
+        request = _by_name(exported)["session.upload_audio"]
+        assert format(request.context.trace_id, "032x") == trace_id
+
+
+class TestTracingHelpers:
+    def test_disabled_spans_do_not_record(self, settings):
+        settings.TRACING_ENABLED = False
+        shutdown_tracing()
+
+        with span("anything") as current:
+            assert not current.is_recording()
+
+    @pytest.mark.django_db
+    def test_on_commit_runs_in_registering_context(self, exported, django_capture_on_commit_callbacks):
+        seen = []
+        with django_capture_on_commit_callbacks() as callbacks:
+            with span("request") as request:
+                on_commit(lambda: seen.append(trace.get_current_span()))
+
+        callbacks[0]()
+
+        assert seen == [request]
+
+    def test_file_exporter_writes_otlp_json(self, tmp_path):
+        path = tmp_path / "spans.jsonl"
+        configure_tracing(OTLPJsonFileExporter(path), processor_class=SimpleSpanProcessor)
+        try:
+            with span("outer"):
+                with span("inner", **{"storage.key": "recordings/a.webm", "storage.bytes": 10}):
+                    pass
+        finally:
+            shutdown_tracing()
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        spans = {
+            s["name"]: s
+            for line in lines
+            for resource in line["resourceSpans"]
+            for scope in resource["scopeSpans"]
+            for s in scope["spans"]
+        }
+        assert spans["inner"]["parentSpanId"] == spans["outer"]["spanId"]
+        assert spans["inner"]["traceId"] == spans["outer"]["traceId"]
+        assert {"key": "storage.bytes", "value": {"intValue": "10"}} in spans["inner"]["attributes"]
+        resource = lines[0]["resourceSpans"][0]["resource"]["attributes"]
+        assert any(a["key"] == "service.name" for a in resource)
@@ -0,0 +1,318 @@
+"""
+End-to-end tracing (OpenTelemetry): upload request -> Celery tasks -> storage
+and provider calls.
+
+Off unless TRACING_ENABLED=1; every helper then hands out non-recording spans.
+The upload views start the trace (continuing an incoming `traceparent` if the
+client sent one), `on_commit` carries it past the transaction boundary, and
+the Celery publish/prerun signals carry it through message headers, so
+`transcribe_session` and the `generate_session_report` it enqueues land in
+the same trace as the request.
+
+Spans are written to TRACING_FILE as OTLP/JSON lines (the format a
+collector's `otlpjsonfile` receiver reads), or sent to an OTLP/HTTP collector
+with TRACING_EXPORTER=otlp (standard OTEL_EXPORTER_OTLP_* env vars).
+"""
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from opentelemetry import context, propagate, trace
+from opentelemetry.propagators.textmap import Getter
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+logger = logging.getLogger(__name__)
+
+TRACER_NAME = "therapy_ai"
+_NOOP_TRACER = trace.NoOpTracer()
+
+_provider: TracerProvider | None = None
+_tracer = None
+_provider_lock = threading.Lock()
+_task_spans: dict = {}
+
+
+# --- export ---------------------------------------------------------------
+
+def _any_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_any_value(v) for v in value]}}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attributes) -> list:
+    return [{"key": key, "value": _any_value(value)} for key, value in (attributes or {}).items()]
+
+
+def _encode_span(span) -> dict:
+    encoded = {
+        "traceId": format(span.context.trace_id, "032x"),
+        "spanId": format(span.context.span_id, "016x"),
+        "name": span.name,
+        "kind": span.kind.value + 1,  # OTLP reserves 0 for UNSPECIFIED
+        "startTimeUnixNano": str(span.start_time),
+        "endTimeUnixNano": str(span.end_time),
+        "attributes": _attributes(span.attributes),
+        "status": {"code": span.status.status_code.value},
+    }
+    if span.parent is not None:
+        encoded["parentSpanId"] = format(span.parent.span_id, "016x")
+    if span.status.description:
+        encoded["status"]["message"] = span.status.description
+    if span.events:
+        encoded["events"] = [
+            {"timeUnixNano": str(e.timestamp), "name": e.name, "attributes": _attributes(e.attributes)}
+            for e in span.events
+        ]
+    return encoded
+
+
+def encode_spans(spans) -> dict:
+    """An OTLP/JSON ExportTraceServiceRequest for finished SDK spans."""
+    resources: OrderedDict = OrderedDict()
+    for span in spans:
+        resource = resources.setdefault(id(span.resource), (span.resource, OrderedDict()))
+        scope = span.instrumentation_scope
+        scope_key = (scope.name, scope.version) if scope else ("", None)
+        resource[1].setdefault(scope_key, []).append(_encode_span(span))
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _attributes(resource.attributes)},
+                "scopeSpans": [
+                    {
+                        "scope": {"name": name, **({"version": version} if version else {})},
+                        "spans": encoded,
+                    }
+                    for (name, version), encoded in scopes.items()
+                ],
+            }
+            for resource, scopes in resources.values()
+        ]
+    }
+
+
+class OTLPJsonFileExporter(SpanExporter):
+    """Appends each exported batch to `path` as one OTLP/JSON line."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, spans) -> SpanExportResult:
+        line = json.dumps(encode_spans(spans), separators=(",", ":"))
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock, open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+        except OSError:
+            logger.exception("Could not write spans to %s", self.path)
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _default_exporter() -> SpanExporter:
+    if settings.TRACING_EXPORTER == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning(
+                "TRACING_EXPORTER=otlp needs opentelemetry-exporter-otlp-proto-http; writing spans to %s",
+                settings.TRACING_FILE,
+            )
+        else:
+            return OTLPSpanExporter()
+    return OTLPJsonFileExporter(settings.TRACING_FILE)
+
+
+# --- provider -------------------------------------------------------------
+
+def configure_tracing(exporter: SpanExporter | None = None, processor_class=BatchSpanProcessor) -> TracerProvider:
+    """(Re)build this process's tracer provider. Called lazily on first use."""
+    global _provider, _tracer
+    with _provider_lock:
+        if _provider is not None:
+            _provider.shutdown()
+        provider = TracerProvider(
+            resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}),
+            # workers follow the sampling decision carried in `traceparent`
+            sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATE)),
+        )
+        provider.add_span_processor(processor_class(exporter or _default_exporter()))
+        _provider, _tracer = provider, provider.get_tracer(TRACER_NAME)
+    return provider
+
+
+def shutdown_tracing() -> None:
+    """Flush and drop the provider; the next span rebuilds it if tracing is enabled."""
+    global _provider, _tracer
+    with _provider_lock:
+        provider, _provider, _tracer = _provider, None, None
+    if provider is not None:
+        provider.shutdown()
+
+
+def get_tracer():
+    tracer = _tracer
+    if tracer is None:
+        if not settings.TRACING_ENABLED:
+            return _NOOP_TRACER
+        configure_tracing()
+        tracer = _tracer
+    return tracer
+
+
+# --- spans ----------------------------------------------------------------
+
+@contextmanager
+def span(name: str, kind: SpanKind = SpanKind.INTERNAL, parent=None, **attributes):
+    """A span around the block; exceptions are recorded and mark it as an error."""
+    attributes = {key: value for key, value in attributes.items() if value is not None}
+    with get_tracer().start_as_current_span(name, context=parent, kind=kind, attributes=attributes) as current:
+        yield current
+
+
+@contextmanager
+def traced_atomic(name: str, using: str | None = None):
+    """transaction.atomic() with a span covering the transaction, commit included."""
+    alias = using or DEFAULT_DB_ALIAS
+    with span(f"db.transaction {name}", **{"db.system": connections[alias].vendor}):
+        with transaction.atomic(using=alias):
+            yield
+
+
+def on_commit(func, using: str | None = None) -> None:
+    """transaction.on_commit() that runs `func` in the trace context it was registered from."""
+    registered = context.get_current()
+
+    def run():
+        token = context.attach(registered)
+        try:
+            func()
+        finally:
+            context.detach(token)
+
+    if using is None:
+        transaction.on_commit(run)
+    else:
+        transaction.on_commit(run, using=using)
+
+
+def traced_view(name: str):
+    """Wrap a (viewset) view method in a server span, continuing the client's trace if any."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            parent = propagate.extract(request.headers, context=context.get_current())
+            with span(
+                name,
+                kind=SpanKind.SERVER,
+                parent=parent,
+                **{"http.method": request.method, "http.target": request.path, "session.id": kwargs.get("pk")},
+            ) as current:
+                response = method(view, request, *args, **kwargs)
+                current.set_attribute("http.status_code", response.status_code)
+                if response.status_code >= 500:
+                    current.set_status(Status(StatusCode.ERROR))
+                return response
+        return wrapper
+    return decorator
+
+
+# --- celery ---------------------------------------------------------------
+
+class _RequestGetter(Getter):
+    """Custom message headers show up as attributes of `task.request`."""
+
+    def get(self, carrier, key):
+        value = getattr(carrier, key, None)
+        if value is None:
+            value = (getattr(carrier, "headers", None) or {}).get(key)
+        return [value] if value else None
+
+    def keys(self, carrier):
+        return []
+
+
+_request_getter = _RequestGetter()
+
+
+def _short_name(name) -> str:
+    return (name or "unknown").rsplit(".", 1)[-1]
+
+
+def on_before_task_publish(sender=None, headers=None, routing_key=None, **kwargs):
+    if headers is None:
+        return
+    with span(
+        f"celery.publish {_short_name(sender)}",
+        kind=SpanKind.PRODUCER,
+        **{"messaging.destination": routing_key, "celery.task_id": headers.get("id")},
+    ):
+        propagate.inject(headers)
+
+
+def on_task_prerun(task_id=None, task=None, **kwargs):
+    request = getattr(task, "request", None)
+    parent = propagate.extract(request, context=context.get_current(), getter=_request_getter)
+    current = get_tracer().start_span(
+        f"celery.task {_short_name(getattr(task, 'name', None))}",
+        context=parent,
+        kind=SpanKind.CONSUMER,
+        attributes={"celery.task_id": task_id or "", "celery.retries": getattr(request, "retries", 0) or 0},
+    )
+    token = context.attach(trace.set_span_in_context(current, parent))
+    _task_spans[task_id] = (current, token)
+
+
+def on_task_failure(task_id=None, exception=None, **kwargs):
+    entry = _task_spans.get(task_id)
+    if entry and exception is not None:
+        entry[0].record_exception(exception)
+        entry[0].set_status(Status(StatusCode.ERROR, str(exception)[:200]))
+
+
+def on_task_postrun(task_id=None, task=None, state=None, **kwargs):
+    entry = _task_spans.pop(task_id, None)
+    if entry is None:
+        return
+    current, token = entry
+    current.set_attribute("celery.state", state or "UNKNOWN")
+    context.detach(token)
+    current.end()
+
+
+def on_worker_process_shutdown(**kwargs):
+    shutdown_tracing()
+
+
+def connect_celery_signals() -> None:
+    from celery import signals
+
+    signals.before_task_publish.connect(on_before_task_publish, weak=False)
+    signals.task_prerun.connect(on_task_prerun, weak=False)
+    signals.task_failure.connect(on_task_failure, weak=False)
+    signals.task_postrun.connect(on_task_postrun, weak=False)
+    signals.worker_process_shutdown.connect(on_worker_process_shutdown, weak=False)
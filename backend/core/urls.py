@@ -19,9 +19,12 @@ from django.contrib import admin
 from django.urls import include, path
 from django.conf import settings
 from django.conf.urls.static import static
+
+from core.metrics import metrics_view
     
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
     path("api/v1/", include("users.urls")),
     path("api/v1/", include("therapy_sessions.urls")),
     path("api/v1/", include("patients.urls")),
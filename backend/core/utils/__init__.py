@@ -0,0 +1 @@
+from .arabic import normalize_arabic
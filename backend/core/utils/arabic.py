@@ -0,0 +1,35 @@
+import re
+
+# harakat, tanween, shadda, sukun, superscript alef and Quranic marks
+ARABIC_DIACRITIC_RANGES = [(0x0610, 0x061A), (0x064B, 0x065F), (0x0670, 0x0670), (0x06D6, 0x06ED)]
+ARABIC_DIACRITICS = "".join(
+    chr(cp) for start, end in ARABIC_DIACRITIC_RANGES for cp in range(start, end + 1)
+)
+TATWEEL = "\u0640"
+
+# letter variants folded to a single form so spelling differences still match
+ARABIC_LETTER_MAP = {
+    "\u0622": "\u0627",  # آ -> ا
+    "\u0623": "\u0627",  # أ -> ا
+    "\u0625": "\u0627",  # إ -> ا
+    "\u0671": "\u0627",  # ٱ -> ا
+    "\u0649": "\u064A",  # ى -> ي
+    "\u0629": "\u0647",  # ة -> ه
+}
+
+_STRIP_RE = re.compile("[" + re.escape(ARABIC_DIACRITICS + TATWEEL) + "]")
+_LETTER_TABLE = str.maketrans(ARABIC_LETTER_MAP)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_arabic(text: str) -> str:
+    """
+    Normalize mixed Arabic/English text for matching:
+    drops diacritics and tatweel, folds alef/yaa/taa-marbuta variants,
+    lowercases latin text and collapses whitespace.
+    """
+    if not text:
+        return ""
+    text = _STRIP_RE.sub("", text)
+    text = text.translate(_LETTER_TABLE)
+    return _SPACE_RE.sub(" ", text).strip().casefold()
@@ -1,3 +1,42 @@
 from django.db import models
 
-# Create your models here.
+from core.models import TimeStampedModel
+
+
+class ProcessingLatencyRollup(TimeStampedModel):
+    """
+    Per-stage pipeline latency for one hour/day bucket, aggregated from
+    SessionProcessingTimeline. The analytics endpoint reads only this table.
+    """
+
+    GRANULARITY_CHOICES = [
+        ("hour", "Hour"),
+        ("day", "Day"),
+    ]
+
+    granularity = models.CharField(max_length=10, choices=GRANULARITY_CHOICES)
+    bucket_start = models.DateTimeField()
+    stage = models.CharField(max_length=30)  # queue_wait, transcription, report_queue, analysis, end_to_end
+
+    count = models.PositiveIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+
+    # seconds; null when only failures landed in the bucket
+    avg_seconds = models.FloatField(null=True, blank=True)
+    p50_seconds = models.FloatField(null=True, blank=True)
+    p95_seconds = models.FloatField(null=True, blank=True)
+    p99_seconds = models.FloatField(null=True, blank=True)
+    max_seconds = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        db_table = "processing_latency_rollup"
+        ordering = ["granularity", "bucket_start", "stage"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["granularity", "bucket_start", "stage"],
+                name="uniq_latency_rollup_bucket_stage",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.stage} | {self.granularity} {self.bucket_start:%Y-%m-%d %H:%M} | n={self.count}"
@@ -0,0 +1,40 @@
+from rest_framework import serializers
+
+from dashboard.models import ProcessingLatencyRollup
+from dashboard.services import GRANULARITIES, LATENCY_STAGES
+
+MAX_RANGE_DAYS = 90
+
+
+class ProcessingLatencyQuerySerializer(serializers.Serializer):
+    granularity = serializers.ChoiceField(choices=GRANULARITIES, default="hour")
+    stage = serializers.ChoiceField(choices=list(LATENCY_STAGES), required=False)
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        since, until = attrs.get("since"), attrs.get("until")
+        if since and until:
+            if since >= until:
+                raise serializers.ValidationError({"since": "Must be before 'until'."})
+            if (until - since).days > MAX_RANGE_DAYS:
+                raise serializers.ValidationError(
+                    {"since": f"Range cannot exceed {MAX_RANGE_DAYS} days."}
+                )
+        return attrs
+
+
+class ProcessingLatencyRollupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProcessingLatencyRollup
+        fields = [
+            "bucket_start",
+            "stage",
+            "count",
+            "failures",
+            "avg_seconds",
+            "p50_seconds",
+            "p95_seconds",
+            "p99_seconds",
+            "max_seconds",
+        ]
@@ -0,0 +1,9 @@
+from .counters import (
+    IN_FLIGHT_STATUSES,
+    bump,
+    compute_counters,
+    get_dashboard_stats,
+    reconcile_counters,
+    week_label,
+)
+from .latency import LATENCY_STAGES, GRANULARITIES, rollup_latency, rollup_recent_latency
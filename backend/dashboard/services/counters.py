@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from typing import Dict, Iterable, Optional
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from core.instrumentation import record_cache_lookup
+from patients.models import Patient
+from therapy_sessions.models import TherapySession, SessionReport
+
+IN_FLIGHT_STATUSES = ("transcribing", "transcribed", "analyzing")
+
+# counters that only cover the current (Monday-based, local time) week
+WEEKLY_COUNTERS = ("sessions_this_week", "reports_ready_this_week")
+TOTAL_COUNTERS = ("patients_count", "failed_sessions", "in_flight_jobs")
+COUNTERS = TOTAL_COUNTERS + WEEKLY_COUNTERS
+
+# reconciliation rewrites every key well before this, it only bounds stale weeks
+COUNTER_TIMEOUT = 8 * 24 * 60 * 60
+
+
+def week_label(moment: Optional[datetime] = None) -> str:
+    day = timezone.localdate(moment) if moment else timezone.localdate()
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def week_bounds():
+    today = timezone.localdate()
+    start = timezone.make_aware(datetime.combine(today - timedelta(days=today.weekday()), time.min))
+    return start, start + timedelta(days=7)
+
+
+def counter_key(therapist_id: int, name: str, week: Optional[str] = None) -> str:
+    if name in WEEKLY_COUNTERS:
+        return f"dashboard:{therapist_id}:{name}:{week or week_label()}"
+    return f"dashboard:{therapist_id}:{name}"
+
+
+def bump(therapist_id: int, name: str, delta: int = 1, week: Optional[str] = None) -> None:
+    """
+    Apply a transition to a cached counter. Missing keys are left alone:
+    they are rebuilt from the database on the next read or reconciliation.
+    """
+    try:
+        cache.incr(counter_key(therapist_id, name, week), delta)
+    except ValueError:
+        pass
+
+
+def compute_counters(therapist_ids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+    """Authoritative counts from the database, a handful of grouped queries per batch."""
+    ids = list(therapist_ids)
+    counters = {tid: dict.fromkeys(COUNTERS, 0) for tid in ids}
+    start, end = week_bounds()
+
+    patients = (
+        Patient.objects.filter(therapist_id__in=ids, is_active=True)
+        .values("therapist_id")
+        .annotate(n=Count("id"))
+    )
+    for row in patients:
+        counters[row["therapist_id"]]["patients_count"] = row["n"]
+
+    sessions = (
+        TherapySession.objects.filter(therapist_id__in=ids, patient__is_active=True)
+        .values("therapist_id")
+        .annotate(
+            sessions_this_week=Count("id", filter=Q(created_at__gte=start, created_at__lt=end)),
+            failed_sessions=Count("id", filter=Q(status="failed")),
+            in_flight_jobs=Count("id", filter=Q(status__in=IN_FLIGHT_STATUSES)),
+        )
+    )
+    for row in sessions:
+        tid = row.pop("therapist_id")
+        counters[tid].update(row)
+
+    reports = (
+        SessionReport.objects.filter(
+            session__therapist_id__in=ids,
+            status="completed",
+            updated_at__gte=start,
+            updated_at__lt=end,
+        )
+        .values("session__therapist_id")
+        .annotate(n=Count("id"))
+    )
+    for row in reports:
+        counters[row["session__therapist_id"]]["reports_ready_this_week"] = row["n"]
+
+    return counters
+
+
+def reconcile_counters(therapist_ids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+    counters = compute_counters(therapist_ids)
+    cache.set_many(
+        {
+            counter_key(tid, name): value
+            for tid, values in counters.items()
+            for name, value in values.items()
+        },
+        timeout=COUNTER_TIMEOUT,
+    )
+    return counters
+
+
+def get_dashboard_stats(therapist_id: int) -> Dict[str, int]:
+    """
+    Cache-only on the hot path; a cold or partially evicted set of counters
+    is rebuilt for this therapist in one go.
+    """
+    keys = {name: counter_key(therapist_id, name) for name in COUNTERS}
+    cached = cache.get_many(keys.values())
+    record_cache_lookup(hits=len(cached), misses=len(keys) - len(cached))
+    if len(cached) == len(keys):
+        # decrements racing a rebuild can briefly undershoot
+        return {name: max(cached[key], 0) for name, key in keys.items()}
+    return reconcile_counters([therapist_id])[therapist_id]
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import Aggregate, Avg, Count, F, FloatField, Func, Max
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from dashboard.models import ProcessingLatencyRollup
+from therapy_sessions.models import SessionProcessingTimeline
+
+# stage -> (start stamp, end stamp); a duration lands in the bucket of its end
+LATENCY_STAGES = {
+    "queue_wait": ("uploaded_at", "transcription_started_at"),
+    "transcription": ("transcription_started_at", "transcription_finished_at"),
+    "report_queue": ("transcription_finished_at", "analysis_started_at"),
+    "analysis": ("analysis_started_at", "analysis_finished_at"),
+    "end_to_end": ("uploaded_at", "completed_at"),
+}
+
+GRANULARITIES = ("hour", "day")
+
+
+class Percentile(Aggregate):
+    """Postgres continuous percentile: percentile_cont(f) WITHIN GROUP (ORDER BY expr)."""
+
+    function = "percentile_cont"
+    template = "%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+    output_field = FloatField()
+
+    def __init__(self, expression, fraction, **extra):
+        super().__init__(expression, fraction=float(fraction), **extra)
+
+
+class Seconds(Func):
+    template = "EXTRACT(EPOCH FROM %(expressions)s)"
+    output_field = FloatField()
+
+
+def bucket_floor(moment: datetime, granularity: str) -> datetime:
+    moment = timezone.localtime(moment)
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return timezone.make_aware(datetime.combine(moment.date(), time.min))
+
+
+def _stage_rows(granularity, since, start_field, end_field):
+    return (
+        SessionProcessingTimeline.objects.filter(
+            updated_at__gte=since,
+            **{f"{end_field}__gte": since, f"{start_field}__isnull": False},
+        )
+        .annotate(
+            bucket=Trunc(end_field, granularity),
+            duration=Seconds(F(end_field) - F(start_field)),
+        )
+        .values("bucket")
+        .annotate(
+            count=Count("id"),
+            avg_seconds=Avg("duration"),
+            p50_seconds=Percentile("duration", 0.5),
+            p95_seconds=Percentile("duration", 0.95),
+            p99_seconds=Percentile("duration", 0.99),
+            max_seconds=Max("duration"),
+        )
+    )
+
+
+def _failure_rows(granularity, since):
+    return (
+        SessionProcessingTimeline.objects.filter(updated_at__gte=since, failed_at__gte=since)
+        .exclude(failed_stage="")
+        .annotate(bucket=Trunc("failed_at", granularity))
+        .values("bucket", "failed_stage")
+        .annotate(n=Count("id"))
+    )
+
+
+def rollup_latency(granularity: str, since: datetime) -> int:
+    """
+    Recompute every `granularity` bucket from the one containing `since`
+    onwards. Buckets are rebuilt whole, so re-running over the same window
+    is idempotent. Returns the number of rollup rows written.
+    """
+    since = bucket_floor(since, granularity)
+    rollups = {}
+
+    for stage, (start_field, end_field) in LATENCY_STAGES.items():
+        for row in _stage_rows(granularity, since, start_field, end_field):
+            bucket = row.pop("bucket")
+            rollups[bucket, stage] = ProcessingLatencyRollup(
+                granularity=granularity, bucket_start=bucket, stage=stage, **row,
+            )
+
+    for row in _failure_rows(granularity, since):
+        key = (row["bucket"], row["failed_stage"])
+        if key not in rollups:
+            rollups[key] = ProcessingLatencyRollup(
+                granularity=granularity, bucket_start=row["bucket"], stage=row["failed_stage"],
+            )
+        rollups[key].failures = row["n"]
+
+    with transaction.atomic():
+        ProcessingLatencyRollup.objects.filter(
+            granularity=granularity, bucket_start__gte=since
+        ).delete()
+        ProcessingLatencyRollup.objects.bulk_create(rollups.values())
+    return len(rollups)
+
+
+def rollup_recent_latency(lookback_hours: int = 2, now: Optional[datetime] = None) -> dict:
+    now = now or timezone.now()
+    since = now - timedelta(hours=lookback_hours)
+    return {granularity: rollup_latency(granularity, since) for granularity in GRANULARITIES}
@@ -0,0 +1,90 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from dashboard.services import IN_FLIGHT_STATUSES, bump, reconcile_counters, week_label
+from patients.models import Patient
+from patients.signals import patients_bulk_created, patients_removed
+from therapy_sessions.models import TherapySession, SessionReport
+from therapy_sessions.signals import report_status_changed, session_status_changed
+
+# session status -> total counter it contributes to
+STATUS_COUNTERS = {"failed": "failed_sessions"}
+STATUS_COUNTERS.update(dict.fromkeys(IN_FLIGHT_STATUSES, "in_flight_jobs"))
+
+
+@receiver(post_save, sender=Patient)
+def count_created_patient(sender, instance, created=False, **kwargs):
+    if created:
+        therapist_id = instance.therapist_id
+        transaction.on_commit(lambda: bump(therapist_id, "patients_count"))
+
+
+@receiver(post_delete, sender=Patient)
+def count_deleted_patient(sender, instance, **kwargs):
+    therapist_id = instance.therapist_id
+    transaction.on_commit(lambda: bump(therapist_id, "patients_count", -1))
+
+
+@receiver(patients_bulk_created, sender=Patient)
+def count_imported_patients(sender, therapist_id, count, **kwargs):
+    bump(therapist_id, "patients_count", count)
+
+
+@receiver(patients_removed, sender=Patient)
+def recount_removed_patients(sender, therapist_id, **kwargs):
+    # hidden/purged rows took sessions and reports with them; recount rather than diff
+    reconcile_counters([therapist_id])
+
+
+@receiver(session_status_changed, sender=TherapySession)
+def count_session_transition(sender, instance, old_status, new_status, **kwargs):
+    therapist_id = instance.therapist_id
+
+    if old_status is None or new_status is None:
+        delta = 1 if old_status is None else -1
+        bump(therapist_id, "sessions_this_week", delta, week=week_label(instance.created_at))
+
+    if old_status in STATUS_COUNTERS:
+        bump(therapist_id, STATUS_COUNTERS[old_status], -1)
+    if new_status in STATUS_COUNTERS:
+        bump(therapist_id, STATUS_COUNTERS[new_status], 1)
+
+
+def _report_therapist_id(report):
+    return (
+        TherapySession.objects.filter(pk=report.session_id)
+        .values_list("therapist_id", flat=True)
+        .first()
+    )
+
+
+@receiver(report_status_changed, sender=SessionReport)
+def count_report_transition(sender, instance, old_status, new_status, **kwargs):
+    # deletions are handled by count_deleted_report
+    if new_status is None or "completed" not in (old_status, new_status):
+        return
+
+    therapist_id = _report_therapist_id(instance)
+    if therapist_id is None:
+        return
+
+    if new_status == "completed":
+        bump(therapist_id, "reports_ready_this_week")
+    else:
+        bump(therapist_id, "reports_ready_this_week", -1, week=week_label(instance.updated_at))
+
+
+@receiver(post_delete, sender=SessionReport)
+def count_deleted_report(sender, instance, **kwargs):
+    if instance.status != "completed":
+        return
+
+    # resolved inside the transaction: on a cascading delete the session row
+    # is gone by the time on_commit callbacks run
+    therapist_id = _report_therapist_id(instance)
+    if therapist_id is None:
+        return
+
+    week = week_label(instance.updated_at)
+    transaction.on_commit(lambda: bump(therapist_id, "reports_ready_this_week", -1, week=week))
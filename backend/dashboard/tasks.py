@@ -0,0 +1,30 @@
+from celery import shared_task
+from django.contrib.auth import get_user_model
+
+from dashboard.services import reconcile_counters, rollup_recent_latency
+
+RECONCILE_BATCH_SIZE = 500
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=10)
+def reconcile_dashboard_counters(self):
+    """Rewrite every therapist's cached counters from the database (drift repair)."""
+    therapist_ids = list(
+        get_user_model().objects.filter(is_therapist=True)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    for i in range(0, len(therapist_ids), RECONCILE_BATCH_SIZE):
+        reconcile_counters(therapist_ids[i:i + RECONCILE_BATCH_SIZE])
+
+    return {"ok": True, "therapists": len(therapist_ids)}
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=10)
+def rollup_processing_latency(self, lookback_hours: int = 2):
+    """
+    Rebuild the latency rollups touched in the last `lookback_hours`
+    (pass a larger window to backfill).
+    """
+    written = rollup_recent_latency(lookback_hours=lookback_hours)
+    return {"ok": True, "rows": written}
@@ -0,0 +1,95 @@
+import pytest
+from django.core.cache import cache
+
+from dashboard.services import get_dashboard_stats
+from dashboard.services.counters import counter_key
+from dashboard.tasks import reconcile_dashboard_counters
+from therapy_sessions.models import SessionReport
+from therapy_sessions.services.status import set_session_status
+
+API = "/api/v1"
+DASHBOARD_URL = f"{API}/dashboard/"
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestDashboardCounters:
+    def test_cold_read_builds_counters_from_db(self, auth_client_a, therapist_a, make_session):
+        make_session(therapist_a, status="failed")
+
+        res = auth_client_a.get(DASHBOARD_URL)
+        assert res.status_code == 200
+        assert res.data == {
+            "patients_count": 1,
+            "sessions_this_week": 1,
+            "reports_ready_this_week": 0,
+            "failed_sessions": 1,
+            "in_flight_jobs": 0,
+        }
+
+    def test_transitions_update_cached_counters(
+        self, therapist_a, make_session, django_capture_on_commit_callbacks, django_assert_num_queries
+    ):
+        get_dashboard_stats(therapist_a.id)  # warm
+
+        with django_capture_on_commit_callbacks(execute=True):
+            session = make_session(therapist_a, status="transcribing")
+
+        with django_assert_num_queries(0):
+            stats = get_dashboard_stats(therapist_a.id)
+        assert stats["patients_count"] == 1
+        assert stats["sessions_this_week"] == 1
+        assert stats["in_flight_jobs"] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            set_session_status(session.id, "failed", last_error_stage="transcription")
+
+        stats = get_dashboard_stats(therapist_a.id)
+        assert stats["in_flight_jobs"] == 0
+        assert stats["failed_sessions"] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            SessionReport.objects.create(session=session, status="completed")
+            set_session_status(session.id, "completed")
+
+        stats = get_dashboard_stats(therapist_a.id)
+        assert stats["failed_sessions"] == 0
+        assert stats["reports_ready_this_week"] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            session.patient.delete()
+
+        assert get_dashboard_stats(therapist_a.id) == {
+            "patients_count": 0,
+            "sessions_this_week": 0,
+            "reports_ready_this_week": 0,
+            "failed_sessions": 0,
+            "in_flight_jobs": 0,
+        }
+
+    def test_counters_are_per_therapist(
+        self, therapist_a, therapist_b, make_session, django_capture_on_commit_callbacks
+    ):
+        get_dashboard_stats(therapist_b.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            make_session(therapist_a)
+
+        assert get_dashboard_stats(therapist_a.id)["patients_count"] == 1
+        assert get_dashboard_stats(therapist_b.id)["patients_count"] == 0
+
+    def test_reconcile_repairs_drift(self, therapist_a, make_session):
+        make_session(therapist_a, status="analyzing")
+        get_dashboard_stats(therapist_a.id)
+        cache.set(counter_key(therapist_a.id, "in_flight_jobs"), 7)
+
+        result = reconcile_dashboard_counters()
+
+        assert result["ok"] is True
+        assert get_dashboard_stats(therapist_a.id)["in_flight_jobs"] == 1
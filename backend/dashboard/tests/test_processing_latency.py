@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from dashboard.models import ProcessingLatencyRollup
+from dashboard.services import rollup_latency
+from therapy_sessions.services.timeline import mark_stage
+
+API = "/api/v1"
+LATENCY_URL = f"{API}/dashboard/processing-latency/"
+
+
+@pytest.fixture
+def sessions(therapist_a, patient_a, make_session):
+    return [make_session(therapist_a, patient=patient_a) for _ in range(4)]
+
+
+@pytest.fixture
+def hour_start():
+    return timezone.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=1)
+
+
+def _run_pipeline(session, uploaded, transcription_s, analysis_s):
+    t = uploaded
+    mark_stage(session.id, "uploaded", at=t)
+    mark_stage(session.id, "transcription_started", at=t + timedelta(seconds=5))
+    t += timedelta(seconds=5 + transcription_s)
+    mark_stage(session.id, "transcription_finished", at=t)
+    mark_stage(session.id, "analysis_started", at=t)
+    t += timedelta(seconds=analysis_s)
+    mark_stage(session.id, "analysis_finished", at=t)
+    mark_stage(session.id, "completed", at=t)
+
+
+@pytest.mark.django_db
+class TestTimeline:
+    def test_upload_starts_a_new_attempt(self, sessions):
+        session = sessions[0]
+        mark_stage(session.id, "uploaded")
+        mark_stage(session.id, "failed", failed_stage="transcription")
+
+        timeline = mark_stage(session.id, "uploaded")
+
+        assert timeline.failed_at is None
+        assert timeline.failed_stage == ""
+
+    def test_retried_start_keeps_first_stamp(self, sessions):
+        first = timezone.now() - timedelta(minutes=3)
+        mark_stage(sessions[0].id, "transcription_started", at=first)
+
+        timeline = mark_stage(sessions[0].id, "transcription_started")
+
+        assert timeline.transcription_started_at == first
+
+
+@pytest.mark.django_db
+class TestLatencyRollups:
+    def test_hourly_percentiles_per_stage(self, sessions, hour_start):
+        for i, session in enumerate(sessions[:3]):
+            _run_pipeline(session, hour_start + timedelta(minutes=i), transcription_s=60 * (i + 1), analysis_s=30)
+        mark_stage(sessions[3].id, "uploaded", at=hour_start)
+        mark_stage(sessions[3].id, "failed", at=hour_start + timedelta(minutes=1), failed_stage="transcription")
+
+        rollup_latency("hour", hour_start)
+
+        rows = {r.stage: r for r in ProcessingLatencyRollup.objects.filter(granularity="hour")}
+        transcription = rows["transcription"]
+        assert transcription.bucket_start == hour_start
+        assert transcription.count == 3
+        assert transcription.failures == 1
+        assert transcription.p50_seconds == pytest.approx(120)
+        assert transcription.max_seconds == pytest.approx(180)
+        assert rows["analysis"].p95_seconds == pytest.approx(30)
+        assert rows["end_to_end"].count == 3
+
+    def test_rerun_is_idempotent(self, sessions, hour_start):
+        _run_pipeline(sessions[0], hour_start, transcription_s=60, analysis_s=30)
+
+        rollup_latency("day", hour_start)
+        rollup_latency("day", hour_start)
+
+        assert ProcessingLatencyRollup.objects.filter(granularity="day", stage="end_to_end").count() == 1
+
+    def test_endpoint_is_staff_only(self, auth_client_a, sessions, hour_start):
+        _run_pipeline(sessions[0], hour_start, transcription_s=60, analysis_s=30)
+        rollup_latency("hour", hour_start)
+
+        assert auth_client_a.get(LATENCY_URL).status_code == 403
+
+        staff = get_user_model().objects.create_user(
+            email="ops@test.com", password="pass1234", is_staff=True
+        )
+        auth_client_a.force_authenticate(user=staff)
+        res = auth_client_a.get(LATENCY_URL, {"stage": "analysis"})
+
+        assert res.status_code == 200
+        assert res.data["granularity"] == "hour"
+        assert [r["stage"] for r in res.data["results"]] == ["analysis"]
+        assert res.data["results"][0]["p50_seconds"] == pytest.approx(30)
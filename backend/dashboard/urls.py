@@ -1,6 +1,9 @@
 from django.urls import path
-from .views import TherapistDashboardStatsView
+from .views import ProcessingLatencyView, RoutePerformanceView, StorageTieringView, TherapistDashboardStatsView
 
 urlpatterns = [
 path("", TherapistDashboardStatsView.as_view(), name="therapist_dashboard"),
+path("processing-latency/", ProcessingLatencyView.as_view(), name="processing_latency"),
+path("route-performance/", RoutePerformanceView.as_view(), name="route_performance"),
+path("storage-tiering/", StorageTieringView.as_view(), name="storage_tiering"),
 ]
@@ -1,37 +1,72 @@
 from datetime import timedelta
+
 from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+
+from core.instrumentation import route_stats
+from dashboard.models import ProcessingLatencyRollup
+from dashboard.serializers import (
+    ProcessingLatencyQuerySerializer,
+    ProcessingLatencyRollupSerializer,
+)
+from dashboard.services import get_dashboard_stats
+from therapy_sessions.services.storage import tiering_report
 
-from patients.models import Patient
-from therapy_sessions.models import TherapySession
+DEFAULT_LATENCY_WINDOW = timedelta(days=7)
 
 
 class TherapistDashboardStatsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        therapist = request.user
+        # served from the cached counters, no COUNT(*) on the session tables
+        return Response(get_dashboard_stats(request.user.id))
+
+
+class ProcessingLatencyView(APIView):
+    """Stage latency percentiles for staff; reads the rollup table only."""
 
-        # Patients count
-        patients_count = Patient.objects.filter(
-            therapist=therapist
-        ).count()
+    permission_classes = [IsAdminUser]
 
-        # Calculate current week range
-        now = timezone.now()
-        start_of_week = now - timedelta(days=now.weekday())
-        end_of_week = start_of_week + timedelta(days=7)
+    def get(self, request):
+        ser = ProcessingLatencyQuerySerializer(data=request.query_params)
+        ser.is_valid(raise_exception=True)
+        params = ser.validated_data
+
+        until = params.get("until") or timezone.now()
+        since = params.get("since") or until - DEFAULT_LATENCY_WINDOW
 
-        # Sessions this week
-        sessions_this_week = TherapySession.objects.filter(
-            therapist=therapist,
-            session_date__gte=start_of_week,
-            session_date__lt=end_of_week,
-        ).count()
+        qs = ProcessingLatencyRollup.objects.filter(
+            granularity=params["granularity"],
+            bucket_start__gte=since,
+            bucket_start__lt=until,
+        )
+        if params.get("stage"):
+            qs = qs.filter(stage=params["stage"])
 
         return Response({
-            "patients_count": patients_count,
-            "sessions_this_week": sessions_this_week,
-        })
\ No newline at end of file
+            "granularity": params["granularity"],
+            "since": since,
+            "until": until,
+            "results": ProcessingLatencyRollupSerializer(qs, many=True).data,
+        })
+
+
+class StorageTieringView(APIView):
+    """Hot/cold audio counts and the bytes cold tiering saved, for staff."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(tiering_report())
+
+
+class RoutePerformanceView(APIView):
+    """Sampled per-route latency histograms of the worker serving the request."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(route_stats())
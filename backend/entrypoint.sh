@@ -9,6 +9,12 @@ python manage.py migrate
 # echo "Collecting static files..."
 # python manage.py collectstatic --noinput
 
+# Prometheus multiprocess files must not survive a restart
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+  rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+  mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 # Start the Django web server using Gunicorn
 echo "Starting the Django web server..."
 gunicorn --bind 0.0.0.0:8000 core.wsgi:application
@@ -0,0 +1,8 @@
+# loaded automatically by gunicorn from the working directory
+
+
+def child_exit(server, worker):
+    # drop the dead worker's live gauges from the Prometheus multiprocess directory
+    from core.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
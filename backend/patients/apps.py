@@ -1,5 +1,26 @@
 from django.apps import AppConfig
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models.signals import pre_migrate
+
+# needed by the trigram autocomplete indexes on Patient
+POSTGRES_EXTENSIONS = ["pg_trgm", "btree_gin", "btree_gist"]
+
+
+def create_postgres_extensions(using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Migrations are generated at deploy time, so extensions are created here
+    (before any migration runs) instead of in a hand-written migration.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        for extension in POSTGRES_EXTENSIONS:
+            cursor.execute(f"CREATE EXTENSION IF NOT EXISTS {extension}")
 
 
 class PatientsConfig(AppConfig):
     name = 'patients'
+
+    def ready(self):
+        pre_migrate.connect(create_postgres_extensions, sender=self)
@@ -0,0 +1,128 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from patients.models import Patient
+from patients.services import autocomplete_patients
+
+User = get_user_model()
+
+BENCH_EMAIL = "bench-autocomplete@example.com"
+
+FIRST_NAMES = [
+    "Ahmed", "Mohamed", "Mahmoud", "Omar", "Youssef", "Mostafa", "Karim", "Hassan",
+    "Mona", "Salma", "Nour", "Aya", "Mariam", "Yasmin", "Heba", "Dina",
+    "أحمد", "محمد", "محمود", "عمر", "يوسف", "مصطفى", "منى", "سلمى", "نور", "مريم",
+]
+LAST_NAMES = [
+    "Ali", "Ibrahim", "Hussein", "Abdelrahman", "Saleh", "Fathy", "Kamal", "Naguib",
+    "علي", "إبراهيم", "حسين", "صالح", "فتحي", "كمال", "نجيب", "عبدالله",
+]
+PHONE_PREFIXES = ["010", "011", "012", "015"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed one therapist with many patients and measure autocomplete latency "
+        "(name prefix, fuzzy name, national ID prefix, phone fragment)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--patients", type=int, default=20000)
+        parser.add_argument("--queries", type=int, default=400)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--p95-budget-ms", type=float, default=20.0)
+        parser.add_argument("--cleanup", action="store_true", help="Delete the benchmark therapist afterwards.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+
+        therapist, _ = User.objects.get_or_create(
+            email=BENCH_EMAIL,
+            defaults={"is_therapist": True, "is_verified": True},
+        )
+        self._seed(therapist, options["patients"], rng)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE patients_patient")
+
+        sample = list(
+            Patient.objects.filter(therapist=therapist)
+            .values_list("full_name", "patient_id", "contact_phone")[:2000]
+        )
+        if not sample:
+            raise CommandError("No patients to query.")
+
+        timings = {"name_prefix": [], "name_fuzzy": [], "national_id": [], "phone": []}
+        for i in range(options["queries"]):
+            name, national_id, phone = rng.choice(sample)
+            kind = list(timings)[i % len(timings)]
+            q = self._query_for(kind, name, national_id, phone, rng)
+
+            started = time.perf_counter()
+            list(autocomplete_patients(therapist, q))
+            timings[kind].append((time.perf_counter() - started) * 1000)
+
+        overall = [t for values in timings.values() for t in values]
+        for kind, values in [*timings.items(), ("all", overall)]:
+            self.stdout.write(f"{kind:<12} {self._summary(values)}")
+
+        p95 = self._percentile(overall, 95)
+
+        if options["cleanup"]:
+            therapist.delete()
+
+        if p95 > options["p95_budget_ms"]:
+            raise CommandError(f"p95 {p95:.2f} ms exceeds budget of {options['p95_budget_ms']} ms")
+        self.stdout.write(self.style.SUCCESS(f"p95 {p95:.2f} ms within budget"))
+
+    def _seed(self, therapist, count, rng):
+        existing = Patient.objects.filter(therapist=therapist).count()
+        if existing >= count:
+            return
+
+        batch = []
+        for i in range(existing, count):
+            batch.append(Patient(
+                therapist=therapist,
+                full_name=" ".join([
+                    rng.choice(FIRST_NAMES), rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                ]),
+                patient_id=f"{rng.choice('23')}{rng.randint(0, 99):02d}{rng.randint(1, 12):02d}"
+                           f"{rng.randint(1, 28):02d}{i:07d}",
+                contact_phone=f"{PHONE_PREFIXES[i % 4]}{i:08d}",
+            ))
+            if len(batch) >= 2000:
+                Patient.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Patient.objects.bulk_create(batch)
+        self.stdout.write(f"seeded {count - existing} patients")
+
+    def _query_for(self, kind, name, national_id, phone, rng):
+        if kind == "name_prefix":
+            return name[:rng.randint(3, 6)]
+        if kind == "name_fuzzy":
+            word = rng.choice(name.split(" "))
+            # drop one character to simulate a typo
+            pos = rng.randrange(len(word))
+            return word[:pos] + word[pos + 1:] if len(word) > 3 else word
+        if kind == "national_id":
+            return national_id[:rng.randint(4, 8)]
+        return phone[-rng.randint(4, 7):]
+
+    @staticmethod
+    def _percentile(values, pct):
+        if len(values) < 2:
+            return values[0] if values else 0.0
+        return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+    def _summary(self, values):
+        return (
+            f"n={len(values):<4} p50={self._percentile(values, 50):6.2f}ms "
+            f"p95={self._percentile(values, 95):6.2f}ms p99={self._percentile(values, 99):6.2f}ms"
+        )
@@ -1,7 +1,9 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, GistIndex, OpClass
 from django.db import models
 from django.core.exceptions import ValidationError
-from django.db.models import Q
+from django.db.models import F, Q
+from django.db.models.functions import Upper
 from core.models import TimeStampedModel
 
 class Patient(TimeStampedModel):
@@ -23,6 +25,9 @@ class Patient(TimeStampedModel):
 
     notes = models.TextField(blank=True, default="")
 
+    # cleared as soon as a deletion is requested; the rows go later (users.DeletionJob)
+    is_active = models.BooleanField(default=True)
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -40,6 +45,27 @@ class Patient(TimeStampedModel):
             )
 
         ]
+        # trigram indexes for autocomplete, led by therapist_id (btree_gin /
+        # btree_gist) so lookups stay inside one therapist's patients
+        indexes = [
+            # GiST so fuzzy name matches can be ranked by distance straight
+            # from the index (KNN) instead of scoring every candidate
+            GistIndex(
+                OpClass(F("therapist_id"), name="gist_int8_ops"),
+                OpClass(Upper("full_name"), name="gist_trgm_ops"),
+                name="patient_name_trgm",
+            ),
+            GinIndex(
+                fields=["therapist", "patient_id"],
+                opclasses=["int8_ops", "gin_trgm_ops"],
+                name="patient_national_id_trgm",
+            ),
+            GinIndex(
+                fields=["therapist", "contact_phone"],
+                opclasses=["int8_ops", "gin_trgm_ops"],
+                name="patient_phone_trgm",
+            ),
+        ]
 
     def clean(self):
         if self.therapist and not getattr(self.therapist, "is_therapist", False):
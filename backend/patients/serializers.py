@@ -1,6 +1,7 @@
 import re
 from rest_framework import serializers
 from .models import Patient
+from .utils import EGYPT_MOBILE_PREFIXES, normalize_phone_digits
 
 
 class PatientSerializer(serializers.ModelSerializer):
@@ -48,20 +49,12 @@ class PatientSerializer(serializers.ModelSerializer):
         return value
 
     def validate_contact_phone(self, value):
-        digits = re.sub(r"\D", "", value)
-
-        if digits.startswith("0020"):
-            digits = digits[4:]
-        elif digits.startswith("20"):
-            digits = digits[2:]
-
-        if not digits.startswith("0"):
-            digits = "0" + digits
+        digits = normalize_phone_digits(value)
 
         if len(digits) != 11:
             raise serializers.ValidationError("Egyptian phone number must be exactly 11 digits.")
 
-        if not digits.startswith(("010", "011", "012", "015")):
+        if not digits.startswith(EGYPT_MOBILE_PREFIXES):
             raise serializers.ValidationError("Phone number must be a valid Egyptian mobile number.")
 
         return digits
@@ -88,3 +81,37 @@ class PatientSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({"patient_id": "This national ID is already used for another patient."})
 
         return attrs
+
+
+class PatientAutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100, trim_whitespace=True)
+    limit = serializers.IntegerField(min_value=1, max_value=25, required=False, default=10)
+
+
+class PatientAutocompleteSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    full_name = serializers.CharField()
+    patient_id = serializers.CharField()
+    contact_phone = serializers.CharField()
+
+
+class PatientImportRowSerializer(PatientSerializer):
+    """
+    Field-level rules of PatientSerializer for one imported row. Uniqueness
+    is checked for the whole batch by the import service instead.
+    """
+
+    def validate(self, attrs):
+        return attrs
+
+
+class PatientImportSerializer(serializers.Serializer):
+    file = serializers.FileField(required=False)
+    patients = serializers.ListField(child=serializers.DictField(), required=False)
+    dry_run = serializers.BooleanField(required=False, default=False)
+    skip_invalid = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        if bool(attrs.get("file")) == ("patients" in attrs):
+            raise serializers.ValidationError("Send either a CSV 'file' or a 'patients' list.")
+        return attrs
@@ -0,0 +1,8 @@
+from .autocomplete import autocomplete_patients
+from .bulk_import import (
+    ImportConflict,
+    PatientImportError,
+    PatientImportResult,
+    import_patients,
+    parse_csv,
+)
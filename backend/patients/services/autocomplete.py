@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import re
+
+from django.contrib.postgres.search import TrigramWordDistance
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Upper
+
+from patients.models import Patient
+from patients.utils import strip_country_code
+
+MAX_RESULTS = 25
+AUTOCOMPLETE_FIELDS = ("id", "full_name", "patient_id", "contact_phone")
+
+_NUMERIC_QUERY_RE = re.compile(r"[\d\s+\-()]+")
+
+
+def autocomplete_patients(therapist, q: str, limit: int = 10):
+    """
+    Prefix + fuzzy lookup over name, national ID and phone for one therapist.
+    Every branch is served by a (therapist_id, <field> trigram) index.
+    Returns a small `.values()` projection.
+    """
+    q = re.sub(r"\s+", " ", q or "").strip()
+    if not q:
+        return Patient.objects.none()
+
+    limit = max(1, min(int(limit), MAX_RESULTS))
+    qs = Patient.objects.filter(therapist=therapist, is_active=True)
+
+    if _NUMERIC_QUERY_RE.fullmatch(q):
+        digits = re.sub(r"\D", "", q)
+        if not digits:
+            return Patient.objects.none()
+        # stored phones use the local 01xxxxxxxxx form
+        national = strip_country_code(digits, fragment=True)
+        phone = digits if national == digits else "0" + national
+        qs = qs.filter(
+            Q(patient_id__startswith=digits) | Q(contact_phone__contains=phone)
+        ).annotate(
+            match_order=Case(
+                When(Q(patient_id=digits) | Q(contact_phone=phone), then=Value(0)),
+                When(Q(patient_id__startswith=digits) | Q(contact_phone__startswith=phone), then=Value(1)),
+                default=Value(2),
+                output_field=IntegerField(),
+            )
+        ).order_by("match_order", "full_name")
+    else:
+        # word-similarity on UPPER(full_name) covers prefixes, inner substrings
+        # and typos; ordering by distance alone lets the GiST index return the
+        # nearest rows without ranking every match
+        term = q.upper()
+        qs = qs.alias(name_upper=Upper("full_name")).filter(
+            name_upper__trigram_word_similar=term
+        ).order_by(TrigramWordDistance(Value(term), "name_upper"))
+
+    return qs.values(*AUTOCOMPLETE_FIELDS)[:limit]
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import csv
+import io
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from patients.models import Patient
+from patients.serializers import PatientImportRowSerializer
+from patients.signals import patients_bulk_created
+
+MAX_IMPORT_ROWS = 10_000
+BULK_CREATE_BATCH_SIZE = 1_000
+
+IMPORT_FIELDS = (
+    "full_name",
+    "patient_id",
+    "gender",
+    "date_of_birth",
+    "contact_phone",
+    "contact_email",
+    "notes",
+)
+
+# field -> message, matching the single-patient endpoint
+UNIQUE_FIELDS = {
+    "patient_id": "This national ID is already used for another patient.",
+    "contact_phone": "This phone number is already used for another patient.",
+    "contact_email": "This email is already used for another patient.",
+}
+
+
+class PatientImportError(Exception):
+    """The upload itself is unusable (bad encoding, missing columns, too many rows)."""
+
+
+class ImportConflict(Exception):
+    """A concurrent write took one of the imported values between check and insert."""
+
+
+@dataclass
+class PatientImportResult:
+    total: int
+    created: int = 0
+    dry_run: bool = False
+    errors: List[Dict] = field(default_factory=list)
+
+
+def parse_csv(uploaded_file) -> List[Dict[str, str]]:
+    try:
+        text = io.TextIOWrapper(uploaded_file, encoding="utf-8-sig", newline="")
+        reader = csv.DictReader(text)
+        headers = {h.strip() for h in (reader.fieldnames or [])}
+        missing = {"full_name", "patient_id", "contact_phone"} - headers
+        if missing:
+            raise PatientImportError(f"Missing columns: {', '.join(sorted(missing))}.")
+
+        rows = []
+        for raw in reader:
+            if len(rows) >= MAX_IMPORT_ROWS:
+                raise PatientImportError(f"Imports are limited to {MAX_IMPORT_ROWS} rows.")
+            # blank optional cells mean "not provided"
+            rows.append({
+                key.strip(): value.strip()
+                for key, value in raw.items()
+                if key and key.strip() in IMPORT_FIELDS and value and value.strip()
+            })
+        return rows
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise PatientImportError(f"Could not read CSV: {e}")
+
+
+def _existing_values(therapist, field_name, values):
+    if not values:
+        return set()
+    return set(
+        Patient.objects.filter(therapist=therapist, **{f"{field_name}__in": values})
+        .values_list(field_name, flat=True)
+    )
+
+
+def _validate_rows(therapist, rows):
+    """Field validation per row, then uniqueness per field: one query + in-batch check."""
+    validator = PatientImportRowSerializer()
+    validated: Dict[int, Dict] = {}
+    errors: Dict[int, Dict] = defaultdict(dict)
+
+    for index, row in enumerate(rows):
+        try:
+            validated[index] = validator.run_validation(row)
+        except serializers.ValidationError as e:
+            detail = e.detail if isinstance(e.detail, dict) else {"non_field_errors": e.detail}
+            errors[index].update(detail)
+
+    for field_name, message in UNIQUE_FIELDS.items():
+        seen: Dict[str, int] = {}
+        for index, attrs in validated.items():
+            value = attrs.get(field_name)
+            if not value:
+                continue
+            if value in seen:
+                errors[index][field_name] = [f"Duplicate of row {seen[value] + 1} in this import."]
+            else:
+                seen[value] = index
+
+        taken = _existing_values(therapist, field_name, list(seen))
+        for value in taken:
+            errors[seen[value]][field_name] = [message]
+
+    return validated, errors
+
+
+def import_patients(therapist, rows, dry_run=False, skip_invalid=False) -> PatientImportResult:
+    """
+    Validate and insert many patients for one therapist in a handful of
+    queries. Unless `skip_invalid` is set, any row error aborts the whole
+    import. Row numbers in errors are 1-based.
+    """
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise PatientImportError(f"Imports are limited to {MAX_IMPORT_ROWS} rows.")
+
+    validated, errors = _validate_rows(therapist, rows)
+    result = PatientImportResult(
+        total=len(rows),
+        dry_run=dry_run,
+        errors=[{"row": index + 1, "errors": errors[index]} for index in sorted(errors)],
+    )
+
+    if dry_run or (errors and not skip_invalid):
+        return result
+
+    patients = [
+        Patient(therapist=therapist, **attrs)
+        for index, attrs in validated.items()
+        if index not in errors
+    ]
+    try:
+        with transaction.atomic():
+            Patient.objects.bulk_create(patients, batch_size=BULK_CREATE_BATCH_SIZE)
+    except IntegrityError as e:
+        raise ImportConflict(str(e))
+
+    # bulk_create skips post_save; let listeners (dashboard counters) catch up
+    therapist_id, count = therapist.id, len(patients)
+    transaction.on_commit(lambda: patients_bulk_created.send(
+        sender=Patient, therapist_id=therapist_id, count=count,
+    ))
+
+    result.created = len(patients)
+    return result
@@ -0,0 +1,9 @@
+from django.dispatch import Signal
+
+# sent after commit by the bulk import (bulk_create sends no post_save);
+# kwargs: therapist_id, count
+patients_bulk_created = Signal()
+
+# sent after commit when patients are deactivated or purged by a deletion
+# job (raw deletes send no post_delete); kwargs: therapist_id
+patients_removed = Signal()
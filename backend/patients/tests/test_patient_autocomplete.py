@@ -0,0 +1,52 @@
+import pytest
+
+API = "/api/v1"
+AUTOCOMPLETE_URL = f"{API}/patients/autocomplete/"
+
+
+@pytest.fixture
+def patients_a(therapist_a, make_patient):
+    rows = [
+        ("Ahmed Mohamed Ali", "29801011234567", "01012345678"),
+        ("Ahmad Kamal Saleh", "30005051234567", "01198765432"),
+        ("Mona Hassan Fathy", "29912121234567", "01500011122"),
+    ]
+    return [
+        make_patient(therapist_a, full_name=name, patient_id=national_id, contact_phone=phone)
+        for name, national_id, phone in rows
+    ]
+
+
+@pytest.mark.django_db
+class TestPatientAutocomplete:
+    def test_name_prefix(self, auth_client_a, patients_a):
+        res = auth_client_a.get(AUTOCOMPLETE_URL, {"q": "mona"})
+        assert res.status_code == 200
+        assert [r["full_name"] for r in res.data] == ["Mona Hassan Fathy"]
+        assert set(res.data[0]) == {"id", "full_name", "patient_id", "contact_phone"}
+
+    def test_prefix_matches_rank_first(self, auth_client_a, patients_a):
+        res = auth_client_a.get(AUTOCOMPLETE_URL, {"q": "ahm"})
+        names = [r["full_name"] for r in res.data]
+        assert set(names[:2]) == {"Ahmed Mohamed Ali", "Ahmad Kamal Saleh"}
+
+    def test_fuzzy_name_tolerates_typos(self, auth_client_a, patients_a):
+        res = auth_client_a.get(AUTOCOMPLETE_URL, {"q": "Mohamd"})
+        assert [r["full_name"] for r in res.data] == ["Ahmed Mohamed Ali"]
+
+    def test_national_id_prefix(self, auth_client_a, patients_a):
+        res = auth_client_a.get(AUTOCOMPLETE_URL, {"q": "30005"})
+        assert [r["patient_id"] for r in res.data] == ["30005051234567"]
+
+    @pytest.mark.parametrize("q", ["0101234", "+20 10 1234 5678", "2345678"])
+    def test_phone_is_normalized(self, auth_client_a, patients_a, q):
+        res = auth_client_a.get(AUTOCOMPLETE_URL, {"q": q})
+        assert [r["contact_phone"] for r in res.data] == ["01012345678"]
+
+    def test_scoped_to_therapist(self, auth_client_b, patients_a):
+        res = auth_client_b.get(AUTOCOMPLETE_URL, {"q": "Ahmed"})
+        assert res.status_code == 200
+        assert res.data == []
+
+    def test_query_is_required(self, auth_client_a):
+        assert auth_client_a.get(AUTOCOMPLETE_URL).status_code == 400
@@ -0,0 +1,98 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from patients.models import Patient
+from users.models import TherapistProfile
+
+API = "/api/v1"
+IMPORT_URL = f"{API}/patients/import/"
+
+
+@pytest.fixture
+def importer(auth_client_a, therapist_a):
+    TherapistProfile.objects.create(user=therapist_a, is_completed=True)
+    return auth_client_a
+
+
+def _row(i, **overrides):
+    row = {
+        "full_name": "Ahmed Mohamed Ali",
+        "patient_id": f"2980101{i:07d}",
+        "contact_phone": f"+20 10 {i:08d}",
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.mark.django_db
+class TestPatientImport:
+    def test_json_import_creates_patients(self, importer, therapist_a):
+        res = importer.post(IMPORT_URL, {"patients": [_row(1), _row(2)]}, format="json")
+
+        assert res.status_code == 201, res.data
+        assert res.data["created"] == 2
+        assert res.data["errors"] == []
+        phones = set(Patient.objects.filter(therapist=therapist_a).values_list("contact_phone", flat=True))
+        assert phones == {"01000000001", "01000000002"}
+
+    def test_row_errors_abort_the_import(self, importer, therapist_a, make_patient):
+        make_patient(therapist_a, patient_id="29801010000009", contact_phone="01500011122")
+        rows = [
+            _row(1),
+            _row(2, patient_id="123"),
+            _row(3, contact_phone="01000000001"),  # same phone as row 1
+            _row(9),  # national ID already in the database
+        ]
+
+        res = importer.post(IMPORT_URL, {"patients": rows}, format="json")
+
+        assert res.status_code == 400
+        errors = {e["row"]: set(e["errors"]) for e in res.data["errors"]}
+        assert errors == {2: {"patient_id"}, 3: {"contact_phone"}, 4: {"patient_id"}}
+        assert Patient.objects.filter(therapist=therapist_a).count() == 1
+
+    def test_skip_invalid_imports_valid_rows(self, importer, therapist_a):
+        rows = [_row(1), _row(2, full_name="Ahmed")]
+
+        res = importer.post(IMPORT_URL, {"patients": rows, "skip_invalid": True}, format="json")
+
+        assert res.status_code == 201
+        assert res.data["created"] == 1
+        assert [e["row"] for e in res.data["errors"]] == [2]
+
+    def test_dry_run_writes_nothing(self, importer, therapist_a):
+        res = importer.post(IMPORT_URL, {"patients": [_row(1)], "dry_run": True}, format="json")
+
+        assert res.status_code == 200
+        assert res.data["created"] == 0
+        assert not Patient.objects.filter(therapist=therapist_a).exists()
+
+    def test_csv_upload(self, importer, therapist_a):
+        content = (
+            "full_name,patient_id,contact_phone,contact_email,gender\n"
+            "Ahmed Mohamed Ali,29801010000001,01000000001,,male\n"
+            "Mona Hassan Fathy,29801010000002,01000000002,mona@example.com,female\n"
+        ).encode("utf-8-sig")
+        upload = SimpleUploadedFile("patients.csv", content, content_type="text/csv")
+
+        res = importer.post(IMPORT_URL, {"file": upload}, format="multipart")
+
+        assert res.status_code == 201, res.data
+        assert Patient.objects.get(patient_id="29801010000001").contact_email is None
+
+    def test_csv_missing_columns(self, importer):
+        upload = SimpleUploadedFile("patients.csv", b"full_name\nAhmed Mohamed Ali\n", content_type="text/csv")
+
+        res = importer.post(IMPORT_URL, {"file": upload}, format="multipart")
+
+        assert res.status_code == 400
+        assert "patient_id" in res.data["detail"]
+
+    def test_query_count_does_not_grow_with_rows(self, importer, therapist_a, django_assert_max_num_queries):
+        rows = [_row(i) for i in range(1, 501)]
+
+        with django_assert_max_num_queries(12):
+            res = importer.post(IMPORT_URL, {"patients": rows}, format="json")
+
+        assert res.status_code == 201
+        assert Patient.objects.filter(therapist=therapist_a).count() == 500
@@ -0,0 +1,28 @@
+import re
+
+EGYPT_MOBILE_PREFIXES = ("010", "011", "012", "015")
+
+
+def strip_country_code(digits: str, fragment: bool = False) -> str:
+    """
+    Drop a leading 0020 / 20 country code. In a search fragment only "201"
+    counts as the code: "20" also occurs inside local numbers.
+    """
+    if digits.startswith("0020"):
+        return digits[4:]
+    if digits.startswith("201" if fragment else "20"):
+        return digits[2:]
+    return digits
+
+
+def normalize_phone_digits(value: str) -> str:
+    """
+    Normalize an Egyptian phone number to its local form (e.g. +20 10 1234 5678 -> 01012345678).
+    Does not validate length or operator prefix.
+    """
+    digits = strip_country_code(re.sub(r"\D", "", value or ""))
+
+    if digits and not digits.startswith("0"):
+        digits = "0" + digits
+
+    return digits
@@ -1,19 +1,95 @@
 from rest_framework import viewsets, serializers
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from django.core.exceptions import ValidationError as DjangoValidationError
 
 
+from core.instrumentation import PerformanceViewMixin
 from .models import Patient
-from .serializers import PatientSerializer
+from .serializers import (
+    PatientSerializer,
+    PatientAutocompleteQuerySerializer,
+    PatientAutocompleteSerializer,
+    PatientImportSerializer,
+)
+from .services import (
+    ImportConflict,
+    PatientImportError,
+    autocomplete_patients,
+    import_patients,
+    parse_csv,
+)
 from .permissions import IsTherapist, IsOwnerTherapist
 from users.permissions import IsTherapistProfileCompleted
+from users.services import start_patient_deletion
 
-class PatientViewSet(viewsets.ModelViewSet):
+class PatientViewSet(PerformanceViewMixin, viewsets.ModelViewSet):
     serializer_class = PatientSerializer
     permission_classes = [IsAuthenticated, IsTherapist, IsOwnerTherapist, IsTherapistProfileCompleted]
 
     def get_queryset(self):
-        return Patient.objects.select_related("therapist").filter(therapist=self.request.user)
+        return Patient.objects.select_related("therapist").filter(therapist=self.request.user, is_active=True)
+
+    @action(detail=False, methods=["get"], url_path="autocomplete")
+    def autocomplete(self, request):
+        ser = PatientAutocompleteQuerySerializer(data=request.query_params)
+        ser.is_valid(raise_exception=True)
+
+        rows = autocomplete_patients(
+            request.user,
+            ser.validated_data["q"],
+            limit=ser.validated_data["limit"],
+        )
+        return Response(PatientAutocompleteSerializer(rows, many=True).data)
+
+    @action(detail=False, methods=["post"], url_path="import", parser_classes=[MultiPartParser, JSONParser])
+    def bulk_import(self, request):
+        ser = PatientImportSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        params = ser.validated_data
+
+        try:
+            rows = parse_csv(params["file"]) if params.get("file") else params["patients"]
+            result = import_patients(
+                request.user,
+                rows,
+                dry_run=params["dry_run"],
+                skip_invalid=params["skip_invalid"],
+            )
+        except PatientImportError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except ImportConflict:
+            return Response(
+                {"detail": "Some patients were created by another request meanwhile. Please retry."},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        body = {
+            "total": result.total,
+            "created": result.created,
+            "dry_run": result.dry_run,
+            "errors": result.errors,
+        }
+        if result.created:
+            return Response(body, status=status.HTTP_201_CREATED)
+        if result.errors:
+            return Response(body, status=status.HTTP_400_BAD_REQUEST)
+        return Response(body, status=status.HTTP_200_OK)
+
+    def destroy(self, request, *args, **kwargs):
+        # hidden right away; sessions, reports and audio are purged in the background
+        job = start_patient_deletion(self.get_object())
+        return Response(
+            {
+                "detail": "Patient deletion started.",
+                "token": str(job.token),
+                "status_url": f"/api/v1/deletion-jobs/{job.token}/",
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
 
     def perform_create(self, serializer):
         try:
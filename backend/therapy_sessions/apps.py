@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TherapySessionsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "therapy_sessions"
+
+    def ready(self):
+        from therapy_sessions import signals  # noqa: F401
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from therapy_sessions.models import TherapySession
+from therapy_sessions.services.search import rebuild_search_vectors
+
+
+class Command(BaseCommand):
+    help = "Backfill TherapySession.search_vector (e.g. after the column was added)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Only index sessions whose search_vector is still NULL.",
+        )
+
+    def handle(self, *args, **options):
+        qs = TherapySession.objects.order_by("pk")
+        if options["missing_only"]:
+            qs = qs.filter(search_vector__isnull=True)
+
+        batch_size = options["batch_size"]
+        ids = qs.values_list("pk", flat=True).iterator(chunk_size=batch_size * 10)
+
+        total = 0
+        chunk = []
+        for pk in ids:
+            chunk.append(pk)
+            if len(chunk) >= batch_size * 10:
+                total += rebuild_search_vectors(chunk, batch_size=batch_size)
+                self.stdout.write(f"indexed {total} sessions")
+                chunk = []
+        if chunk:
+            total += rebuild_search_vectors(chunk, batch_size=batch_size)
+
+        self.stdout.write(self.style.SUCCESS(f"Done. Indexed {total} sessions."))
@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.scale import SCALE_EMAIL_DOMAIN, ScaleOptions, seed_scale
+
+
+class Command(BaseCommand):
+    help = (
+        f"Replace the @{SCALE_EMAIL_DOMAIN} therapists with a large synthetic dataset "
+        "(patients, sessions in every status, Arabic transcripts, reports with risk flags), "
+        "loaded with parallel COPY batches. Deterministic for a given --seed and totals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--therapists", type=int, default=1000)
+        parser.add_argument("--patients", type=int, default=100_000, help="Total patients.")
+        parser.add_argument("--sessions", type=int, default=1_000_000, help="Total sessions.")
+        parser.add_argument(
+            "--transcript-words", type=int, default=1500,
+            help="Mean transcript length (~12 minutes of speech; 4000 is a full session).",
+        )
+        parser.add_argument("--days", type=int, default=365, help="Spread sessions over this many past days.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--workers", type=int, default=4, help="Parallel loader processes.")
+        parser.add_argument("--batch-size", type=int, default=5000, help="About this many sessions per COPY batch.")
+
+    def handle(self, *args, **options):
+        if min(options["therapists"], options["patients"]) < 1 or options["sessions"] < 0:
+            raise CommandError("--therapists and --patients must be positive.")
+
+        scale = ScaleOptions(
+            therapists=options["therapists"],
+            patients=options["patients"],
+            sessions=options["sessions"],
+            transcript_words=options["transcript_words"],
+            days=options["days"],
+            seed=options["seed"],
+        )
+        started = time.perf_counter()
+
+        def progress(total):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{total.sessions}/{scale.sessions} sessions, {total.patients} patients "
+                f"({total.sessions / elapsed:,.0f} sessions/s)"
+            )
+
+        try:
+            result = seed_scale(scale, workers=options["workers"], batch_size=options["batch_size"], progress=progress)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done in {time.perf_counter() - started:.0f}s: {scale.therapists} therapists, "
+            f"{result.patients} patients, {result.sessions} sessions, {result.transcripts} transcripts, "
+            f"{result.reports} reports, {result.timelines} timelines."
+        ))
+        self.stdout.write("Search vectors are not built; run `manage.py rebuild_search_index --missing-only` if needed.")
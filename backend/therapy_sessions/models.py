@@ -1,4 +1,6 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from patients.models import Patient
 
@@ -42,9 +44,20 @@ class TherapySession(TimeStampedModel):
     notes_before = models.TextField(blank=True)
     notes_after = models.TextField(blank=True)
 
+    # set by the local screening stage right after transcription, before the LLM report
+    provisional_risk_flag = models.BooleanField(default=False)
+    provisional_risk_terms = models.JSONField(default=list, blank=True)
+    risk_screened_at = models.DateTimeField(null=True, blank=True)
+
+    # normalized notes + transcript + report text, kept up to date by signals
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         db_table = "therapy_session"
         ordering = ["-created_at"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="session_search_vector_gin"),
+        ]
 
     def __str__(self):
         return f"Session #{self.id} | Patient {self.patient_id} | {self.session_date}"
@@ -67,6 +80,21 @@ class SessionAudio(TimeStampedModel):
     sample_rate = models.PositiveIntegerField(null=True, blank=True) # in Hz
     language_code = models.CharField(max_length=10, null=True, blank=True) 
 
+    # min/max waveform peaks (WPK1 blob) written by the generate_waveform_peaks task
+    peaks_file = models.FileField(upload_to=session_audio_path, blank=True, default="")
+
+    # cold tiering: audio_file then points at a speech Opus copy and the
+    # untouched original sits under AUDIO_COLD_PREFIX until restored
+    TIER_CHOICES = [
+        ("hot", "Original"),
+        ("cold", "Opus copy, original in cold storage"),
+    ]
+    storage_tier = models.CharField(max_length=10, choices=TIER_CHOICES, default="hot")
+    original_key = models.CharField(max_length=1024, blank=True, default="")
+    original_size = models.BigIntegerField(null=True, blank=True)  # bytes, before tiering
+    stored_size = models.BigIntegerField(null=True, blank=True)  # bytes of the Opus copy
+    tiered_at = models.DateTimeField(null=True, blank=True)
+
 
     def __str__(self):
         return f"Audio for Session #{self.session_id}"    
@@ -150,9 +178,80 @@ class SessionAudioUpload(TimeStampedModel):
         on_delete=models.CASCADE, # when session is deleted, delete audio upload too
         related_name="audio_upload", # one-to-one relationship
     )
+    UPLOAD_TYPE_CHOICES = [
+        ("multipart", "S3 multipart"),
+        ("presigned_post", "S3 presigned POST"),
+        ("resumable", "Resumable chunked (any storage)"),
+    ]
+
+    upload_type = models.CharField(max_length=20, choices=UPLOAD_TYPE_CHOICES, default="multipart")
     s3_key=models.CharField(max_length=1024) # S3 object key
-    upload_id = models.CharField(max_length=255) # multipart upload ID
-    status = models.CharField(max_length=32, default="uploading") # uploading, completed, aborted, failed
+    upload_id = models.CharField(max_length=255, blank=True) # multipart upload ID (empty for presigned POST)
+    content_type = models.CharField(max_length=100, blank=True) # declared by the client at start
+    total_size = models.BigIntegerField(null=True, blank=True) # resumable: declared size in bytes
+    received_bytes = models.BigIntegerField(default=0) # resumable: bytes persisted to the staging file
+    status = models.CharField(max_length=32, default="uploading") # uploading, completed, aborted, failed, expired
+
+    def __str__(self):
+        return f"Multipart Upload for Session #{self.session_id} | Status: {self.status}"
+
+class SessionProcessingTimeline(TimeStampedModel):
+    """
+    Wall-clock stamps of the latest processing attempt, written by the upload
+    views and pipeline tasks; read only by the latency rollups.
+    """
+
+    session = models.OneToOneField(
+        TherapySession,
+        on_delete=models.CASCADE,
+        related_name="timeline",
+    )
+
+    uploaded_at = models.DateTimeField(null=True, blank=True)
+    transcription_started_at = models.DateTimeField(null=True, blank=True)
+    transcription_finished_at = models.DateTimeField(null=True, blank=True)
+    analysis_started_at = models.DateTimeField(null=True, blank=True)
+    analysis_finished_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    failed_at = models.DateTimeField(null=True, blank=True)
+    failed_stage = models.CharField(max_length=30, blank=True, default="")  # transcription/analysis
+
+    class Meta:
+        db_table = "session_processing_timeline"
+        # every stamp write bumps updated_at, so rollups only scan recent rows
+        indexes = [
+            models.Index(fields=["updated_at"], name="timeline_updated_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"Timeline | Session #{self.session_id}"
+
+class StorageTombstone(TimeStampedModel):
+    """
+    A storage object that is no longer referenced and should be deleted.
+    Written in the same transaction as the row delete/replace; removed by
+    the garbage collector once the object is gone.
+    """
+
+    REASON_CHOICES = [
+        ("deleted", "Audio deleted or replaced"),
+        ("abandoned", "Upload abandoned"),
+        ("tiered", "Original moved to cold tier"),
+        ("rejected", "Upload rejected"),
+        ("orphan", "Orphan found by sweep"),
+    ]
+
+    key = models.CharField(max_length=1024, unique=True)  # storage name / S3 key
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES, default="deleted")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(auto_now_add=True)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        db_table = "storage_tombstone"
+        indexes = [
+            models.Index(fields=["next_attempt_at"], name="tombstone_next_attempt_idx"),
+        ]
 
     def __str__(self):
-        return f"Multipart Upload for Session #{self.session_id} | Status: {self.status}"
\ No newline at end of file
+        return f"Tombstone | {self.key} | attempts {self.attempts}"
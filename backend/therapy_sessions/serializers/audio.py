@@ -1,9 +1,15 @@
 from rest_framework import serializers
 from therapy_sessions.models import SessionAudio
+from therapy_sessions.services.audio_limits import (
+    MAX_AUDIO_UPLOAD_BYTES,
+    MAX_AUDIO_UPLOAD_MB,
+    is_allowed_audio_type,
+)
 
 
 class SessionAudioSerializer(serializers.ModelSerializer):
     audio_url = serializers.SerializerMethodField()
+    has_peaks = serializers.SerializerMethodField()
 
     class Meta:
         model = SessionAudio
@@ -14,6 +20,8 @@ class SessionAudioSerializer(serializers.ModelSerializer):
             "duration_seconds",
             "sample_rate",
             "language_code",
+            "has_peaks",
+            "storage_tier",
             "created_at",
             "updated_at",
         ]
@@ -27,15 +35,60 @@ class SessionAudioSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(url) if request else url
         return None
 
+    def get_has_peaks(self, obj):
+        return bool(obj.peaks_file)
+
 
 class SessionAudioUploadSerializer(serializers.Serializer):
     audio_file = serializers.FileField()
     language_code = serializers.CharField(max_length=10, required=False, allow_blank=True)
 
     def validate_audio_file(self, audio_file):
-        max_size_mb = 50
-        if audio_file.size > max_size_mb * 1024 * 1024:
+        if audio_file.size > MAX_AUDIO_UPLOAD_BYTES:
             raise serializers.ValidationError(
-                f"Audio file size should not exceed {max_size_mb} MB."
+                f"Audio file size should not exceed {MAX_AUDIO_UPLOAD_MB} MB."
             )
         return audio_file
+
+
+class DirectUploadStartSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    content_type = serializers.CharField(max_length=100)
+    size = serializers.IntegerField(min_value=1, required=False)  # optional early check
+    replace = serializers.BooleanField(required=False, default=False)
+
+    def validate_content_type(self, value):
+        if not is_allowed_audio_type(value):
+            raise serializers.ValidationError("Unsupported audio content type.")
+        return value
+
+    def validate_size(self, value):
+        if value > MAX_AUDIO_UPLOAD_BYTES:
+            raise serializers.ValidationError(
+                f"Audio file size should not exceed {MAX_AUDIO_UPLOAD_MB} MB."
+            )
+        return value
+
+
+class DirectUploadConfirmSerializer(serializers.Serializer):
+    key = serializers.CharField(max_length=1024)
+    original_filename = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    language_code = serializers.CharField(max_length=10, required=False, allow_blank=True)
+
+
+class ResumableUploadStartSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    content_type = serializers.CharField(max_length=100)
+    total_size = serializers.IntegerField(min_value=1, max_value=MAX_AUDIO_UPLOAD_BYTES)
+    replace = serializers.BooleanField(required=False, default=False)
+
+    def validate_content_type(self, value):
+        if not is_allowed_audio_type(value):
+            raise serializers.ValidationError("Unsupported audio content type.")
+        return value
+
+
+class ResumableUploadCompleteSerializer(serializers.Serializer):
+    uploadId = serializers.CharField(max_length=255)
+    original_filename = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    language_code = serializers.CharField(max_length=10, required=False, allow_blank=True)
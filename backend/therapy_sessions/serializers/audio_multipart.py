@@ -1,14 +1,34 @@
 from rest_framework import serializers
 
+from therapy_sessions.services.s3.multipart import MAX_PRESIGN_BATCH, S3_MAX_PARTS
+
 class MultipartStartResponseSerializer(serializers.Serializer):
     uploadId = serializers.CharField() # ID for the multipart upload
     key = serializers.CharField() # S3 object key
     partSize = serializers.IntegerField() # size of each part in bytes
+    partCount = serializers.IntegerField(allow_null=True) # null when the size was not declared
+
+class MultipartStartSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255, required=False, default="audio.webm")
+    content_type = serializers.CharField(max_length=100, required=False, default="audio/webm")
+    size = serializers.IntegerField(min_value=1, required=False) # lets the server pick the part size
 
 class MultipartPresignSerializer(serializers.Serializer):
     uploadId = serializers.CharField() # ID for the multipart upload
     partNumber = serializers.IntegerField(min_value=1, max_value=10000) # part number to be uploaded
 
+class MultipartPresignBatchSerializer(serializers.Serializer):
+    uploadId = serializers.CharField()
+    firstPart = serializers.IntegerField(min_value=1, max_value=S3_MAX_PARTS) # inclusive range
+    lastPart = serializers.IntegerField(min_value=1, max_value=S3_MAX_PARTS)
+
+    def validate(self, attrs):
+        if attrs["lastPart"] < attrs["firstPart"]:
+            raise serializers.ValidationError("lastPart must not be before firstPart.")
+        if attrs["lastPart"] - attrs["firstPart"] + 1 > MAX_PRESIGN_BATCH:
+            raise serializers.ValidationError(f"At most {MAX_PRESIGN_BATCH} parts per request.")
+        return attrs
+
 class MultipartPresignResponseSeriializer(serializers.Serializer):
     url = serializers.URLField() # URL for uploading the part
     partNumber = serializers.IntegerField() # partNumber to match request
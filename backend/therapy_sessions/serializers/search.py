@@ -0,0 +1,26 @@
+from rest_framework import serializers
+from therapy_sessions.models import TherapySession
+
+
+class SessionSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200, trim_whitespace=True)
+    limit = serializers.IntegerField(min_value=1, max_value=50, required=False, default=20)
+
+
+class SessionSearchResultSerializer(serializers.ModelSerializer):
+    patient_name = serializers.CharField(source="patient.full_name", read_only=True)
+    rank = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True)  # HTML-escaped, matches wrapped in <mark>
+
+    class Meta:
+        model = TherapySession
+        fields = [
+            "id",
+            "patient",
+            "patient_name",
+            "session_date",
+            "status",
+            "rank",
+            "snippet",
+        ]
+        read_only_fields = fields
@@ -4,7 +4,7 @@ from therapy_sessions.models import TherapySession
 from therapy_sessions.serializers.audio import SessionAudioSerializer
 from therapy_sessions.serializers.transcript import SessionTranscriptSerializer
 from therapy_sessions.serializers.report import SessionReportSerializer
-from therapy_sessions.services.s3.s3_client import s3_client, s3_bucket
+from therapy_sessions.services.streaming import audio_playback_url
 
 
 class TherapySessionSerializer(serializers.ModelSerializer):
@@ -21,12 +21,20 @@ class TherapySessionSerializer(serializers.ModelSerializer):
             "status",
             "notes_before",
             "notes_after",
+            "provisional_risk_flag",
+            "provisional_risk_terms",
             "created_at",
             "updated_at",
             "transcript",
             "report",
         ]
-        read_only_fields = ["id", "created_at", "updated_at"]
+        read_only_fields = [
+            "id",
+            "provisional_risk_flag",
+            "provisional_risk_terms",
+            "created_at",
+            "updated_at",
+        ]
 
 
     def validate_patient(self, patient: Patient):
@@ -36,6 +44,8 @@ class TherapySessionSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError(
                     "You can only create sessions for your own patients."
                 )
+        if not patient.is_active:
+            raise serializers.ValidationError("This patient is being deleted.")
         return patient
 
 
@@ -59,6 +69,8 @@ class SessionDetailSerializer(serializers.ModelSerializer):
             "status",
             "notes_before",
             "notes_after",
+            "provisional_risk_flag",
+            "provisional_risk_terms",
             "created_at",
             "updated_at",
             "audio_url",
@@ -66,19 +78,17 @@ class SessionDetailSerializer(serializers.ModelSerializer):
             "transcript",
             "report",
         ]
-        read_only_fields = ["id", "created_at", "updated_at"]
+        read_only_fields = [
+            "id",
+            "provisional_risk_flag",
+            "provisional_risk_terms",
+            "created_at",
+            "updated_at",
+        ]
 
     def get_audio_url(self, obj):
         audio = getattr(obj, "audio", None)
         if not audio or not audio.audio_file:
             return None
 
-        s3 = s3_client()
-        return s3.generate_presigned_url(
-            ClientMethod="get_object",
-            Params={
-                "Bucket": s3_bucket(),
-                "Key": str(audio.audio_file),
-            },
-            ExpiresIn=60 * 60,  # 1 hour
-        )
+        return audio_playback_url(self.context.get("request"), audio)
@@ -0,0 +1,27 @@
+# Size cap for the form upload, presigned POST and resumable paths. S3 multipart
+# uploads are not capped: they carry long recordings and size their parts for
+# up to S3_MAX_PARTS (see services.s3.multipart).
+MAX_AUDIO_UPLOAD_MB = 50
+MAX_AUDIO_UPLOAD_BYTES = MAX_AUDIO_UPLOAD_MB * 1024 * 1024
+
+ALLOWED_AUDIO_CONTENT_TYPES = {
+    "audio/webm",
+    "audio/ogg",
+    "audio/wav",
+    "audio/x-wav",
+    "audio/wave",
+    "audio/mpeg",
+    "audio/mp4",
+    "audio/x-m4a",
+    "audio/aac",
+    "audio/flac",
+}
+
+
+def base_content_type(content_type: str) -> str:
+    # "audio/webm;codecs=opus" -> "audio/webm"
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+def is_allowed_audio_type(content_type: str) -> bool:
+    return base_content_type(content_type) in ALLOWED_AUDIO_CONTENT_TYPES
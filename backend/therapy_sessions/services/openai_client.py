@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, Tuple
+
+from django.conf import settings
+from openai import OpenAI
+
+_clients: Dict[Tuple, OpenAI] = {}
+_lock = threading.Lock()
+
+
+def openai_client(api_key: str) -> OpenAI:
+    """
+    One client per process and configuration: its HTTP connection pool is
+    reused across tasks instead of reconnecting for every transcription.
+    """
+    key = (
+        api_key,
+        getattr(settings, "OPENAI_BASE_URL", "") or None,
+        getattr(settings, "OPENAI_TIMEOUT", 120.0),
+        getattr(settings, "OPENAI_MAX_RETRIES", 2),
+    )
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = OpenAI(api_key=api_key, base_url=key[1], timeout=key[2], max_retries=key[3])
+    return client
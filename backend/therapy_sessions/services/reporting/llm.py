@@ -3,6 +3,8 @@ from typing import Dict, Any, Optional
 from django.conf import settings
 from openai import OpenAI
 
+from therapy_sessions.services.openai_client import openai_client
+
 from .base import BaseReportProvider, GeneratedReport
 from .schema import ReportSchema
 
@@ -24,7 +26,7 @@ class OpenAIReportProvider(BaseReportProvider):
                 "Use MockReportProvider in tests or set USE_MOCK_AI=True."
             )
 
-        self._client = OpenAI(api_key=api_key)
+        self._client = openai_client(api_key)
         return self._client
 
     def generate(
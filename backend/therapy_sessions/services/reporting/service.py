@@ -6,7 +6,9 @@ from typing import Any, Dict
 from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
+from django.utils.module_loading import import_string
 
+from core.metrics import observe_provider
 from therapy_sessions.models import TherapySession, SessionTranscript, SessionReport
 
 from .base import BaseReportProvider, GeneratedReport
@@ -22,6 +24,8 @@ def get_report_provider() -> BaseReportProvider:
     """
     Central place to select report provider.
     """
+    if getattr(settings, "REPORT_PROVIDER_CLASS", ""):
+        return import_string(settings.REPORT_PROVIDER_CLASS)()
     if getattr(settings, "USE_MOCK_AI", False):
         return MockReportProvider()
     return OpenAIReportProvider()
@@ -48,11 +52,12 @@ class ReportService:
 
         provider = get_report_provider()
 
-        generated: GeneratedReport = provider.generate(
-            transcript_text=transcript.cleaned_transcript or transcript.raw_transcript or "",
-            session_context={"session_id": session_id},
-            language=transcript.language_code or "en",
-        )
+        with observe_provider(type(provider).__name__, "report"):
+            generated: GeneratedReport = provider.generate(
+                transcript_text=transcript.cleaned_transcript or transcript.raw_transcript or "",
+                session_context={"session_id": session_id},
+                language=transcript.language_code or "en",
+            )
 
         # Persist report
         with transaction.atomic():
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from botocore.exceptions import ClientError
+
+from therapy_sessions.services.audio_limits import MAX_AUDIO_UPLOAD_BYTES
+from therapy_sessions.services.s3.s3_client import s3_client, s3_bucket
+
+PRESIGNED_POST_EXPIRES = 60 * 10  # 10 minutes
+
+
+def presign_audio_post(key: str, content_type: str, max_bytes: int = MAX_AUDIO_UPLOAD_BYTES) -> dict:
+    """
+    Presigned POST letting the browser send the file straight to S3.
+    S3 itself enforces the size range and content type.
+    """
+    return s3_client().generate_presigned_post(
+        Bucket=s3_bucket(),
+        Key=key,
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, max_bytes],
+        ],
+        ExpiresIn=PRESIGNED_POST_EXPIRES,
+    )
+
+
+def head_audio_object(key: str) -> Optional[dict]:
+    """Size and content type of an uploaded object, or None if it is not there (yet)."""
+    try:
+        resp = s3_client().head_object(Bucket=s3_bucket(), Key=key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in {"404", "NoSuchKey", "NotFound"}:
+            return None
+        raise
+    return {"size": resp["ContentLength"], "content_type": resp.get("ContentType", "")}
+
+
+def delete_audio_object(key: str) -> None:
+    s3_client().delete_object(Bucket=s3_bucket(), Key=key)
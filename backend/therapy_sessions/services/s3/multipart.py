@@ -0,0 +1,74 @@
+import math
+from typing import Iterable, List, Optional
+
+from therapy_sessions.services.s3.s3_client import s3_client, s3_bucket
+
+# S3 multipart limits
+S3_MIN_PART_SIZE = 5 * 1024 * 1024  # every part but the last
+S3_MAX_PART_SIZE = 5 * 1024 * 1024 * 1024
+S3_MAX_PARTS = 10_000
+
+DEFAULT_PART_SIZE = 10 * 1024 * 1024  # size unknown up front (live recordings)
+PART_SIZE_ALIGNMENT = 1024 * 1024
+MAX_PRESIGN_BATCH = 500
+PART_URL_EXPIRES = 60 * 10  # 10 minutes
+
+
+def part_size_for(total_size: Optional[int]) -> int:
+    """
+    Smallest part size that keeps the upload within S3_MAX_PARTS: the more
+    parts, the more of them a client can send in parallel.
+    """
+    if not total_size:
+        return DEFAULT_PART_SIZE
+    needed = math.ceil(total_size / S3_MAX_PARTS)
+    aligned = math.ceil(needed / PART_SIZE_ALIGNMENT) * PART_SIZE_ALIGNMENT
+    return min(max(S3_MIN_PART_SIZE, aligned), S3_MAX_PART_SIZE)
+
+
+def part_count_for(total_size: Optional[int]) -> Optional[int]:
+    if not total_size:
+        return None
+    return math.ceil(total_size / part_size_for(total_size))
+
+
+def presign_upload_parts(key: str, upload_id: str, part_numbers: Iterable[int]) -> List[dict]:
+    """
+    Presigned upload_part URLs for many parts at once. Signing is local
+    (no S3 round trip), so one client serves the whole batch.
+    """
+    client = s3_client()
+    bucket = s3_bucket()
+    return [
+        {
+            "partNumber": number,
+            "url": client.generate_presigned_url(
+                ClientMethod="upload_part",
+                Params={"Bucket": bucket, "Key": key, "UploadId": upload_id, "PartNumber": number},
+                ExpiresIn=PART_URL_EXPIRES,
+            ),
+        }
+        for number in part_numbers
+    ]
+
+
+def list_uploaded_parts(key: str, upload_id: str) -> List[dict]:
+    """Every part S3 already holds for this upload, following list_parts pagination."""
+    client = s3_client()
+    parts: List[dict] = []
+    marker = 0
+    while True:
+        resp = client.list_parts(
+            Bucket=s3_bucket(),
+            Key=key,
+            UploadId=upload_id,
+            PartNumberMarker=marker,
+            MaxParts=1000,
+        )
+        parts.extend(
+            {"PartNumber": p["PartNumber"], "ETag": p["ETag"], "Size": p["Size"]}
+            for p in resp.get("Parts", [])
+        )
+        if not resp.get("IsTruncated"):
+            return parts
+        marker = resp["NextPartNumberMarker"]
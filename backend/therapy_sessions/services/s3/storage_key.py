@@ -1,4 +1,4 @@
-def session_audio_key(session, original_name: str):
+def session_audio_key(session, original_name: str, suffix: str = ""):
     ext = ""
     # keep original extension if found
     if "." in (original_name or ""):
@@ -6,4 +6,6 @@ def session_audio_key(session, original_name: str):
     if not ext:
         ext = ".webm"  # fallback to .webm if no extension found
 
-    return f"recordings/patient_{session.patient_id}/session_{session.id}/audio{ext}"
\ No newline at end of file
+    # a suffix keeps a replacement from overwriting the object still in use
+    name = f"audio-{suffix}" if suffix else "audio"
+    return f"recordings/patient_{session.patient_id}/session_{session.id}/{name}{ext}"
\ No newline at end of file
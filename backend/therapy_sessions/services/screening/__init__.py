@@ -0,0 +1 @@
+from .screener import ScreeningResult, screen_transcript
@@ -0,0 +1,86 @@
+"""
+Risk lexicon used by the local pre-LLM screening stage.
+
+Terms are written in their natural spelling; they are passed through
+`normalize_arabic` when the matcher is compiled, so diacritics, tatweel
+and alef variants do not need to be spelled out here.
+"""
+
+# (category, severity, terms)
+RISK_LEXICON = [
+    (
+        "suicidal_ideation",
+        "high",
+        [
+            # Arabic (MSA + Egyptian)
+            "انتحار",
+            "انتحر",
+            "أنتحر",
+            "هنتحر",
+            "أقتل نفسي",
+            "اقتل روحي",
+            "أموت نفسي",
+            "عايز أموت",
+            "عاوز أموت",
+            "نفسي أموت",
+            "أريد أن أموت",
+            "أتمنى الموت",
+            "أنهي حياتي",
+            "أخلص من حياتي",
+            "أخلص على نفسي",
+            "مش عايز أعيش",
+            "مش عاوز أعيش",
+            "لا أريد أن أعيش",
+            "الموت أرحم",
+            "أرمي نفسي",
+            # English
+            "suicide",
+            "suicidal",
+            "kill myself",
+            "end my life",
+            "want to die",
+            "wish i was dead",
+            "better off dead",
+            "no reason to live",
+            "take my own life",
+        ],
+    ),
+    (
+        "self_harm",
+        "high",
+        [
+            "أؤذي نفسي",
+            "أأذي نفسي",
+            "أجرح نفسي",
+            "بجرح نفسي",
+            "أذيت نفسي",
+            "جرحت نفسي",
+            "self harm",
+            "self-harm",
+            "hurt myself",
+            "cut myself",
+            "cutting myself",
+            "overdose",
+        ],
+    ),
+    (
+        "hopelessness",
+        "medium",
+        [
+            "مفيش أمل",
+            "ملوش لازمة",
+            "مالوش لازمة",
+            "حياتي ملهاش معنى",
+            "لا أمل",
+            "hopeless",
+            "no point in living",
+        ],
+    ),
+]
+
+# Arabic clitics that may be glued to the start of a term (و، ف، ب، ل، ك);
+# the definite article is handled by the matcher
+ARABIC_PREFIXES = "وفبلك"
+
+# possessive pronoun suffixes (انتحاري، حياته...), longest first
+ARABIC_SUFFIXES = ["كم", "هم", "ها", "نا", "ي", "ه", "ك"]
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from core.utils import normalize_arabic
+
+from .lexicon import ARABIC_PREFIXES, ARABIC_SUFFIXES, RISK_LEXICON
+
+
+@dataclass(frozen=True)
+class ScreeningResult:
+    is_urgent: bool
+    matches: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def _term_pattern(term: str) -> str:
+    words = [re.escape(w) for w in normalize_arabic(term).split(" ")]
+    body = r"\s+".join(words)
+    # allow Arabic clitics (و، ف، ب...) and the article glued to the first word,
+    # and possessive pronoun suffixes on the last one
+    prefix = rf"(?:[{ARABIC_PREFIXES}]?ال|[{ARABIC_PREFIXES}])?"
+    suffix = "(?:" + "|".join(ARABIC_SUFFIXES) + ")?"
+    return rf"(?<!\w){prefix}{body}{suffix}(?!\w)"
+
+
+@lru_cache(maxsize=1)
+def _compiled_lexicon():
+    """
+    Compile the whole lexicon into a single alternation so a transcript is
+    scanned once; each term gets a named group to recover its category.
+    """
+    parts = []
+    groups = {}
+    for category, severity, terms in RISK_LEXICON:
+        for term in terms:
+            name = f"t{len(groups)}"
+            groups[name] = {"term": term, "category": category, "severity": severity}
+            parts.append(f"(?P<{name}>{_term_pattern(term)})")
+    return re.compile("|".join(parts)), groups
+
+
+def screen_transcript(text: str) -> ScreeningResult:
+    """
+    Fast local screen for suicide / self-harm content.
+    Runs before the LLM report so urgent sessions can be prioritised;
+    the LLM report stays the source of truth for risk_flags.
+    """
+    normalized = normalize_arabic(text)
+    if not normalized:
+        return ScreeningResult(is_urgent=False)
+
+    pattern, groups = _compiled_lexicon()
+
+    matches: Dict[str, Dict[str, Any]] = {}
+    for m in pattern.finditer(normalized):
+        info = groups[m.lastgroup]
+        hit = matches.setdefault(info["term"], {**info, "count": 0})
+        hit["count"] += 1
+
+    found = list(matches.values())
+    return ScreeningResult(
+        is_urgent=any(m["severity"] == "high" for m in found),
+        matches=found,
+    )
@@ -0,0 +1,2 @@
+from .indexer import SEARCH_CONFIG, rebuild_search_vectors, update_session_search_vector
+from .query import search_sessions
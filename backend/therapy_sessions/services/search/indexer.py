@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional
+
+from django.contrib.postgres.search import SearchVector
+from django.db.models import TextField, Value
+
+from core.utils import normalize_arabic
+from therapy_sessions.models import TherapySession
+
+# Arabic has no good stemmer for dialect text, so we index normalized tokens as-is
+SEARCH_CONFIG = "simple"
+
+# source field -> tsvector weight (A ranks highest)
+INDEXED_FIELDS = {
+    "report__generated_summary": "A",
+    "report__therapist_notes": "B",
+    "notes_before": "B",
+    "notes_after": "B",
+    "transcript__cleaned_transcript": "C",
+}
+
+
+def build_search_vector(row: Dict[str, Optional[str]]):
+    """
+    Build the weighted tsvector expression from a `.values(*INDEXED_FIELDS)` row.
+    Text is normalized in Python so index and query time use the same rules.
+    """
+    vector = None
+    for field, weight in INDEXED_FIELDS.items():
+        part = SearchVector(
+            Value(normalize_arabic(row.get(field) or ""), output_field=TextField()),
+            config=SEARCH_CONFIG,
+            weight=weight,
+        )
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_session_search_vector(session_id: int) -> bool:
+    row = (
+        TherapySession.objects.filter(pk=session_id)
+        .values(*INDEXED_FIELDS)
+        .first()
+    )
+    if row is None:
+        return False
+
+    # queryset update: no signals, no updated_at bump
+    TherapySession.objects.filter(pk=session_id).update(search_vector=build_search_vector(row))
+    return True
+
+
+def rebuild_search_vectors(session_ids: Iterable[int], batch_size: int = 500) -> int:
+    """Bulk variant used for backfills."""
+    ids = list(session_ids)
+    updated = 0
+    for i in range(0, len(ids), batch_size):
+        chunk = ids[i:i + batch_size]
+        rows = TherapySession.objects.filter(pk__in=chunk).values("pk", *INDEXED_FIELDS)
+
+        sessions = []
+        for row in rows:
+            session = TherapySession(pk=row["pk"])
+            session.search_vector = build_search_vector(row)
+            sessions.append(session)
+
+        TherapySession.objects.bulk_update(sessions, ["search_vector"])
+        updated += len(sessions)
+    return updated
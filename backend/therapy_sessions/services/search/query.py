@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import re
+from typing import List
+
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchQueryField, SearchRank
+from django.db.models import F, Func, TextField, Value
+from django.db.models.functions import Coalesce, Concat, Replace
+
+from core.utils import normalize_arabic
+from core.utils.arabic import ARABIC_DIACRITICS, ARABIC_LETTER_MAP, TATWEEL
+from therapy_sessions.models import TherapySession
+
+from .indexer import INDEXED_FIELDS, SEARCH_CONFIG
+
+MAX_RESULTS = 50
+
+# translate(): mapped letters first, then characters without a counterpart are dropped
+_TRANSLATE_FROM = "".join(ARABIC_LETTER_MAP) + ARABIC_DIACRITICS + TATWEEL
+_TRANSLATE_TO = "".join(ARABIC_LETTER_MAP.values())
+
+
+class OriginalFormsQuery(Func):
+    """
+    tsquery OR-ing the document's own words whose normalized form is one of
+    `terms`, so ts_headline can mark matches in the original, un-normalized
+    text. Terms are plain word characters, so every lexeme that matches one is
+    safe to quote_literal into a tsquery.
+    """
+
+    output_field = SearchQueryField()
+
+    def __init__(self, document, terms: List[str], **extra):
+        super().__init__(
+            document,
+            Value(_TRANSLATE_FROM),
+            Value(_TRANSLATE_TO),
+            Value(terms, output_field=ArrayField(TextField())),
+            **extra,
+        )
+
+    def as_sql(self, compiler, connection, **extra_context):
+        (document, document_params), *rest = [compiler.compile(arg) for arg in self.source_expressions]
+        (from_sql, from_params), (to_sql, to_params), (terms_sql, terms_params) = rest
+        sql = (
+            "COALESCE((SELECT string_agg(quote_literal(lexeme), ' | ')::tsquery"
+            f" FROM unnest(tsvector_to_array(to_tsvector('{SEARCH_CONFIG}'::regconfig, {document}))) AS lexeme"
+            f" WHERE translate(lexeme, {from_sql}, {to_sql}) = ANY({terms_sql})), ''::tsquery)"
+        )
+        return sql, (*document_params, *from_params, *to_params, *terms_params)
+
+
+def _highlight_terms(normalized: str) -> List[str]:
+    # websearch syntax: skip "or" and -excluded words, quotes are just punctuation here
+    return [word for word in re.findall(r"(?<![-\w])\w+", normalized) if word != "or"]
+
+
+def _escape_html(expression):
+    for raw, escaped in (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;")):
+        expression = Replace(expression, Value(raw), Value(escaped))
+    return expression
+
+
+def _snippet_source():
+    parts = []
+    for field in INDEXED_FIELDS:
+        if parts:
+            parts.append(Value(" … "))
+        parts.append(Coalesce(F(field), Value(""), output_field=TextField()))
+    # the original text: only the tsvector and the query are normalized
+    return _escape_html(Concat(*parts, output_field=TextField()))
+
+
+def search_sessions(therapist, q: str, limit: int = 20):
+    """
+    Full-text search over a therapist's sessions (notes, transcript, report).
+    Returns ranked sessions annotated with `rank` and an HTML-safe `snippet`
+    where matches are wrapped in <mark>.
+    """
+    normalized = normalize_arabic(q)
+    if not normalized:
+        return TherapySession.objects.none()
+
+    query = SearchQuery(normalized, config=SEARCH_CONFIG, search_type="websearch")
+    limit = max(1, min(int(limit), MAX_RESULTS))
+
+    return (
+        TherapySession.objects.filter(therapist=therapist, patient__is_active=True, search_vector=query)
+        .select_related("patient")
+        .annotate(
+            rank=SearchRank(F("search_vector"), query),
+            snippet=SearchHeadline(
+                _snippet_source(),
+                OriginalFormsQuery(_snippet_source(), _highlight_terms(normalized)),
+                config=SEARCH_CONFIG,
+                start_sel="<mark>",
+                stop_sel="</mark>",
+                max_fragments=2,
+                max_words=20,
+                min_words=8,
+            ),
+        )
+        .order_by("-rank", "-created_at")[:limit]
+    )
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from therapy_sessions.models import TherapySession
+
+
+def set_session_status(session_id: int, status: str, **fields) -> Optional[TherapySession]:
+    """
+    Row-locked status write that goes through `save()`, so status listeners
+    (dashboard counters) see the transition; a queryset `.update()` would not.
+    Extra keyword arguments are written alongside the status.
+    """
+    with transaction.atomic():
+        session = TherapySession.objects.select_for_update().filter(pk=session_id).first()
+        if session is None:
+            return None
+
+        session.status = status
+        for name, value in fields.items():
+            setattr(session, name, value)
+        session.updated_at = timezone.now()
+        session.save(update_fields=["status", *fields, "updated_at"])
+    return session
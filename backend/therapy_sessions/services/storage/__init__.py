@@ -0,0 +1,27 @@
+from .resumable import (
+    RESUMABLE_CHUNK_SIZE,
+    RESUMABLE_MAX_CHUNK_BYTES,
+    ChunkInProgress,
+    OffsetMismatch,
+    ResumableUploadError,
+    UploadIncomplete,
+    UploadOverflow,
+    append_chunk,
+    discard_replaced_upload,
+    discard_staging,
+    finalize_upload,
+    start_upload,
+)
+from .gc import (
+    AUDIO_STORAGE_FIELDS,
+    collect_garbage,
+    sweep_orphans,
+    tombstone,
+)
+from .tiering import (
+    TieringError,
+    restore_audio,
+    tier_audio,
+    tiering_candidates,
+    tiering_report,
+)
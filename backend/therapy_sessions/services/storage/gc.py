@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import logging
+import os
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from therapy_sessions.models import SessionAudio, SessionAudioUpload, StorageTombstone
+from therapy_sessions.services.s3.s3_client import s3_client, s3_bucket
+
+logger = logging.getLogger(__name__)
+
+GC_BATCH_SIZE = 1000  # delete_objects accepts at most 1000 keys
+GC_MAX_ATTEMPTS = 8
+GC_BACKOFF_BASE = timedelta(minutes=1)
+GC_BACKOFF_MAX = timedelta(hours=6)
+GC_LEASE = timedelta(minutes=10)  # a claimed batch is skipped by other workers for this long
+
+# every SessionAudio column that names a stored object
+AUDIO_STORAGE_FIELDS = ("audio_file", "peaks_file", "original_key")
+
+RECORDINGS_PREFIX = "recordings/"
+ORPHAN_MIN_AGE = timedelta(days=1)  # never race an upload that has not been confirmed yet
+
+
+def tombstone(keys: Iterable[str], reason: str = "deleted") -> None:
+    """Schedule storage objects for deletion; safe to call inside the deleting transaction."""
+    rows = [StorageTombstone(key=key, reason=reason) for key in set(keys) if key]
+    if rows:
+        StorageTombstone.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+def backoff_for(attempts: int) -> timedelta:
+    return min(GC_BACKOFF_BASE * (2 ** attempts), GC_BACKOFF_MAX)
+
+
+def referenced_keys(keys: Iterable[str]) -> set:
+    """Keys still in use by an audio row or an upload in progress; those must survive."""
+    keys = list(keys)
+    in_use = set()
+    for field in AUDIO_STORAGE_FIELDS:
+        in_use.update(
+            SessionAudio.objects.filter(**{f"{field}__in": keys}).values_list(field, flat=True)
+        )
+    in_use.update(
+        SessionAudioUpload.objects.filter(s3_key__in=keys, status="uploading").values_list("s3_key", flat=True)
+    )
+    return in_use
+
+
+def _delete_from_storage(keys: List[str]) -> Dict[str, str]:
+    """Delete keys, returning {key: error} for the ones that failed."""
+    if getattr(settings, "USE_S3", False):
+        try:
+            resp = s3_client().delete_objects(
+                Bucket=s3_bucket(),
+                Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+            )
+        except Exception as e:
+            return {key: str(e) for key in keys}
+        return {err["Key"]: f"{err.get('Code')}: {err.get('Message')}" for err in resp.get("Errors", [])}
+
+    failed = {}
+    for key in keys:
+        try:
+            default_storage.delete(key)  # missing files are not an error
+        except OSError as e:
+            failed[key] = str(e)
+    return failed
+
+
+def collect_batch(batch_size: int = GC_BATCH_SIZE) -> Tuple[int, int]:
+    """
+    Delete one batch of due tombstones. Rows are claimed with SKIP LOCKED and
+    leased for GC_LEASE so several workers can collect at once; the storage
+    deletes run after that transaction commits, with no row locks held.
+    Returns (deleted, failed).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            StorageTombstone.objects.select_for_update(skip_locked=True)
+            .filter(next_attempt_at__lte=now, attempts__lt=GC_MAX_ATTEMPTS)
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        if not batch:
+            return 0, 0
+        StorageTombstone.objects.filter(pk__in=[t.pk for t in batch]).update(next_attempt_at=now + GC_LEASE)
+
+    in_use = referenced_keys(t.key for t in batch)
+    to_delete = [t.key for t in batch if t.key not in in_use]
+    failed = _delete_from_storage(to_delete) if to_delete else {}
+
+    StorageTombstone.objects.filter(pk__in=[t.pk for t in batch if t.key not in failed]).delete()
+
+    retry = [t for t in batch if t.key in failed]
+    for t in retry:
+        t.attempts += 1
+        t.next_attempt_at = now + backoff_for(t.attempts)
+        t.last_error = failed[t.key][:1000]
+    StorageTombstone.objects.bulk_update(retry, ["attempts", "next_attempt_at", "last_error"])
+
+    if retry:
+        logger.warning("storage gc: %d of %d deletes failed", len(retry), len(batch))
+    return len(to_delete) - len(retry), len(retry)
+
+
+def collect_garbage(max_batches: int = 50) -> Dict[str, int]:
+    deleted = failed = 0
+    for _ in range(max_batches):
+        ok, bad = collect_batch()
+        deleted += ok
+        failed += bad
+        if ok + bad == 0:
+            break
+    return {"deleted": deleted, "failed": failed}
+
+
+def _stored_objects(prefix: str) -> Iterator[Tuple[str, datetime]]:
+    """(key, last_modified) for every stored object under prefix."""
+    if getattr(settings, "USE_S3", False):
+        paginator = s3_client().get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=s3_bucket(), Prefix=prefix):
+            for obj in page.get("Contents", []):
+                yield obj["Key"], obj["LastModified"]
+        return
+
+    root = default_storage.path(prefix)
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            full = os.path.join(dirpath, filename)
+            key = os.path.relpath(full, settings.MEDIA_ROOT).replace(os.sep, "/")
+            yield key, datetime.fromtimestamp(os.path.getmtime(full), tz=dt_timezone.utc)
+
+
+def sweep_orphans(prefix: str = RECORDINGS_PREFIX, min_age: timedelta = ORPHAN_MIN_AGE) -> int:
+    """
+    Tombstone objects under `prefix` that no row references, e.g. left by
+    deletes that predate tombstones or uploads that were never confirmed.
+    """
+    cutoff = timezone.now() - min_age
+    found = 0
+    chunk: List[str] = []
+
+    def flush():
+        nonlocal found
+        orphans = set(chunk) - referenced_keys(chunk)
+        tombstone(orphans, reason="orphan")
+        found += len(orphans)
+        chunk.clear()
+
+    for key, modified in _stored_objects(prefix):
+        if modified > cutoff:
+            continue
+        chunk.append(key)
+        if len(chunk) >= GC_BATCH_SIZE:
+            flush()
+    if chunk:
+        flush()
+    return found
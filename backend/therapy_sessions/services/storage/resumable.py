@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import fcntl
+import os
+import tempfile
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.http import UnreadablePostError
+from django.utils import timezone
+
+from therapy_sessions.models import SessionAudioUpload
+from therapy_sessions.services.s3.storage_key import session_audio_key
+
+RESUMABLE_CHUNK_SIZE = 5 * 1024 * 1024  # suggested to clients
+RESUMABLE_MAX_CHUNK_BYTES = 16 * 1024 * 1024
+_COPY_BUFFER = 1024 * 1024
+
+
+class ResumableUploadError(Exception):
+    pass
+
+
+class OffsetMismatch(ResumableUploadError):
+    def __init__(self, offset: int):
+        super().__init__(f"Expected offset {offset}.")
+        self.offset = offset
+
+
+class ChunkInProgress(ResumableUploadError):
+    pass
+
+
+class UploadOverflow(ResumableUploadError):
+    pass
+
+
+class UploadIncomplete(ResumableUploadError):
+    pass
+
+
+def staging_dir() -> Path:
+    # must share a filesystem with MEDIA_ROOT for the final rename to be atomic
+    configured = getattr(settings, "RESUMABLE_UPLOAD_DIR", "")
+    base = configured or os.path.join(settings.MEDIA_ROOT or tempfile.gettempdir(), ".resumable")
+    path = Path(base)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def staging_path(upload: SessionAudioUpload) -> Path:
+    return staging_dir() / f"{upload.upload_id}.part"
+
+
+def discard_replaced_upload(session) -> None:
+    """
+    Call before any start path overwrites the session's upload row: a resumable
+    upload still in progress would otherwise leave its staging file behind for
+    good, since the expiry task only finds rows of the resumable type.
+    """
+    existing = getattr(session, "audio_upload", None)
+    if existing and existing.upload_type == "resumable" and existing.status == "uploading":
+        discard_staging(existing)
+
+
+def start_upload(session, filename: str, content_type: str, total_size: int) -> SessionAudioUpload:
+    """Create (or reset) the session's resumable upload and its empty staging file."""
+    discard_replaced_upload(session)
+
+    upload_id = uuid.uuid4().hex
+    upload, _ = SessionAudioUpload.objects.update_or_create(
+        session=session,
+        defaults={
+            "upload_type": "resumable",
+            "upload_id": upload_id,
+            # final storage name, same layout as the S3 keys
+            "s3_key": session_audio_key(session, filename, suffix=upload_id[:12]),
+            "content_type": content_type,
+            "total_size": total_size,
+            "received_bytes": 0,
+            "status": "uploading",
+        },
+    )
+    staging_path(upload).touch()
+    return upload
+
+
+def append_chunk(upload: SessionAudioUpload, offset: int, stream, length: int) -> int:
+    """
+    Write `length` bytes from `stream` at `offset` and return the new offset.
+    Only the next expected offset is accepted; bytes past a previous interrupted
+    chunk are truncated away so a retry always starts clean.
+    """
+    if offset != upload.received_bytes:
+        raise OffsetMismatch(upload.received_bytes)
+    if offset + length > upload.total_size:
+        raise UploadOverflow(f"Chunk exceeds declared size of {upload.total_size} bytes.")
+
+    with open(staging_path(upload), "r+b") as fh:
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise ChunkInProgress("Another chunk for this upload is being written.")
+
+        fh.seek(offset)
+        fh.truncate()
+        remaining = length
+        try:
+            while remaining:
+                data = stream.read(min(_COPY_BUFFER, remaining))
+                if not data:
+                    break
+                fh.write(data)
+                remaining -= len(data)
+        except (OSError, UnreadablePostError):
+            # client went away mid-chunk: keep what arrived, it can resume from there
+            pass
+        fh.flush()
+        os.fsync(fh.fileno())
+        new_offset = fh.tell()
+
+        # conditional so a stale request can never move the offset backwards
+        updated = SessionAudioUpload.objects.filter(
+            pk=upload.pk, status="uploading", received_bytes=offset
+        ).update(received_bytes=new_offset, updated_at=timezone.now())
+        if not updated:
+            upload.refresh_from_db(fields=["received_bytes"])
+            raise OffsetMismatch(upload.received_bytes)
+
+    upload.received_bytes = new_offset
+    return new_offset
+
+
+def finalize_upload(upload: SessionAudioUpload) -> str:
+    """
+    Move the staging file to its final storage name: a rename on local
+    storage, a streamed save on storages without filesystem paths.
+    """
+    if upload.received_bytes != upload.total_size:
+        raise UploadIncomplete(f"Received {upload.received_bytes} of {upload.total_size} bytes.")
+
+    source = staging_path(upload)
+    name = upload.s3_key
+    try:
+        destination = default_storage.path(name)
+    except NotImplementedError:
+        with open(source, "rb") as fh:
+            name = default_storage.save(name, File(fh))
+        source.unlink()
+        return name
+
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    os.replace(source, destination)
+    return name
+
+
+def discard_staging(upload: SessionAudioUpload) -> None:
+    try:
+        staging_path(upload).unlink()
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,222 @@
+"""
+Cold tiering of session audio.
+
+Once a session's report is done the recording is rarely played again. The
+tiering job re-encodes it to low-bitrate speech Opus, which becomes the
+playback copy (audio_file), and moves the untouched original under
+AUDIO_COLD_PREFIX (with a cold S3 storage class). Restoring copies the
+original back under a fresh key and drops the Opus copy.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from datetime import timedelta
+from typing import Dict
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from therapy_sessions.models import SessionAudio
+from therapy_sessions.services.s3.s3_client import s3_client, s3_bucket
+from therapy_sessions.services.storage.gc import tombstone
+
+logger = logging.getLogger(__name__)
+
+TIERING_BATCH_SIZE = 100
+RESTORE_DAYS = 2  # how long S3 keeps a temporary restored copy of an archived object
+ARCHIVE_STORAGE_CLASSES = {"GLACIER", "DEEP_ARCHIVE"}  # need restore_object before reading
+
+
+class TieringError(Exception):
+    pass
+
+
+def _cold_prefix() -> str:
+    return getattr(settings, "AUDIO_COLD_PREFIX", "cold/").strip("/") + "/"
+
+
+def cold_key(name: str) -> str:
+    return _cold_prefix() + name
+
+
+def hot_key(key: str) -> str:
+    prefix = _cold_prefix()
+    return key[len(prefix):] if key.startswith(prefix) else key
+
+
+def restored_key(key: str) -> str:
+    """
+    Where a restore writes the original back. Never the pre-tiering name: that
+    key carries a "tiered" tombstone, and a GC pass that checked references
+    before the restore committed would delete the restored file.
+    """
+    root, ext = os.path.splitext(hot_key(key))
+    return f"{root}_{get_random_string(7)}{ext}"
+
+
+def tiering_candidates(now=None, limit: int = TIERING_BATCH_SIZE):
+    """Hot audio of completed sessions that finished more than AUDIO_COLD_AFTER_DAYS ago."""
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=getattr(settings, "AUDIO_COLD_AFTER_DAYS", 30))
+    return (
+        SessionAudio.objects.filter(
+            storage_tier="hot",
+            tiered_at__isnull=True,
+            updated_at__lt=cutoff,  # restored audio stays hot for another period
+            session__status="completed",
+        )
+        .filter(
+            Q(session__timeline__completed_at__lt=cutoff)
+            | Q(session__timeline__completed_at__isnull=True, session__updated_at__lt=cutoff)
+        )
+        .exclude(audio_file="")
+        .order_by("id")[:limit]
+    )
+
+
+def encode_speech_opus(src: str, dst: str) -> None:
+    bitrate = getattr(settings, "AUDIO_OPUS_BITRATE", "24k")
+    proc = subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-v", "error", "-y", "-i", src,
+            "-ac", "1", "-ar", "16000", "-c:a", "libopus", "-b:a", bitrate,
+            "-application", "voip", "-f", "ogg", dst,
+        ],
+        capture_output=True,
+    )
+    if proc.returncode != 0:
+        raise TieringError(f"ffmpeg failed: {proc.stderr.decode('utf-8', 'replace').strip()[:500]}")
+
+
+def _copy_object(src: str, dst: str, storage_class: str) -> None:
+    if getattr(settings, "USE_S3", False):
+        s3_client().copy_object(
+            Bucket=s3_bucket(),
+            Key=dst,
+            CopySource={"Bucket": s3_bucket(), "Key": src},
+            StorageClass=storage_class,
+            MetadataDirective="COPY",
+        )
+        return
+
+    src_path, dst_path = default_storage.path(src), default_storage.path(dst)
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    try:
+        os.link(src_path, dst_path)  # same filesystem: no bytes copied
+    except OSError:
+        shutil.copy2(src_path, dst_path)
+
+
+def tier_audio(audio: SessionAudio) -> int:
+    """Move one recording to the cold tier; returns the bytes saved on the hot tier."""
+    name = audio.audio_file.name
+    original_size = default_storage.size(name)
+    now = timezone.now()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "original" + (os.path.splitext(name)[1] or ".webm"))
+        dst = os.path.join(tmp, "speech.opus")
+        with default_storage.open(name, "rb") as fh, open(src, "wb") as out:
+            shutil.copyfileobj(fh, out, 1024 * 1024)
+        encode_speech_opus(src, dst)
+
+        stored_size = os.path.getsize(dst)
+        if stored_size >= original_size:
+            # already compact (e.g. an Opus recording): nothing to gain, don't look at it again
+            SessionAudio.objects.filter(pk=audio.pk).update(tiered_at=now, updated_at=now)
+            return 0
+
+        with open(dst, "rb") as fh:
+            opus_name = default_storage.save(os.path.splitext(name)[0] + ".opus", File(fh))
+
+    archived = cold_key(name)
+    _copy_object(name, archived, getattr(settings, "AUDIO_COLD_STORAGE_CLASS", "GLACIER_IR"))
+
+    with transaction.atomic():
+        updated = SessionAudio.objects.filter(pk=audio.pk, audio_file=name, storage_tier="hot").update(
+            audio_file=opus_name,
+            storage_tier="cold",
+            original_key=archived,
+            original_size=original_size,
+            stored_size=stored_size,
+            tiered_at=now,
+            updated_at=now,
+        )
+        if not updated:
+            # replaced or deleted meanwhile: our copies are garbage
+            tombstone([opus_name, archived])
+            return 0
+        tombstone([name], reason="tiered")
+
+    return original_size - stored_size
+
+
+def restore_audio(audio: SessionAudio) -> str:
+    """
+    Bring the original back as the playback file. Returns "restored", or
+    "pending" while S3 is still thawing an archived object (call again later).
+    """
+    if audio.storage_tier != "cold":
+        return "restored"
+
+    archived = audio.original_key
+    original = restored_key(archived)
+
+    if getattr(settings, "USE_S3", False):
+        client = s3_client()
+        head = client.head_object(Bucket=s3_bucket(), Key=archived)
+        if head.get("StorageClass") in ARCHIVE_STORAGE_CLASSES:
+            restore = head.get("Restore")
+            if not restore:
+                client.restore_object(
+                    Bucket=s3_bucket(),
+                    Key=archived,
+                    RestoreRequest={"Days": RESTORE_DAYS, "GlacierJobParameters": {"Tier": "Standard"}},
+                )
+                return "pending"
+            if 'ongoing-request="true"' in restore:
+                return "pending"
+
+    _copy_object(archived, original, "STANDARD")
+
+    with transaction.atomic():
+        updated = SessionAudio.objects.filter(pk=audio.pk, storage_tier="cold", original_key=archived).update(
+            audio_file=original,
+            storage_tier="hot",
+            original_key="",
+            stored_size=None,
+            tiered_at=None,
+            updated_at=timezone.now(),
+        )
+        if updated:
+            tombstone([audio.audio_file.name, archived], reason="tiered")
+        else:
+            tombstone([original])
+    return "restored"
+
+
+def tiering_report() -> Dict[str, int]:
+    totals = SessionAudio.objects.aggregate(
+        hot=Count("id", filter=Q(storage_tier="hot")),
+        cold=Count("id", filter=Q(storage_tier="cold")),
+        original_bytes=Sum("original_size", filter=Q(storage_tier="cold")),
+        stored_bytes=Sum("stored_size", filter=Q(storage_tier="cold")),
+    )
+    original = totals["original_bytes"] or 0
+    stored = totals["stored_bytes"] or 0
+    return {
+        "hot_count": totals["hot"],
+        "cold_count": totals["cold"],
+        "cold_original_bytes": original,
+        "cold_stored_bytes": stored,
+        "bytes_saved": original - stored,
+    }
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import mimetypes
+import os
+import re
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect
+from django.urls import reverse
+from django.utils.http import http_date, parse_http_date_safe
+
+from therapy_sessions.services.s3.s3_client import s3_client, s3_bucket
+
+STREAM_TOKEN_SALT = "therapy_sessions.audio-stream"
+PRESIGNED_GET_EXPIRES = 60 * 60  # 1 hour
+STREAM_BLOCK_SIZE = 256 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def stream_token(audio) -> str:
+    # bound to the audio row: replacing the recording invalidates old links
+    return signing.dumps({"s": audio.session_id, "a": audio.pk}, salt=STREAM_TOKEN_SALT)
+
+
+def read_stream_token(token: str) -> Optional[dict]:
+    try:
+        return signing.loads(
+            token,
+            salt=STREAM_TOKEN_SALT,
+            max_age=getattr(settings, "AUDIO_STREAM_URL_TTL", PRESIGNED_GET_EXPIRES),
+        )
+    except signing.BadSignature:  # includes SignatureExpired
+        return None
+
+
+def audio_playback_url(request, audio) -> str:
+    """A URL an <audio> element can load directly (no auth header needed)."""
+    if getattr(settings, "USE_S3", False):
+        return s3_client().generate_presigned_url(
+            ClientMethod="get_object",
+            Params={"Bucket": s3_bucket(), "Key": str(audio.audio_file)},
+            ExpiresIn=PRESIGNED_GET_EXPIRES,
+        )
+
+    path = reverse("session_audio_stream", kwargs={"pk": audio.session_id})
+    url = f"{path}?token={stream_token(audio)}"
+    return request.build_absolute_uri(url) if request else url
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Inclusive (start, end) for a single `bytes=` range, None when the header
+    should be ignored (absent, malformed or multi-range: answer with 200).
+    """
+    match = _RANGE_RE.match((header or "").strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:  # suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+def if_range_allows(header: str, etag: str, mtime: float) -> bool:
+    """If-Range holds a strong ETag or an HTTP date; a mismatch means "send it all"."""
+    if not header:
+        return True
+    header = header.strip()
+    if header.startswith(('"', "W/")):
+        return header == etag
+    since = parse_http_date_safe(header)
+    return since is not None and int(mtime) <= since
+
+
+class RangeFileWrapper:
+    """
+    File positioned at `start` that reads at most `length` bytes. Keeps
+    fileno() so WSGI servers with sendfile (gunicorn) copy the range in
+    the kernel, bounded by Content-Length.
+    """
+
+    def __init__(self, fh, start: int, length: int):
+        self._fh = fh
+        self._remaining = length
+        fh.seek(start)
+
+    def read(self, size: int = -1) -> bytes:
+        if self._remaining <= 0:
+            return b""
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._fh.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def fileno(self) -> int:
+        return self._fh.fileno()
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+def _sendfile_response(name: str, path: str) -> Optional[HttpResponse]:
+    backend = getattr(settings, "AUDIO_SENDFILE", "")
+    if backend == "nginx":
+        response = HttpResponse()
+        prefix = getattr(settings, "AUDIO_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+        response["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + name.lstrip("/")
+        return response
+    if backend == "apache":
+        response = HttpResponse()
+        response["X-Sendfile"] = path
+        return response
+    return None
+
+
+def stream_audio_response(request, audio) -> HttpResponse:
+    """
+    Serve a stored recording with Range / If-Range support. Local files go
+    to the front proxy (X-Accel-Redirect / X-Sendfile) when configured, which
+    then handles ranges itself; otherwise a bounded FileResponse. Remote
+    storages are redirected to a presigned URL.
+    """
+    name = audio.audio_file.name
+    try:
+        path = default_storage.path(name)
+    except NotImplementedError:
+        return HttpResponseRedirect(audio_playback_url(request, audio))
+
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return HttpResponse(status=404)
+
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    etag = f'"{audio.pk}-{stat.st_size}-{int(stat.st_mtime)}"'
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Last-Modified": http_date(stat.st_mtime),
+        "Cache-Control": "private, max-age=3600",
+    }
+
+    response = _sendfile_response(name, path)
+    if response is not None:
+        response["Content-Type"] = content_type
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    size = stat.st_size
+    byte_range = None
+    if if_range_allows(request.headers.get("If-Range", ""), etag, stat.st_mtime):
+        try:
+            byte_range = parse_range(request.headers.get("Range", ""), size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            response["Accept-Ranges"] = "bytes"
+            return response
+
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1 if size else 0
+
+    response = FileResponse(
+        RangeFileWrapper(open(path, "rb"), start, length),
+        status=206 if byte_range else 200,
+        content_type=content_type,
+    )
+    response.block_size = STREAM_BLOCK_SIZE
+    response["Content-Length"] = str(length)
+    if byte_range:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    for key, value in headers.items():
+        response[key] = value
+    return response
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from django.utils import timezone
+
+from therapy_sessions.models import SessionProcessingTimeline
+
+# stage -> SessionProcessingTimeline field
+TIMELINE_STAGES = {
+    "uploaded": "uploaded_at",
+    "transcription_started": "transcription_started_at",
+    "transcription_finished": "transcription_finished_at",
+    "analysis_started": "analysis_started_at",
+    "analysis_finished": "analysis_finished_at",
+    "completed": "completed_at",
+    "failed": "failed_at",
+}
+
+# retried tasks keep the first start so durations include the retries
+FIRST_WRITE_WINS = {"transcription_started", "analysis_started"}
+
+
+def mark_stage(
+    session_id: int,
+    stage: str,
+    at: Optional[datetime] = None,
+    failed_stage: str = "",
+) -> SessionProcessingTimeline:
+    """
+    Stamp one pipeline stage for a session. A new upload starts a new attempt,
+    so "uploaded" clears every later stamp.
+    """
+    field = TIMELINE_STAGES[stage]
+    timeline, _ = SessionProcessingTimeline.objects.get_or_create(session_id=session_id)
+
+    if stage in FIRST_WRITE_WINS and getattr(timeline, field):
+        return timeline
+
+    update_fields = [field, "updated_at"]
+    if stage == "uploaded":
+        for other in TIMELINE_STAGES.values():
+            setattr(timeline, other, None)
+        timeline.failed_stage = ""
+        update_fields = [*TIMELINE_STAGES.values(), "failed_stage", "updated_at"]
+    elif stage == "failed":
+        timeline.failed_stage = failed_stage
+        update_fields.append("failed_stage")
+
+    setattr(timeline, field, at or timezone.now())
+    timeline.save(update_fields=update_fields)
+    return timeline
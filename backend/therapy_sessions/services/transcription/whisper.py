@@ -5,6 +5,8 @@ from typing import Dict, Optional
 from django.conf import settings
 from openai import OpenAI
 
+from therapy_sessions.services.openai_client import openai_client
+
 from .base import BaseTranscriptionService, validate_transcription_output
 
 
@@ -29,7 +31,7 @@ class WhisperTranscriptionService(BaseTranscriptionService):
                 "Set it in env or settings, or mock transcription in tests."
             )
 
-        self._client = OpenAI(api_key=api_key)
+        self._client = openai_client(api_key)
         return self._client
 
     def transcribe(self, audio_path: str, language: str = "ar") -> Dict:
@@ -0,0 +1,190 @@
+"""
+Waveform peaks for the audio player.
+
+The recording is decoded once with ffmpeg to mono PCM at a low sample rate
+and reduced, chunk by chunk, to min/max pairs per block of samples. Coarser
+zoom levels are derived from the finest one.
+
+Blob layout ("WPK1", little endian):
+    header  4s magic, B bits (8|16), B level count, H reserved,
+            I sample rate, Q total samples
+    levels  per level: I samples per peak, I peak count
+    data    per level, in order: peak count x (min, max) as int8/int16
+"""
+from __future__ import annotations
+
+import os
+import struct
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from therapy_sessions.models import SessionAudio
+
+PEAKS_MAGIC = b"WPK1"
+PEAKS_SAMPLE_RATE = 8000
+PEAKS_BITS = 8
+BASE_SAMPLES_PER_PEAK = 256  # ~31 peaks per second at 8 kHz
+ZOOM_FACTOR = 4
+MAX_LEVELS = 4
+MIN_LEVEL_PEAKS = 512  # stop zooming out once a level gets this small
+
+_HEADER = struct.Struct("<4sBBHIQ")
+_LEVEL = struct.Struct("<II")
+_READ_BYTES = BASE_SAMPLES_PER_PEAK * 2 * 4096  # whole blocks of s16 samples
+
+
+class WaveformError(Exception):
+    pass
+
+
+@dataclass
+class PeakLevel:
+    samples_per_peak: int
+    mins: np.ndarray
+    maxs: np.ndarray
+
+
+def _reduce(samples: np.ndarray, block: int):
+    blocks = samples.reshape(-1, block)
+    return blocks.min(axis=1), blocks.max(axis=1)
+
+
+def _pad_to(samples: np.ndarray, block: int) -> np.ndarray:
+    rest = -len(samples) % block
+    return np.concatenate([samples, np.repeat(samples[-1:], rest)]) if rest else samples
+
+
+def reduce_pcm_stream(stream):
+    """
+    Min/max peaks from a stream of mono s16le PCM, read in bounded chunks.
+    Returns (levels, total_samples), finest level first, at int16 scale.
+    """
+    mins, maxs = [], []
+    total = 0
+    carry = b""
+    while True:
+        data = stream.read(_READ_BYTES)
+        if not data:
+            break
+        data = carry + data
+        usable = len(data) - len(data) % (BASE_SAMPLES_PER_PEAK * 2)
+        carry = data[usable:]
+        if usable:
+            chunk = np.frombuffer(data[:usable], dtype="<i2")
+            lo, hi = _reduce(chunk, BASE_SAMPLES_PER_PEAK)
+            mins.append(lo)
+            maxs.append(hi)
+            total += len(chunk)
+
+    if len(carry) >= 2:
+        tail = np.frombuffer(carry[: len(carry) - len(carry) % 2], dtype="<i2")
+        lo, hi = _reduce(_pad_to(tail, BASE_SAMPLES_PER_PEAK), BASE_SAMPLES_PER_PEAK)
+        mins.append(lo)
+        maxs.append(hi)
+        total += len(tail)
+
+    if not total:
+        raise WaveformError("Audio decoded to no samples.")
+
+    level = PeakLevel(BASE_SAMPLES_PER_PEAK, np.concatenate(mins), np.concatenate(maxs))
+    levels = [level]
+    while len(levels) < MAX_LEVELS and len(level.mins) // ZOOM_FACTOR >= MIN_LEVEL_PEAKS:
+        lo = _pad_to(level.mins, ZOOM_FACTOR).reshape(-1, ZOOM_FACTOR).min(axis=1)
+        hi = _pad_to(level.maxs, ZOOM_FACTOR).reshape(-1, ZOOM_FACTOR).max(axis=1)
+        level = PeakLevel(level.samples_per_peak * ZOOM_FACTOR, lo, hi)
+        levels.append(level)
+    return levels, total
+
+
+def compute_peaks(path: str):
+    """Decode `path` with ffmpeg (mono, PEAKS_SAMPLE_RATE) and reduce it to peaks."""
+    with tempfile.TemporaryFile() as errors:
+        proc = subprocess.Popen(
+            [
+                "ffmpeg", "-nostdin", "-v", "error", "-i", path,
+                "-ac", "1", "-ar", str(PEAKS_SAMPLE_RATE), "-f", "s16le", "-",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=errors,
+        )
+        try:
+            result = reduce_pcm_stream(proc.stdout)
+        except WaveformError:
+            result = None
+        finally:
+            proc.stdout.close()
+            proc.wait()
+
+        if proc.returncode != 0:
+            errors.seek(0)
+            message = errors.read().decode("utf-8", "replace").strip()[:500]
+            raise WaveformError(f"ffmpeg failed: {message}")
+    if result is None:
+        raise WaveformError("Audio decoded to no samples.")
+    return result
+
+
+def encode_peaks(levels: List[PeakLevel], total_samples: int, bits: int = PEAKS_BITS) -> bytes:
+    if bits not in (8, 16):
+        raise ValueError("bits must be 8 or 16")
+
+    parts = [
+        _HEADER.pack(PEAKS_MAGIC, bits, len(levels), 0, PEAKS_SAMPLE_RATE, total_samples),
+        *(_LEVEL.pack(level.samples_per_peak, len(level.mins)) for level in levels),
+    ]
+    for level in levels:
+        pairs = np.empty(len(level.mins) * 2, dtype=np.int16)
+        pairs[0::2], pairs[1::2] = level.mins, level.maxs
+        if bits == 8:
+            pairs = (pairs >> 8).astype(np.int8)
+        parts.append(pairs.astype(pairs.dtype.newbyteorder("<")).tobytes())
+    return b"".join(parts)
+
+
+def decode_peaks_header(blob: bytes) -> dict:
+    magic, bits, count, _, sample_rate, total = _HEADER.unpack_from(blob)
+    if magic != PEAKS_MAGIC:
+        raise WaveformError("Not a WPK1 peaks blob.")
+    levels = [
+        dict(zip(("samples_per_peak", "peaks"), _LEVEL.unpack_from(blob, _HEADER.size + i * _LEVEL.size)))
+        for i in range(count)
+    ]
+    return {"bits": bits, "sample_rate": sample_rate, "total_samples": total, "levels": levels}
+
+
+def peaks_name(audio_name: str) -> str:
+    return os.path.splitext(audio_name)[0] + ".peaks"
+
+
+def generate_audio_peaks(audio: SessionAudio) -> str:
+    """Compute and store peaks next to the recording; returns the storage name."""
+    audio_name = audio.audio_file.name
+    suffix = os.path.splitext(audio_name)[1] or ".webm"
+
+    with default_storage.open(audio_name, "rb") as src:
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+            for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                tmp.write(chunk)
+            path = tmp.name
+    try:
+        levels, total = compute_peaks(path)
+    finally:
+        os.unlink(path)
+
+    name = default_storage.save(peaks_name(audio_name), ContentFile(encode_peaks(levels, total)))
+
+    # conditional on the audio row still being current: a replacement may have landed meanwhile
+    updated = SessionAudio.objects.filter(pk=audio.pk, audio_file=audio_name).update(
+        peaks_file=name,
+        duration_seconds=round(total / PEAKS_SAMPLE_RATE),
+    )
+    if not updated:
+        default_storage.delete(name)
+        raise WaveformError("Audio was replaced while peaks were computed.")
+    return name
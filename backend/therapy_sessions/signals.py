@@ -0,0 +1,100 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import Signal, receiver
+
+from therapy_sessions.models import (
+    SessionAudio,
+    SessionAudioUpload,
+    SessionReport,
+    SessionTranscript,
+    TherapySession,
+)
+from therapy_sessions.services.search import update_session_search_vector
+from therapy_sessions.services.storage import AUDIO_STORAGE_FIELDS, discard_staging, tombstone
+
+# sent after commit with instance, old_status, new_status;
+# old_status is None for new rows and new_status is None for deleted rows
+session_status_changed = Signal()
+report_status_changed = Signal()
+
+STATUS_SIGNALS = {
+    TherapySession: session_status_changed,
+    SessionReport: report_status_changed,
+}
+
+# fields feeding TherapySession.search_vector, per model
+SEARCH_SOURCE_FIELDS = {
+    TherapySession: {"notes_before", "notes_after"},
+    SessionTranscript: {"cleaned_transcript"},
+    SessionReport: {"generated_summary", "therapist_notes"},
+}
+
+
+def _touches_search_fields(sender, update_fields):
+    if update_fields is None:
+        return True
+    return bool(SEARCH_SOURCE_FIELDS[sender] & set(update_fields))
+
+
+@receiver(post_save, sender=TherapySession)
+@receiver(post_save, sender=SessionTranscript)
+@receiver(post_save, sender=SessionReport)
+def refresh_search_vector(sender, instance, update_fields=None, **kwargs):
+    if not _touches_search_fields(sender, update_fields):
+        return
+
+    session_id = instance.pk if sender is TherapySession else instance.session_id
+    transaction.on_commit(lambda: update_session_search_vector(session_id))
+
+
+@receiver(post_init, sender=TherapySession)
+@receiver(post_init, sender=SessionReport)
+def remember_loaded_status(sender, instance, **kwargs):
+    # deferred loads (.only(...)) without status must not trigger a DB fetch
+    instance._loaded_status = instance.__dict__.get("status")
+
+
+@receiver(post_save, sender=TherapySession)
+@receiver(post_save, sender=SessionReport)
+def announce_status_change(sender, instance, created=False, update_fields=None, **kwargs):
+    if update_fields is not None and "status" not in update_fields:
+        return
+
+    old_status = None if created else instance._loaded_status
+    new_status = instance.status
+    instance._loaded_status = new_status
+    if old_status == new_status:
+        return
+
+    signal = STATUS_SIGNALS[sender]
+    transaction.on_commit(lambda: signal.send(
+        sender=sender, instance=instance, old_status=old_status, new_status=new_status,
+    ))
+
+
+@receiver(post_delete, sender=TherapySession)
+@receiver(post_delete, sender=SessionReport)
+def announce_status_removed(sender, instance, **kwargs):
+    old_status = instance.__dict__.get("status")
+    signal = STATUS_SIGNALS[sender]
+    transaction.on_commit(lambda: signal.send(
+        sender=sender, instance=instance, old_status=old_status, new_status=None,
+    ))
+
+
+# Storage objects are never deleted on the request path. The tombstone is
+# written in the deleting transaction (so it also covers cascades from
+# session/patient/account deletes) and the GC task removes the object later.
+@receiver(post_delete, sender=SessionAudio)
+def tombstone_deleted_audio(sender, instance, **kwargs):
+    tombstone(str(getattr(instance, field) or "") for field in AUDIO_STORAGE_FIELDS)
+
+
+@receiver(post_delete, sender=SessionAudioUpload)
+def tombstone_abandoned_upload(sender, instance, **kwargs):
+    if instance.status != "uploading":
+        return
+    if instance.upload_type == "presigned_post":
+        tombstone([instance.s3_key], reason="abandoned")
+    elif instance.upload_type == "resumable":
+        transaction.on_commit(lambda: discard_staging(instance))
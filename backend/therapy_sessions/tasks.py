@@ -1,18 +1,59 @@
 from __future__ import annotations
 
+import logging
+
 from celery import shared_task
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
 from django.utils import timezone
+from django.utils.module_loading import import_string
+from opentelemetry.trace import SpanKind
 
-from therapy_sessions.models import TherapySession, SessionTranscript, SessionReport
+from core.metrics import observe_provider
+from core.tracing import on_commit, span, traced_atomic
+from therapy_sessions.models import TherapySession, SessionAudio, SessionTranscript, SessionReport, SessionAudioUpload
 from therapy_sessions.services.transcription.whisper import WhisperTranscriptionService
 from therapy_sessions.services.reporting.service import ReportService, ReportGenerationError
+from therapy_sessions.services.screening import screen_transcript
+from therapy_sessions.services.status import set_session_status
+from therapy_sessions.services.timeline import mark_stage
+from therapy_sessions.services.storage import (
+    collect_garbage,
+    discard_staging,
+    restore_audio,
+    sweep_orphans,
+    tier_audio,
+    tiering_candidates,
+)
+from therapy_sessions.services.waveform import WaveformError, generate_audio_peaks
 
 import os
 import tempfile
 from django.core.files.storage import default_storage
 
+logger = logging.getLogger(__name__)
+
+
+def transcription_service():
+    """Whisper unless TRANSCRIPTION_SERVICE_CLASS names another service."""
+    path = getattr(settings, "TRANSCRIPTION_SERVICE_CLASS", "")
+    return import_string(path)() if path else WhisperTranscriptionService()
+
+
+def enqueue_report(session_id: int, urgent: bool = False):
+    """
+    Sessions flagged by the local screen skip the regular FIFO and go to
+    the high-priority report queue.
+    """
+    if urgent:
+        generate_session_report.apply_async(
+            args=[session_id],
+            queue=settings.URGENT_REPORT_QUEUE,
+        )
+    else:
+        generate_session_report.delay(session_id)
+
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=10)
 def transcribe_session(self, session_id: int):
@@ -55,7 +96,8 @@ def transcribe_session(self, session_id: int):
                 session.status = "analyzing"
                 session.updated_at = timezone.now()
                 session.save(update_fields=["status", "updated_at"])
-            transaction.on_commit(lambda: generate_session_report.delay(session_id))
+            urgent = session.provisional_risk_flag
+            transaction.on_commit(lambda: enqueue_report(session_id, urgent=urgent))
         else:
             if session.status != "completed":
                 session.status = "completed"
@@ -76,28 +118,34 @@ def transcribe_session(self, session_id: int):
         transcript.updated_at = timezone.now()
         transcript.save(update_fields=["status", "updated_at"])
 
+    mark_stage(session_id, "transcription_started")
+
     audio_name = getattr(getattr(audio, "audio_file", None), "name", None)
     if not audio_name:
         raise RuntimeError("Audio file name/key missing.")
 
     suffix = "." + audio_name.rsplit(".", 1)[1].lower() if "." in audio_name else ".webm"
 
-    with default_storage.open(audio_name, "rb") as src:
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-            for chunk in iter(lambda: src.read(1024 * 1024), b""):
-                tmp.write(chunk)
-            audio_path = tmp.name
+    with span("storage.download", kind=SpanKind.CLIENT, **{"storage.key": audio_name}):
+        with default_storage.open(audio_name, "rb") as src:
+            with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+                for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                    tmp.write(chunk)
+                audio_path = tmp.name
 
     language = getattr(audio, "language_code", None) or "ar"
 
     try:
-        transcription_service = WhisperTranscriptionService()
-        result = transcription_service.transcribe(
-            audio_path=audio_path,
-            language=language,
-        )
+        service = transcription_service()
+        with observe_provider(type(service).__name__, "transcribe"):
+            result = service.transcribe(
+                audio_path=audio_path,
+                language=language,
+            )
+
+        screening = screen_transcript(result["cleaned_text"])
 
-        with transaction.atomic():
+        with traced_atomic("save_transcript"):
             transcript.raw_transcript = result["raw_text"]
             transcript.cleaned_transcript = result["cleaned_text"]
             transcript.language_code = language
@@ -108,12 +156,27 @@ def transcribe_session(self, session_id: int):
             transcript.save()
 
             session.status = "transcribed"
+            session.provisional_risk_flag = screening.is_urgent
+            session.provisional_risk_terms = screening.matches
+            session.risk_screened_at = timezone.now()
             session.updated_at = timezone.now()
-            session.save(update_fields=["status", "updated_at"])
+            session.save(update_fields=[
+                "status",
+                "provisional_risk_flag",
+                "provisional_risk_terms",
+                "risk_screened_at",
+                "updated_at",
+            ])
+            mark_stage(session_id, "transcription_finished")
 
-            transaction.on_commit(lambda: generate_session_report.delay(session_id))
+            on_commit(lambda: enqueue_report(session_id, urgent=screening.is_urgent))
 
-        return {"ok": True, "session_id": session_id, "transcript_id": transcript.id}
+        return {
+            "ok": True,
+            "session_id": session_id,
+            "transcript_id": transcript.id,
+            "urgent": screening.is_urgent,
+        }
 
     except Exception as e:
         if self.request.retries >= self.max_retries:
@@ -122,12 +185,13 @@ def transcribe_session(self, session_id: int):
                 transcript.updated_at = timezone.now()
                 transcript.save(update_fields=["status", "updated_at"])
 
-                TherapySession.objects.filter(id=session_id).update(
+                set_session_status(
+                    session_id,
+                    "failed",
                     last_error_stage="transcription",
                     last_error_message=str(e)[:500],
-                    status="failed",
-                    updated_at=timezone.now(),
                 )
+                mark_stage(session_id, "failed", failed_stage="transcription")
             raise
         raise self.retry(exc=e)
 
@@ -166,18 +230,19 @@ def generate_session_report(self, session_id: int):
     )
 
 
+    mark_stage(session_id, "analysis_started")
+
     try:
         report = ReportService.generate_for_session(session_id)
+        mark_stage(session_id, "analysis_finished")
 
         if report.status != "completed":
             report.status = "completed"
             report.updated_at = timezone.now()
             report.save(update_fields=["status", "updated_at"])
 
-        TherapySession.objects.filter(id=session_id).update(
-            status="completed",
-            updated_at=timezone.now(),
-        )
+        set_session_status(session_id, "completed")
+        mark_stage(session_id, "completed")
 
         return {"ok": True, "session_id": session_id, "report_id": report.id}
 
@@ -186,6 +251,7 @@ def generate_session_report(self, session_id: int):
             status="failed",
             updated_at=timezone.now(),
         )
+        mark_stage(session_id, "failed", failed_stage="analysis")
         return {
             "ok": False,
             "error": "report_generation_error",
@@ -199,6 +265,99 @@ def generate_session_report(self, session_id: int):
                 status="failed",
                 updated_at=timezone.now(),
             )
+            mark_stage(session_id, "failed", failed_stage="analysis")
             raise
 
         raise self.retry(exc=e)
+
+
+RESUMABLE_UPLOAD_TTL_HOURS = 24
+
+
+@shared_task
+def expire_resumable_uploads():
+    """Drop staging files of resumable uploads nobody has touched for a day."""
+    cutoff = timezone.now() - timezone.timedelta(hours=RESUMABLE_UPLOAD_TTL_HOURS)
+    stale = SessionAudioUpload.objects.filter(
+        upload_type="resumable",
+        status="uploading",
+        updated_at__lt=cutoff,
+    )
+
+    expired = 0
+    for upload in stale.iterator():
+        discard_staging(upload)
+        upload.status = "expired"
+        upload.save(update_fields=["status", "updated_at"])
+        expired += 1
+
+    return {"ok": True, "expired": expired}
+
+
+@shared_task
+def collect_storage_garbage():
+    """Delete tombstoned storage objects in batches; failures retry with backoff."""
+    return {"ok": True, **collect_garbage()}
+
+
+@shared_task
+def sweep_orphaned_recordings():
+    """Tombstone stored recordings no row references any more."""
+    return {"ok": True, "orphans": sweep_orphans()}
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def generate_waveform_peaks(self, session_id: int):
+    """Decode the session audio once and store min/max peaks for the player."""
+    audio = SessionAudio.objects.filter(session_id=session_id).first()
+    if not audio or not audio.audio_file:
+        return {"ok": False, "error": "no_audio", "session_id": session_id}
+
+    try:
+        name = generate_audio_peaks(audio)
+    except WaveformError as e:
+        # undecodable or replaced audio: retrying will not help
+        return {"ok": False, "error": str(e), "session_id": session_id}
+    except Exception as e:
+        raise self.retry(exc=e)
+
+    return {"ok": True, "session_id": session_id, "peaks_file": name}
+
+
+@shared_task
+def tier_cold_audio():
+    """Re-encode old completed recordings to speech Opus and archive the originals."""
+    tiered = failed = bytes_saved = 0
+    for audio in tiering_candidates():
+        try:
+            saved = tier_audio(audio)
+        except Exception:
+            logger.exception("Cold tiering failed for audio %s", audio.pk)
+            failed += 1
+            continue
+        if saved:
+            tiered += 1
+            bytes_saved += saved
+
+    return {"ok": True, "tiered": tiered, "failed": failed, "bytes_saved": bytes_saved}
+
+
+RESTORE_POLL_SECONDS = 15 * 60
+
+
+@shared_task(bind=True, max_retries=96, default_retry_delay=RESTORE_POLL_SECONDS)
+def restore_session_audio(self, session_id: int):
+    """Bring an archived original back; polls while S3 thaws it (up to ~24h)."""
+    audio = SessionAudio.objects.filter(session_id=session_id).first()
+    if not audio or audio.storage_tier != "cold":
+        return {"ok": True, "session_id": session_id, "state": "hot"}
+
+    try:
+        state = restore_audio(audio)
+    except Exception as e:
+        raise self.retry(exc=e, countdown=60)
+
+    if state == "pending":
+        raise self.retry(countdown=RESTORE_POLL_SECONDS)
+
+    return {"ok": True, "session_id": session_id, "state": state}
@@ -0,0 +1,123 @@
+import pytest
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+from django.db import transaction
+
+from therapy_sessions.models import SessionAudio, SessionAudioUpload, StorageTombstone
+from therapy_sessions.services.audio_limits import MAX_AUDIO_UPLOAD_BYTES
+
+API = "/api/v1"
+BASE = f"{API}/sessions"
+
+
+@pytest.fixture
+def s3(settings):
+    settings.USE_S3 = True
+    settings.AWS_STORAGE_BUCKET_NAME = "test-bucket"
+    with patch("therapy_sessions.services.s3.direct_upload.s3_client") as client_factory:
+        client = client_factory.return_value
+        client.generate_presigned_post.side_effect = lambda **kw: {
+            "url": "https://test-bucket.s3.amazonaws.com/",
+            "fields": {"key": kw["Key"], "Content-Type": kw["Fields"]["Content-Type"]},
+        }
+        yield client
+
+
+@pytest.fixture
+def started(auth_client_a, session_a, s3):
+    res = auth_client_a.post(
+        f"{BASE}/{session_a.id}/audio/direct/start/",
+        {"filename": "visit.webm", "content_type": "audio/webm;codecs=opus", "size": 1024},
+        format="json",
+    )
+    assert res.status_code == 201, res.data
+    return res.data
+
+
+def _confirm(client, session, key):
+    with patch.object(transaction, "on_commit", side_effect=lambda cb: cb()), \
+         patch("therapy_sessions.tasks.transcribe_session.delay") as delay_mock, \
+         patch("therapy_sessions.tasks.generate_waveform_peaks.delay"):
+        res = client.post(
+            f"{BASE}/{session.id}/audio/direct/confirm/",
+            {"key": key, "original_filename": "visit.webm", "language_code": "ar"},
+            format="json",
+        )
+    return res, delay_mock
+
+
+@pytest.mark.django_db
+class TestDirectUpload:
+    def test_start_returns_presigned_post(self, session_a, s3, started):
+        assert started["key"].startswith(f"recordings/patient_{session_a.patient_id}/session_{session_a.id}/audio-")
+        assert started["fields"]["Content-Type"] == "audio/webm"
+
+        conditions = s3.generate_presigned_post.call_args.kwargs["Conditions"]
+        assert ["content-length-range", 1, MAX_AUDIO_UPLOAD_BYTES] in conditions
+
+        upload = SessionAudioUpload.objects.get(session=session_a)
+        assert upload.upload_type == "presigned_post"
+        assert upload.status == "uploading"
+
+    @pytest.mark.parametrize("payload", [
+        {"filename": "notes.pdf", "content_type": "application/pdf"},
+        {"filename": "big.wav", "content_type": "audio/wav", "size": MAX_AUDIO_UPLOAD_BYTES + 1},
+    ])
+    def test_start_rejects_bad_files(self, auth_client_a, session_a, s3, payload):
+        res = auth_client_a.post(f"{BASE}/{session_a.id}/audio/direct/start/", payload, format="json")
+        assert res.status_code == 400
+
+    def test_confirm_creates_audio_after_head_check(self, auth_client_a, session_a, s3, started):
+        s3.head_object.return_value = {"ContentLength": 2048, "ContentType": "audio/webm"}
+
+        res, delay_mock = _confirm(auth_client_a, session_a, started["key"])
+
+        assert res.status_code == 201, res.data
+        audio = SessionAudio.objects.get(session=session_a)
+        assert audio.audio_file.name == started["key"]
+        delay_mock.assert_called_once_with(session_a.id)
+        session_a.refresh_from_db()
+        assert session_a.status == "transcribing"
+
+    def test_confirm_before_upload_lands(self, auth_client_a, session_a, s3, started):
+        s3.head_object.side_effect = ClientError({"Error": {"Code": "404"}}, "HeadObject")
+
+        res, delay_mock = _confirm(auth_client_a, session_a, started["key"])
+
+        assert res.status_code == 400
+        assert SessionAudioUpload.objects.get(session=session_a).status == "uploading"
+        delay_mock.assert_not_called()
+
+    def test_confirm_rejects_mismatched_content_type(self, auth_client_a, session_a, s3, started):
+        s3.head_object.return_value = {"ContentLength": 2048, "ContentType": "video/mp4"}
+
+        res, _ = _confirm(auth_client_a, session_a, started["key"])
+
+        assert res.status_code == 400
+        # removed later by the storage GC, not on the request path
+        s3.delete_object.assert_not_called()
+        assert StorageTombstone.objects.filter(key=started["key"], reason="rejected").exists()
+        assert SessionAudioUpload.objects.get(session=session_a).status == "failed"
+        assert not SessionAudio.objects.filter(session=session_a).exists()
+
+    def test_existing_audio_requires_replace(self, auth_client_a, session_a, s3, started):
+        s3.head_object.return_value = {"ContentLength": 2048, "ContentType": "audio/webm"}
+        _confirm(auth_client_a, session_a, started["key"])
+
+        url = f"{BASE}/{session_a.id}/audio/direct/start/"
+        payload = {"filename": "again.webm", "content_type": "audio/webm"}
+        assert auth_client_a.post(url, payload, format="json").status_code == 409
+
+        res = auth_client_a.post(url, {**payload, "replace": True}, format="json")
+        assert res.status_code == 201
+        assert res.data["key"] != started["key"]
+
+    def test_abort_tombstones_the_direct_upload(self, auth_client_a, session_a, s3, started):
+        with patch("therapy_sessions.views.sessions.s3_client") as view_s3:
+            res = auth_client_a.post(f"{BASE}/{session_a.id}/audio/multipart/abort/")
+
+        assert res.status_code == 200
+        view_s3.return_value.abort_multipart_upload.assert_not_called()
+        assert StorageTombstone.objects.filter(key=started["key"], reason="abandoned").exists()
+        assert SessionAudioUpload.objects.get(session=session_a).status == "aborted"
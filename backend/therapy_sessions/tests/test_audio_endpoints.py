@@ -21,7 +21,8 @@ def _force_on_commit_to_run_immediately():
 def test_upload_audio_success_enqueues_task(auth_client_a, session_a, make_audio_file):
     url = f"{BASE}/{session_a.id}/upload-audio/"
 
-    with _force_on_commit_to_run_immediately(), patch("therapy_sessions.tasks.transcribe_session.delay") as delay_mock:
+    with _force_on_commit_to_run_immediately(), patch("therapy_sessions.tasks.transcribe_session.delay") as delay_mock, \
+         patch("therapy_sessions.tasks.generate_waveform_peaks.delay"):
         resp = auth_client_a.post(
             url,
             data={"audio_file": make_audio_file(), "language_code": "en"},
@@ -40,7 +41,8 @@ def test_upload_audio_success_enqueues_task(auth_client_a, session_a, make_audio
 def test_upload_audio_twice_returns_409(auth_client_a, session_a, make_audio_file):
     url = f"{BASE}/{session_a.id}/upload-audio/"
 
-    with _force_on_commit_to_run_immediately(), patch("therapy_sessions.tasks.transcribe_session.delay") as delay_mock:
+    with _force_on_commit_to_run_immediately(), patch("therapy_sessions.tasks.transcribe_session.delay") as delay_mock, \
+         patch("therapy_sessions.tasks.generate_waveform_peaks.delay"):
         r1 = auth_client_a.post(
             url,
             data={"audio_file": make_audio_file(), "language_code": "en"},
@@ -64,7 +66,8 @@ def test_replace_audio_success_enqueues_task(auth_client_a, session_a_with_audio
 
     old_audio_id = SessionAudio.objects.get(session=session).id
 
-    with _force_on_commit_to_run_immediately(), patch("therapy_sessions.tasks.transcribe_session.delay") as delay_mock:
+    with _force_on_commit_to_run_immediately(), patch("therapy_sessions.tasks.transcribe_session.delay") as delay_mock, \
+         patch("therapy_sessions.tasks.generate_waveform_peaks.delay"):
         resp = auth_client_a.post(
             url,
             data={"audio_file": make_audio_file(), "language_code": "en"},
@@ -86,7 +89,8 @@ def test_replace_audio_success_enqueues_task(auth_client_a, session_a_with_audio
 def test_replace_audio_without_existing_audio_returns_400(auth_client_a, session_a, make_audio_file):
     url = f"{BASE}/{session_a.id}/replace-audio/"
 
-    with _force_on_commit_to_run_immediately(), patch("therapy_sessions.tasks.transcribe_session.delay") as delay_mock:
+    with _force_on_commit_to_run_immediately(), patch("therapy_sessions.tasks.transcribe_session.delay") as delay_mock, \
+         patch("therapy_sessions.tasks.generate_waveform_peaks.delay"):
         resp = auth_client_a.post(
             url,
             data={"audio_file": make_audio_file(), "language_code": "en"},
@@ -0,0 +1,130 @@
+import pytest
+from unittest.mock import patch
+
+from therapy_sessions.models import SessionAudioUpload
+from therapy_sessions.services.s3.multipart import (
+    DEFAULT_PART_SIZE,
+    S3_MAX_PARTS,
+    S3_MIN_PART_SIZE,
+    part_count_for,
+    part_size_for,
+)
+
+API = "/api/v1"
+BASE = f"{API}/sessions"
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def s3(settings):
+    settings.USE_S3 = True
+    settings.AWS_STORAGE_BUCKET_NAME = "test-bucket"
+    with patch("therapy_sessions.views.sessions.s3_client") as view_factory, \
+         patch("therapy_sessions.services.s3.multipart.s3_client") as service_factory:
+        client = view_factory.return_value
+        service_factory.return_value = client
+        client.create_multipart_upload.return_value = {"UploadId": "up-1"}
+        client.generate_presigned_url.side_effect = (
+            lambda ClientMethod, Params, ExpiresIn: f"https://s3.test/{Params['Key']}?part={Params['PartNumber']}"
+        )
+        yield client
+
+
+@pytest.fixture
+def started(auth_client_a, session_a, s3):
+    res = auth_client_a.post(
+        f"{BASE}/{session_a.id}/audio/multipart/start/",
+        {"filename": "visit.webm", "content_type": "audio/webm", "size": 900 * MB},
+        format="json",
+    )
+    assert res.status_code == 201, res.data
+    return res.data
+
+
+class TestPartSize:
+    @pytest.mark.parametrize("size", [1, 900 * MB, 48 * 1024 * MB, 200 * 1024 * MB])
+    def test_stays_within_part_limit(self, size):
+        assert part_count_for(size) <= S3_MAX_PARTS
+        assert part_size_for(size) >= S3_MIN_PART_SIZE
+        assert part_size_for(size) % MB == 0
+
+    def test_uses_smallest_allowed_parts(self):
+        assert part_size_for(900 * MB) == S3_MIN_PART_SIZE
+        assert part_count_for(900 * MB) == 180
+        assert part_size_for(100 * 1024 * MB) == 11 * MB
+
+    def test_unknown_size_keeps_default(self):
+        assert part_size_for(None) == DEFAULT_PART_SIZE
+        assert part_count_for(None) is None
+
+
+@pytest.mark.django_db
+class TestMultipartBatch:
+    def test_start_returns_adaptive_part_size(self, started):
+        assert started["partSize"] == S3_MIN_PART_SIZE
+        assert started["partCount"] == 180
+
+    def test_presign_batch(self, auth_client_a, session_a, s3, started):
+        res = auth_client_a.post(
+            f"{BASE}/{session_a.id}/audio/multipart/presign-batch/",
+            {"uploadId": started["uploadId"], "firstPart": 171, "lastPart": 400},
+            format="json",
+        )
+
+        assert res.status_code == 200, res.data
+        # clamped to the declared part count
+        assert [p["partNumber"] for p in res.data["parts"]] == list(range(171, 181))
+        assert res.data["parts"][0]["url"].endswith("part=171")
+
+    def test_presign_batch_validation(self, auth_client_a, session_a, s3, started):
+        url = f"{BASE}/{session_a.id}/audio/multipart/presign-batch/"
+
+        too_many = {"uploadId": started["uploadId"], "firstPart": 1, "lastPart": 1000}
+        assert auth_client_a.post(url, too_many, format="json").status_code == 400
+
+        wrong_upload = {"uploadId": "other", "firstPart": 1, "lastPart": 2}
+        assert auth_client_a.post(url, wrong_upload, format="json").status_code == 404
+
+    def test_parts_listing_follows_pagination(self, auth_client_a, session_a, s3, started):
+        s3.list_parts.side_effect = [
+            {
+                "Parts": [{"PartNumber": n, "ETag": f'"e{n}"', "Size": S3_MIN_PART_SIZE} for n in range(1, 1001)],
+                "IsTruncated": True,
+                "NextPartNumberMarker": 1000,
+            },
+            {"Parts": [{"PartNumber": 1001, "ETag": '"e1001"', "Size": 10}], "IsTruncated": False},
+        ]
+
+        res = auth_client_a.get(
+            f"{BASE}/{session_a.id}/audio/multipart/parts/", {"uploadId": started["uploadId"]}
+        )
+
+        assert res.status_code == 200
+        assert len(res.data["parts"]) == 1001
+        assert res.data["parts"][-1] == {"PartNumber": 1001, "ETag": '"e1001"', "Size": 10}
+        assert s3.list_parts.call_args_list[1].kwargs["PartNumberMarker"] == 1000
+
+    def test_restart_hands_back_upload_in_progress(self, auth_client_a, session_a, s3, started):
+        res = auth_client_a.post(
+            f"{BASE}/{session_a.id}/audio/multipart/start/", {"filename": "visit.webm"}, format="json"
+        )
+
+        assert res.status_code == 200
+        assert res.data["uploadId"] == started["uploadId"]
+        assert res.data["partSize"] == started["partSize"]
+        s3.create_multipart_upload.assert_called_once()
+
+    def test_resumable_upload_is_not_a_multipart_upload(self, auth_client_a, session_a, s3):
+        SessionAudioUpload.objects.create(
+            session=session_a, upload_type="resumable", upload_id="abc123", s3_key="k", status="uploading"
+        )
+        url = f"{BASE}/{session_a.id}/audio/multipart"
+
+        batch = {"uploadId": "abc123", "firstPart": 1, "lastPart": 2}
+        assert auth_client_a.post(f"{url}/presign-batch/", batch, format="json").status_code == 404
+        assert auth_client_a.get(f"{url}/parts/", {"uploadId": "abc123"}).status_code == 404
+        complete = {"uploadId": "abc123", "parts": [{"PartNumber": 1, "ETag": '"e1"'}]}
+        assert auth_client_a.post(f"{url}/complete/", complete, format="json").status_code == 404
+        s3.list_parts.assert_not_called()
+        s3.complete_multipart_upload.assert_not_called()
@@ -0,0 +1,174 @@
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import transaction
+from django.utils import timezone
+
+from therapy_sessions.models import SessionAudio, SessionAudioUpload
+from therapy_sessions.services.storage.resumable import staging_path
+from therapy_sessions.tasks import expire_resumable_uploads
+
+API = "/api/v1"
+BASE = f"{API}/sessions"
+
+PAYLOAD = b"RIFF" + bytes(range(256)) * 40  # 10244 bytes
+
+
+@pytest.fixture(autouse=True)
+def local_media(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.RESUMABLE_UPLOAD_DIR = ""
+
+
+@pytest.fixture
+def started(auth_client_a, session_a):
+    res = auth_client_a.post(
+        f"{BASE}/{session_a.id}/audio/resumable/start/",
+        {"filename": "visit.wav", "content_type": "audio/wav", "total_size": len(PAYLOAD)},
+        format="json",
+    )
+    assert res.status_code == 201, res.data
+    return res.data
+
+
+def _chunk(client, session, upload_id, offset, data):
+    return client.generic(
+        "PATCH",
+        f"{BASE}/{session.id}/audio/resumable/chunk/",
+        data,
+        content_type="application/offset+octet-stream",
+        HTTP_UPLOAD_ID=upload_id,
+        HTTP_UPLOAD_OFFSET=str(offset),
+    )
+
+
+def _complete(client, session, upload_id):
+    with patch.object(transaction, "on_commit", side_effect=lambda cb: cb()), \
+         patch("therapy_sessions.tasks.transcribe_session.delay") as delay_mock, \
+         patch("therapy_sessions.tasks.generate_waveform_peaks.delay"):
+        res = client.post(
+            f"{BASE}/{session.id}/audio/resumable/complete/",
+            {"uploadId": upload_id, "original_filename": "visit.wav", "language_code": "ar"},
+            format="json",
+        )
+    return res, delay_mock
+
+
+@pytest.mark.django_db
+class TestResumableUpload:
+    def test_chunks_then_complete(self, auth_client_a, session_a, started):
+        upload_id = started["uploadId"]
+
+        res = _chunk(auth_client_a, session_a, upload_id, 0, PAYLOAD[:4000])
+        assert res.status_code == 200
+        assert res["Upload-Offset"] == "4000"
+        assert _chunk(auth_client_a, session_a, upload_id, 4000, PAYLOAD[4000:]).status_code == 200
+
+        res, delay_mock = _complete(auth_client_a, session_a, upload_id)
+
+        assert res.status_code == 201, res.data
+        audio = SessionAudio.objects.get(session=session_a)
+        with audio.audio_file.open("rb") as fh:
+            assert fh.read() == PAYLOAD
+        upload = SessionAudioUpload.objects.get(session=session_a)
+        assert upload.status == "completed"
+        assert not staging_path(upload).exists()
+        delay_mock.assert_called_once_with(session_a.id)
+
+    def test_wrong_offset_reports_current_offset(self, auth_client_a, session_a, started):
+        upload_id = started["uploadId"]
+        _chunk(auth_client_a, session_a, upload_id, 0, PAYLOAD[:1000])
+
+        # a retried chunk that already landed
+        res = _chunk(auth_client_a, session_a, upload_id, 0, PAYLOAD[:1000])
+
+        assert res.status_code == 409
+        assert res.data["offset"] == 1000
+
+    def test_resume_from_status_offset(self, auth_client_a, session_a, started):
+        upload_id = started["uploadId"]
+        _chunk(auth_client_a, session_a, upload_id, 0, PAYLOAD[:3000])
+
+        status_res = auth_client_a.get(f"{BASE}/{session_a.id}/audio/resumable/status/")
+        offset = status_res.data["offset"]
+        assert offset == 3000
+
+        _chunk(auth_client_a, session_a, upload_id, offset, PAYLOAD[offset:])
+        res, _ = _complete(auth_client_a, session_a, upload_id)
+
+        assert res.status_code == 201
+        with SessionAudio.objects.get(session=session_a).audio_file.open("rb") as fh:
+            assert fh.read() == PAYLOAD
+
+    def test_complete_before_all_bytes(self, auth_client_a, session_a, started):
+        _chunk(auth_client_a, session_a, started["uploadId"], 0, PAYLOAD[:10])
+
+        res, delay_mock = _complete(auth_client_a, session_a, started["uploadId"])
+
+        assert res.status_code == 409
+        assert res.data["offset"] == 10
+        delay_mock.assert_not_called()
+
+    def test_chunk_past_declared_size(self, auth_client_a, session_a, started):
+        res = _chunk(auth_client_a, session_a, started["uploadId"], 0, PAYLOAD + b"extra")
+        assert res.status_code == 400
+
+    def test_abort_and_expiry_drop_staging_file(self, auth_client_a, session_a, started):
+        upload = SessionAudioUpload.objects.get(session=session_a)
+        assert staging_path(upload).exists()
+
+        res = auth_client_a.post(f"{BASE}/{session_a.id}/audio/resumable/abort/")
+        assert res.status_code == 200
+        assert not staging_path(upload).exists()
+
+        started = auth_client_a.post(
+            f"{BASE}/{session_a.id}/audio/resumable/start/",
+            {"filename": "visit.wav", "content_type": "audio/wav", "total_size": len(PAYLOAD)},
+            format="json",
+        ).data
+        upload = SessionAudioUpload.objects.get(session=session_a)
+        SessionAudioUpload.objects.filter(pk=upload.pk).update(
+            updated_at=timezone.now() - timedelta(days=2)
+        )
+
+        assert expire_resumable_uploads() == {"ok": True, "expired": 1}
+        upload.refresh_from_db()
+        assert upload.status == "expired"
+        assert not staging_path(upload).exists()
+
+
+@pytest.mark.django_db
+class TestOtherUploadPaths:
+    @pytest.fixture
+    def s3(self, settings):
+        settings.USE_S3 = True
+        settings.AWS_STORAGE_BUCKET_NAME = "test-bucket"
+        with patch("therapy_sessions.views.sessions.s3_client") as view_factory, \
+             patch("therapy_sessions.services.s3.direct_upload.s3_client") as direct_factory:
+            client = view_factory.return_value
+            direct_factory.return_value = client
+            client.create_multipart_upload.return_value = {"UploadId": "up-1"}
+            client.generate_presigned_post.return_value = {"url": "https://s3.test/", "fields": {}}
+            yield client
+
+    def test_multipart_abort_leaves_resumable_upload_alone(self, auth_client_a, session_a, started, s3):
+        upload = SessionAudioUpload.objects.get(session=session_a)
+
+        res = auth_client_a.post(f"{BASE}/{session_a.id}/audio/multipart/abort/")
+
+        assert res.status_code == 404
+        s3.abort_multipart_upload.assert_not_called()
+        assert staging_path(upload).exists()
+
+    @pytest.mark.parametrize("path, body", [
+        ("multipart/start", {"filename": "visit.webm", "content_type": "audio/webm"}),
+        ("direct/start", {"filename": "visit.webm", "content_type": "audio/webm", "size": 1024}),
+    ])
+    def test_starting_another_path_discards_staging(self, auth_client_a, session_a, started, s3, path, body):
+        upload = SessionAudioUpload.objects.get(session=session_a)
+
+        res = auth_client_a.post(f"{BASE}/{session_a.id}/audio/{path}/", body, format="json")
+
+        assert res.status_code == 201, res.data
+        assert not staging_path(upload).exists()
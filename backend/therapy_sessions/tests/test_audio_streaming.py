@@ -0,0 +1,93 @@
+import pytest
+
+from rest_framework.test import APIClient
+
+API = "/api/v1"
+BASE = f"{API}/sessions"
+
+AUDIO = bytes(range(256)) * 40  # 10240 bytes
+
+
+@pytest.fixture(autouse=True)
+def local_media(settings, tmp_path):
+    settings.USE_S3 = False
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.AUDIO_SENDFILE = ""
+
+
+@pytest.fixture
+def audio_bytes():
+    return AUDIO
+
+
+def _body(res):
+    return b"".join(res.streaming_content)
+
+
+@pytest.fixture
+def stream_url(auth_client_a, audio_a):
+    res = auth_client_a.get(f"{BASE}/{audio_a.session_id}/audio/play/")
+    assert res.status_code == 200
+    return res.data["url"]
+
+
+@pytest.mark.django_db
+class TestAudioStreaming:
+    def test_signed_url_serves_whole_file(self, stream_url):
+        res = APIClient().get(stream_url)
+
+        assert res.status_code == 200
+        assert res["Accept-Ranges"] == "bytes"
+        assert res["Content-Length"] == str(len(AUDIO))
+        assert _body(res) == AUDIO
+
+    @pytest.mark.parametrize("header, start, end", [
+        ("bytes=100-199", 100, 199),
+        ("bytes=10000-", 10000, 10239),
+        ("bytes=-40", 10200, 10239),
+        ("bytes=10200-99999", 10200, 10239),
+    ])
+    def test_range_requests(self, stream_url, header, start, end):
+        res = APIClient().get(stream_url, HTTP_RANGE=header)
+
+        assert res.status_code == 206
+        assert res["Content-Range"] == f"bytes {start}-{end}/{len(AUDIO)}"
+        assert res["Content-Length"] == str(end - start + 1)
+        assert _body(res) == AUDIO[start:end + 1]
+
+    def test_unsatisfiable_range(self, stream_url):
+        res = APIClient().get(stream_url, HTTP_RANGE="bytes=20000-")
+
+        assert res.status_code == 416
+        assert res["Content-Range"] == f"bytes */{len(AUDIO)}"
+
+    def test_if_range_mismatch_sends_full_file(self, stream_url):
+        etag = APIClient().get(stream_url)["ETag"]
+
+        same = APIClient().get(stream_url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE=etag)
+        stale = APIClient().get(stream_url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"')
+
+        assert same.status_code == 206
+        assert stale.status_code == 200
+        assert _body(stale) == AUDIO
+
+    def test_nginx_offload_sends_no_body(self, settings, stream_url, audio_a):
+        settings.AUDIO_SENDFILE = "nginx"
+
+        res = APIClient().get(stream_url, HTTP_RANGE="bytes=0-9")
+
+        assert res.status_code == 200
+        assert res["X-Accel-Redirect"] == f"/protected-media/{audio_a.audio_file.name}"
+        assert res.content == b""
+
+    def test_access_rules(self, auth_client_a, audio_a):
+        url = f"{BASE}/{audio_a.session_id}/audio/stream/"
+
+        assert auth_client_a.get(url).status_code == 200
+        assert APIClient().get(url).status_code == 401
+        assert APIClient().get(f"{url}?token=forged").status_code == 403
+
+    def test_other_therapist_gets_404(self, therapist_b, audio_a):
+        client = APIClient()
+        client.force_authenticate(user=therapist_b)
+        assert client.get(f"{BASE}/{audio_a.session_id}/audio/stream/").status_code == 404
@@ -0,0 +1,156 @@
+import os
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from therapy_sessions.models import SessionAudio, StorageTombstone, TherapySession
+from therapy_sessions.services.storage import restore_audio, tiering_candidates, tiering_report
+from therapy_sessions.services.storage.gc import collect_garbage
+from therapy_sessions.tasks import tier_cold_audio
+
+API = "/api/v1"
+BASE = f"{API}/sessions"
+
+
+@pytest.fixture(autouse=True)
+def local_media(settings, tmp_path):
+    settings.USE_S3 = False
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.AUDIO_COLD_AFTER_DAYS = 30
+    settings.AUDIO_COLD_PREFIX = "cold/"
+
+
+@pytest.fixture(autouse=True)
+def fake_encoder():
+    def encode(src, dst):
+        with open(dst, "wb") as fh:
+            fh.write(b"opus")
+    with patch("therapy_sessions.services.storage.tiering.encode_speech_opus", side_effect=encode) as mock:
+        yield mock
+
+
+def _make_old(session, audio, days=45):
+    past = timezone.now() - timedelta(days=days)
+    TherapySession.objects.filter(pk=session.pk).update(status="completed", updated_at=past)
+    SessionAudio.objects.filter(pk=audio.pk).update(updated_at=past)
+
+
+@pytest.fixture
+def audio_a(audio_a, session_a):
+    _make_old(session_a, audio_a)
+    return audio_a
+
+
+@pytest.mark.django_db
+class TestColdTiering:
+    def test_only_old_completed_sessions_are_candidates(self, session_a, audio_a):
+        assert list(tiering_candidates()) == [audio_a]
+
+        TherapySession.objects.filter(pk=session_a.pk).update(updated_at=timezone.now())
+        assert list(tiering_candidates()) == []
+
+    def test_tiering_swaps_in_opus_and_archives_original(self, session_a, audio_a):
+        name = audio_a.audio_file.name
+
+        assert tier_cold_audio() == {"ok": True, "tiered": 1, "failed": 0, "bytes_saved": 996}
+
+        audio_a.refresh_from_db()
+        assert audio_a.storage_tier == "cold"
+        assert audio_a.audio_file.name.endswith(".opus")
+        assert audio_a.original_key == f"cold/{name}"
+        assert (audio_a.original_size, audio_a.stored_size) == (1000, 4)
+        assert default_storage.exists(audio_a.original_key)
+
+        # the hot original goes through the GC; the archived copy is referenced
+        assert StorageTombstone.objects.filter(key=name, reason="tiered").exists()
+        collect_garbage()
+        assert not default_storage.exists(name)
+        assert default_storage.exists(audio_a.original_key)
+
+        assert list(tiering_candidates()) == []
+
+    def test_already_small_audio_is_left_alone(self, session_a, audio_a, fake_encoder):
+        fake_encoder.side_effect = lambda src, dst: open(dst, "wb").write(b"y" * 2000)
+
+        assert tier_cold_audio()["tiered"] == 0
+
+        audio_a.refresh_from_db()
+        assert audio_a.storage_tier == "hot"
+        assert list(tiering_candidates()) == []
+        assert not any(name.endswith(".opus") for name in os.listdir(os.path.dirname(audio_a.audio_file.path)))
+
+    def test_restore_brings_original_back(self, session_a, audio_a):
+        name = audio_a.audio_file.name
+        tier_cold_audio()
+        collect_garbage()
+        audio_a.refresh_from_db()
+        opus_name, archived = audio_a.audio_file.name, audio_a.original_key
+
+        assert restore_audio(audio_a) == "restored"
+
+        audio_a.refresh_from_db()
+        assert audio_a.storage_tier == "hot"
+        assert audio_a.audio_file.name != name
+        assert os.path.dirname(audio_a.audio_file.name) == os.path.dirname(name)
+        assert audio_a.audio_file.read() == b"x" * 1000
+
+        collect_garbage()
+        assert not default_storage.exists(opus_name)
+        assert not default_storage.exists(archived)
+        # recently restored audio stays hot for another period
+        assert list(tiering_candidates()) == []
+
+    def test_restore_survives_a_gc_pass_that_checked_references_first(self, session_a, audio_a):
+        tier_cold_audio()  # the pre-tiering name is tombstoned but not collected yet
+        audio_a.refresh_from_db()
+
+        assert restore_audio(audio_a) == "restored"
+
+        # a collector that read references before the restore committed sees none
+        with patch("therapy_sessions.services.storage.gc.referenced_keys", return_value=set()):
+            collect_garbage()
+
+        audio_a.refresh_from_db()
+        assert audio_a.audio_file.read() == b"x" * 1000
+
+    def test_deleting_cold_audio_tombstones_archive(self, session_a, audio_a):
+        tier_cold_audio()
+        audio_a.refresh_from_db()
+
+        audio_a.delete()
+
+        keys = set(StorageTombstone.objects.values_list("key", flat=True))
+        assert {audio_a.audio_file.name, audio_a.original_key} <= keys
+
+    def test_restore_endpoint(self, auth_client_a, session_a, audio_a):
+        url = f"{BASE}/{session_a.id}/audio/restore/"
+        assert auth_client_a.post(url).status_code == 200
+
+        tier_cold_audio()
+        with patch("therapy_sessions.views.sessions.restore_session_audio.delay") as delay_mock:
+            res = auth_client_a.post(url)
+
+        assert res.status_code == 202
+        delay_mock.assert_called_once_with(session_a.id)
+        play = auth_client_a.get(f"{BASE}/{session_a.id}/audio/play/")
+        assert play.data["tier"] == "cold"
+
+    def test_report_is_staff_only(self, auth_client_a, session_a, audio_a):
+        tier_cold_audio()
+        url = f"{API}/dashboard/storage-tiering/"
+        assert auth_client_a.get(url).status_code == 403
+
+        staff = get_user_model().objects.create_user(email="ops@example.com", password="pass12345", is_staff=True)
+        client = APIClient()
+        client.force_authenticate(staff)
+        res = client.get(url)
+
+        assert res.status_code == 200
+        assert res.data == tiering_report()
+        assert res.data["cold_count"] == 1
+        assert res.data["bytes_saved"] == 996
@@ -0,0 +1,98 @@
+import pytest
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+
+from core.utils import normalize_arabic
+from therapy_sessions.models import SessionAudio
+from therapy_sessions.services.screening import screen_transcript
+from therapy_sessions.tasks import transcribe_session
+
+
+def test_normalize_strips_diacritics_tatweel_and_alef_variants():
+    assert normalize_arabic("أُرِيـــدُ إنْ آمَن") == "اريد ان امن"
+    assert normalize_arabic("  Kill   Myself ") == "kill myself"
+
+
+@pytest.mark.parametrize("text", [
+    "أنا عايـــز أمُوت ومش قادر",
+    "فكرت في الانتحار الأسبوع اللي فات",
+    "بقالي فترة بجرح نفسي",
+    "Sometimes I feel I'd be better off dead.",
+    "She mentioned SUICIDAL thoughts",
+])
+def test_screen_flags_risk_content(text):
+    result = screen_transcript(text)
+    assert result.is_urgent is True
+    assert result.matches
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "الجلسة كانت كويسة والمريض حاسس بتحسن",
+    "Patient reports feeling anxious about work deadlines.",
+])
+def test_screen_ignores_routine_content(text):
+    result = screen_transcript(text)
+    assert result.is_urgent is False
+    assert result.matches == []
+
+
+def test_screen_medium_terms_do_not_mark_urgent():
+    result = screen_transcript("حاسس إن مفيش أمل")
+    assert result.is_urgent is False
+    assert result.matches[0]["category"] == "hopelessness"
+
+
+@pytest.fixture
+def screened_session(db, therapist_a, make_session, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    session = make_session(therapist_a, status="transcribing")
+    SessionAudio.objects.create(
+        session=session,
+        audio_file=SimpleUploadedFile("test.wav", b"RIFF....WAVEfmt ", content_type="audio/wav"),
+        original_filename="test.wav",
+        language_code="ar",
+    )
+    return session
+
+
+def _transcription(text):
+    return {
+        "raw_text": text,
+        "cleaned_text": text,
+        "language": "ar",
+        "word_count": len(text.split()),
+        "model_name": "test",
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("text, urgent", [
+    ("مش عايز أعيش خلاص", True),
+    ("الأسبوع كان هادي", False),
+])
+def test_transcribe_routes_report_by_screening(screened_session, settings, text, urgent):
+    with patch.object(transaction, "on_commit", side_effect=lambda cb: cb()), \
+         patch("therapy_sessions.tasks.WhisperTranscriptionService") as service_cls, \
+         patch("therapy_sessions.tasks.generate_session_report.apply_async") as urgent_mock, \
+         patch("therapy_sessions.tasks.generate_session_report.delay") as delay_mock:
+        service_cls.return_value.transcribe.return_value = _transcription(text)
+        result = transcribe_session(screened_session.id)
+
+    assert result["ok"] is True
+    assert result["urgent"] is urgent
+
+    screened_session.refresh_from_db()
+    assert screened_session.provisional_risk_flag is urgent
+    assert screened_session.risk_screened_at is not None
+
+    if urgent:
+        urgent_mock.assert_called_once_with(
+            args=[screened_session.id], queue=settings.URGENT_REPORT_QUEUE
+        )
+        delay_mock.assert_not_called()
+    else:
+        delay_mock.assert_called_once_with(screened_session.id)
+        urgent_mock.assert_not_called()
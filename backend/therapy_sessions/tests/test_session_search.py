@@ -0,0 +1,75 @@
+import pytest
+
+from therapy_sessions.models import SessionTranscript, SessionReport
+
+API = "/api/v1"
+SEARCH_URL = f"{API}/sessions/search/"
+
+
+@pytest.mark.django_db
+class TestSessionSearch:
+    def test_matches_transcript_with_arabic_normalization(
+        self, auth_client_a, therapist_a, make_session, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            session = make_session(therapist_a)
+            SessionTranscript.objects.create(
+                session=session,
+                cleaned_transcript="المريضة تحدثت عن القَلَـــق الشديد في العمل",
+            )
+
+        # no diacritics / tatweel in the query
+        res = auth_client_a.get(SEARCH_URL, {"q": "القلق"})
+        assert res.status_code == 200, res.data
+        assert [r["id"] for r in res.data["results"]] == [session.id]
+        assert "<mark>" in res.data["results"][0]["snippet"]
+
+    def test_snippet_keeps_the_original_spelling(
+        self, auth_client_a, therapist_a, make_session, django_capture_on_commit_callbacks
+    ):
+        notes = "شكوى من القَلَـــق والأرق، وفي المدرسة أيضاً"
+        with django_capture_on_commit_callbacks(execute=True):
+            make_session(therapist_a, notes_before=notes)
+
+        snippet = auth_client_a.get(SEARCH_URL, {"q": "القلق المدرسه"}).data["results"][0]["snippet"]
+
+        assert snippet.replace("<mark>", "").replace("</mark>", "") == notes
+        assert "<mark>القَلَـــق</mark>" in snippet
+        assert "<mark>المدرسة</mark>" in snippet
+
+    def test_alef_variants_match_notes_and_report(
+        self, auth_client_a, therapist_a, make_session, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            session = make_session(therapist_a, notes_before="متابعة أعراض الإكتئاب")
+            SessionReport.objects.create(session=session, therapist_notes="insomnia follow-up")
+
+        assert auth_client_a.get(SEARCH_URL, {"q": "الاكتئاب"}).data["count"] == 1
+        assert auth_client_a.get(SEARCH_URL, {"q": "Insomnia"}).data["count"] == 1
+
+    def test_vector_follows_updates(
+        self, auth_client_a, therapist_a, make_session, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            session = make_session(therapist_a, notes_after="sleep")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            session.notes_after = "panic attacks"
+            session.save(update_fields=["notes_after", "updated_at"])
+
+        assert auth_client_a.get(SEARCH_URL, {"q": "sleep"}).data["count"] == 0
+        assert auth_client_a.get(SEARCH_URL, {"q": "panic"}).data["count"] == 1
+
+    def test_results_scoped_to_therapist(
+        self, auth_client_a, therapist_b, make_session, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            make_session(therapist_b, notes_before="grief")
+
+        res = auth_client_a.get(SEARCH_URL, {"q": "grief"})
+        assert res.status_code == 200
+        assert res.data["count"] == 0
+
+    def test_query_is_required(self, auth_client_a):
+        res = auth_client_a.get(SEARCH_URL)
+        assert res.status_code == 400
@@ -0,0 +1,114 @@
+import os
+import time
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from therapy_sessions.models import StorageTombstone
+from therapy_sessions.services.storage.gc import collect_garbage, sweep_orphans
+
+API = "/api/v1"
+BASE = f"{API}/sessions"
+
+
+@pytest.fixture(autouse=True)
+def local_media(settings, tmp_path):
+    settings.USE_S3 = False
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+@pytest.mark.django_db
+class TestTombstones:
+    def test_session_delete_defers_storage_delete(self, auth_client_a, session_a, audio_a):
+        name = audio_a.audio_file.name
+
+        res = auth_client_a.delete(f"{BASE}/{session_a.id}/")
+
+        assert res.status_code == 204
+        assert default_storage.exists(name)
+        assert StorageTombstone.objects.filter(key=name).exists()
+
+        assert collect_garbage() == {"deleted": 1, "failed": 0}
+        assert not default_storage.exists(name)
+        assert not StorageTombstone.objects.exists()
+
+    def test_patient_delete_cascades_to_tombstones(self, session_a, audio_a):
+        session_a.patient.delete()
+        assert StorageTombstone.objects.filter(key=audio_a.audio_file.name).exists()
+
+    def test_referenced_key_is_never_deleted(self, audio_a):
+        StorageTombstone.objects.create(key=audio_a.audio_file.name)
+
+        assert collect_garbage() == {"deleted": 0, "failed": 0}
+        assert default_storage.exists(audio_a.audio_file.name)
+        assert not StorageTombstone.objects.exists()
+
+
+@pytest.mark.django_db
+class TestS3Collector:
+    @pytest.fixture
+    def s3(self, settings):
+        settings.USE_S3 = True
+        settings.AWS_STORAGE_BUCKET_NAME = "test-bucket"
+        with patch("therapy_sessions.services.storage.gc.s3_client") as factory:
+            yield factory.return_value
+
+    def test_batches_of_1000_with_backoff_on_errors(self, s3):
+        StorageTombstone.objects.bulk_create(
+            StorageTombstone(key=f"recordings/patient_1/session_{i}/audio.webm") for i in range(1500)
+        )
+        bad_key = "recordings/patient_1/session_7/audio.webm"
+        s3.delete_objects.side_effect = lambda Bucket, Delete: {
+            "Errors": [{"Key": o["Key"], "Code": "AccessDenied", "Message": "no"}
+                       for o in Delete["Objects"] if o["Key"] == bad_key]
+        }
+
+        assert collect_garbage() == {"deleted": 1499, "failed": 1}
+
+        sizes = [len(c.kwargs["Delete"]["Objects"]) for c in s3.delete_objects.call_args_list]
+        assert sorted(sizes) == [500, 1000]
+
+        left = StorageTombstone.objects.get()
+        assert left.key == bad_key
+        assert left.attempts == 1
+        assert left.next_attempt_at > timezone.now()
+        assert "AccessDenied" in left.last_error
+
+        # not due yet
+        assert collect_garbage() == {"deleted": 0, "failed": 0}
+
+    def test_batch_is_leased_before_storage_deletes(self, s3):
+        StorageTombstone.objects.create(key="recordings/patient_1/session_1/audio.webm")
+        due = []
+
+        def delete_objects(Bucket, Delete):
+            due.append(StorageTombstone.objects.filter(next_attempt_at__lte=timezone.now()).count())
+            return {}
+
+        s3.delete_objects.side_effect = delete_objects
+
+        assert collect_garbage() == {"deleted": 1, "failed": 0}
+        assert due == [0]  # claimed and committed: another worker skips it while S3 is called
+        assert not StorageTombstone.objects.exists()
+
+
+@pytest.mark.django_db
+def test_sweep_tombstones_only_old_unreferenced_objects(audio_a):
+    session_dir = os.path.dirname(default_storage.path(audio_a.audio_file.name))
+    orphan = os.path.join(session_dir, "audio-old.webm")
+    fresh = os.path.join(session_dir, "audio-fresh.webm")
+    for path in (orphan, fresh):
+        with open(path, "wb") as fh:
+            fh.write(b"x")
+
+    two_days_ago = time.time() - timedelta(days=2).total_seconds()
+    os.utime(orphan, (two_days_ago, two_days_ago))
+    os.utime(default_storage.path(audio_a.audio_file.name), (two_days_ago, two_days_ago))
+
+    assert sweep_orphans() == 1
+    assert list(StorageTombstone.objects.values_list("key", "reason")) == [
+        (os.path.relpath(orphan, default_storage.location).replace(os.sep, "/"), "orphan"),
+    ]
@@ -0,0 +1,83 @@
+import io
+import pytest
+
+import numpy as np
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from therapy_sessions.services.waveform import (
+    BASE_SAMPLES_PER_PEAK,
+    PEAKS_SAMPLE_RATE,
+    ZOOM_FACTOR,
+    decode_peaks_header,
+    encode_peaks,
+    reduce_pcm_stream,
+)
+
+API = "/api/v1"
+BASE = f"{API}/sessions"
+
+
+def _sine_pcm(seconds):
+    t = np.arange(int(seconds * PEAKS_SAMPLE_RATE)) / PEAKS_SAMPLE_RATE
+    return (np.sin(2 * np.pi * 220 * t) * 20000).astype("<i2")
+
+
+class TestPeaks:
+    def test_levels_and_values(self):
+        pcm = _sine_pcm(120)
+        pcm[1000] = 32767  # a click must survive every zoom level
+
+        levels, total = reduce_pcm_stream(io.BytesIO(pcm.tobytes()))
+
+        assert total == len(pcm)
+        assert [lvl.samples_per_peak for lvl in levels] == [
+            BASE_SAMPLES_PER_PEAK * ZOOM_FACTOR ** i for i in range(len(levels))
+        ]
+        assert len(levels[0].mins) == -(-len(pcm) // BASE_SAMPLES_PER_PEAK)
+        for level in levels:
+            assert level.maxs.max() == 32767
+            assert level.mins.min() <= -19990
+
+    def test_partial_trailing_block(self):
+        pcm = np.array([5, -7, 3], dtype="<i2")
+
+        levels, total = reduce_pcm_stream(io.BytesIO(pcm.tobytes()))
+
+        assert total == 3
+        assert (levels[0].mins.tolist(), levels[0].maxs.tolist()) == ([-7], [5])
+
+    def test_int8_blob_is_compact(self):
+        levels, total = reduce_pcm_stream(io.BytesIO(_sine_pcm(600).tobytes()))
+
+        blob = encode_peaks(levels, total, bits=8)
+        header = decode_peaks_header(blob)
+
+        assert header["bits"] == 8
+        assert header["total_samples"] == total
+        assert [lvl["peaks"] for lvl in header["levels"]] == [len(lvl.mins) for lvl in levels]
+        # ten minutes of audio in well under 100 KB
+        assert len(blob) < 100 * 1024
+
+
+@pytest.mark.django_db
+class TestPeaksEndpoint:
+    def test_not_ready(self, auth_client_a, audio_a):
+        assert auth_client_a.get(f"{BASE}/{audio_a.session_id}/audio/peaks/").status_code == 404
+
+    def test_serves_blob_with_etag(self, auth_client_a, audio_a):
+        levels, total = reduce_pcm_stream(io.BytesIO(_sine_pcm(5).tobytes()))
+        blob = encode_peaks(levels, total)
+        audio_a.peaks_file = default_storage.save("recordings/audio.peaks", ContentFile(blob))
+        audio_a.save(update_fields=["peaks_file"])
+        url = f"{BASE}/{audio_a.session_id}/audio/peaks/"
+
+        res = auth_client_a.get(url)
+
+        assert res.status_code == 200
+        assert res["Content-Type"] == "application/octet-stream"
+        assert res.content == blob
+
+        again = auth_client_a.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+        assert again.status_code == 304
+        assert again.content == b""
@@ -0,0 +1,37 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from therapy_sessions.models import SessionAudio
+from therapy_sessions.services.streaming import read_stream_token, stream_audio_response
+
+
+class SessionAudioStreamView(APIView):
+    """
+    Byte-range audio for local storage. Accepts either the owner's JWT or the
+    signed `token` from audio/play, since <audio> elements cannot send headers.
+    """
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, pk):
+        audio_qs = SessionAudio.objects.filter(session_id=pk, session__patient__is_active=True)
+
+        token = request.query_params.get("token")
+        if token:
+            payload = read_stream_token(token)
+            if not payload or payload.get("s") != pk:
+                return Response({"detail": "Invalid or expired audio link."}, status=status.HTTP_403_FORBIDDEN)
+            audio = audio_qs.filter(pk=payload.get("a")).first()
+        elif request.user and request.user.is_authenticated:
+            audio = audio_qs.filter(session__therapist=request.user).first()
+        else:
+            return Response(
+                {"detail": "Authentication credentials were not provided."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        if not audio or not audio.audio_file:
+            return Response({"detail": "No audio available for this session."}, status=status.HTTP_404_NOT_FOUND)
+
+        return stream_audio_response(request, audio)
@@ -1,35 +1,98 @@
+import uuid
+
 from django.db import transaction
 from django.conf import settings
 from django.utils import timezone
+from opentelemetry.trace import SpanKind
 
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 
+from core.instrumentation import PerformanceViewMixin
+from core.tracing import on_commit, span, traced_atomic, traced_view
 from therapy_sessions.models import TherapySession, SessionAudio, SessionAudioUpload
-from therapy_sessions.tasks import transcribe_session
+from therapy_sessions.tasks import generate_waveform_peaks, restore_session_audio, transcribe_session
 
 from therapy_sessions.serializers.session import (
     TherapySessionSerializer,
     SessionDetailSerializer,
 )
-from therapy_sessions.serializers.audio import SessionAudioUploadSerializer
+from therapy_sessions.serializers.audio import (
+    DirectUploadConfirmSerializer,
+    DirectUploadStartSerializer,
+    ResumableUploadCompleteSerializer,
+    ResumableUploadStartSerializer,
+    SessionAudioUploadSerializer,
+)
 
-from therapy_sessions.serializers.audio_multipart import ( MultipartPresignSerializer, MultipartCompleteSerializer)
+from therapy_sessions.serializers.audio_multipart import (
+    MultipartCompleteSerializer,
+    MultipartPresignBatchSerializer,
+    MultipartPresignSerializer,
+    MultipartStartSerializer,
+)
 from therapy_sessions.services.s3.s3_client import s3_client, s3_bucket
 from therapy_sessions.services.s3.storage_key import session_audio_key 
-from django.http import FileResponse, Http404
+from therapy_sessions.services.s3.multipart import (
+    list_uploaded_parts,
+    part_count_for,
+    part_size_for,
+    presign_upload_parts,
+)
+from therapy_sessions.services.s3.direct_upload import (
+    PRESIGNED_POST_EXPIRES,
+    head_audio_object,
+    presign_audio_post,
+)
+from therapy_sessions.services.storage import (
+    RESUMABLE_CHUNK_SIZE,
+    RESUMABLE_MAX_CHUNK_BYTES,
+    ChunkInProgress,
+    OffsetMismatch,
+    UploadOverflow,
+    append_chunk,
+    discard_replaced_upload,
+    discard_staging,
+    finalize_upload,
+    start_upload,
+    tombstone,
+)
+from therapy_sessions.services.audio_limits import (
+    MAX_AUDIO_UPLOAD_BYTES,
+    MAX_AUDIO_UPLOAD_MB,
+    base_content_type,
+)
+from django.http import FileResponse, Http404, HttpResponse
 from therapy_sessions.services.reporting.pdf import generate_report_pdf
 from therapy_sessions.serializers.report import (
     SessionReportSerializer,
     SessionReportUpdateSerializer,
 )
+from therapy_sessions.serializers.search import (
+    SessionSearchQuerySerializer,
+    SessionSearchResultSerializer,
+)
+from therapy_sessions.services.search import search_sessions
+from therapy_sessions.services.timeline import mark_stage
+from therapy_sessions.services.streaming import audio_playback_url
+
+
 
 
+def _start_transcription(locked):
+    """New audio is in place for a row-locked session: reset errors and queue transcription."""
+    locked.status = "transcribing"
+    locked.last_error_stage = ""
+    locked.last_error_message = ""
+    locked.save(update_fields=["status", "last_error_stage", "last_error_message", "updated_at"])
+    mark_stage(locked.id, "uploaded")
 
-MULTIPART_PART_SIZE = 10 * 1024 * 1024  # 10 MB
-class TherapySessionViewSet(viewsets.ModelViewSet):
+    on_commit(lambda: transcribe_session.delay(locked.id))
+    on_commit(lambda: generate_waveform_peaks.delay(locked.id))
+
+class TherapySessionViewSet(PerformanceViewMixin, viewsets.ModelViewSet):
     serializer_class = TherapySessionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -44,7 +107,7 @@ class TherapySessionViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         qs = (
             TherapySession.objects.select_related("patient", "audio", "transcript", "report")
-            .filter(therapist=self.request.user)
+            .filter(therapist=self.request.user, patient__is_active=True)
         )
 
         patient_id = self.request.query_params.get("patient_id")
@@ -59,7 +122,21 @@ class TherapySessionViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("You can only create sessions for your own patients.")
         serializer.save(therapist=self.request.user)
 
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        ser = SessionSearchQuerySerializer(data=request.query_params)
+        ser.is_valid(raise_exception=True)
+
+        results = search_sessions(
+            request.user,
+            ser.validated_data["q"],
+            limit=ser.validated_data["limit"],
+        )
+        data = SessionSearchResultSerializer(results, many=True).data
+        return Response({"count": len(data), "results": data})
+
     @action(detail=True, methods=["post"], url_path="upload-audio")
+    @traced_view("session.upload_audio")
     def upload_audio(self, request, pk=None):
         session = self.get_object()
 
@@ -69,7 +146,7 @@ class TherapySessionViewSet(viewsets.ModelViewSet):
         uploaded_file = ser.validated_data["audio_file"]
         language_code = ser.validated_data.get("language_code", "") or ""
 
-        with transaction.atomic():
+        with traced_atomic("upload_audio"):
             locked = TherapySession.objects.select_for_update().get(pk=session.pk)
 
             if SessionAudio.objects.filter(session=locked).exists():
@@ -78,19 +155,15 @@ class TherapySessionViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_409_CONFLICT,
                 )
 
-            audio = SessionAudio.objects.create(
-                session=locked,
-                audio_file=uploaded_file,
-                original_filename=(getattr(uploaded_file, "name", "") or "")[:255],
-                language_code=language_code,
-            )
-
-            locked.status = "transcribing"
-            locked.last_error_stage = ""
-            locked.last_error_message = ""
-            locked.save(update_fields=["status", "last_error_stage", "last_error_message", "updated_at"])
+            with span("storage.save", **{"storage.bytes": getattr(uploaded_file, "size", None)}):
+                audio = SessionAudio.objects.create(
+                    session=locked,
+                    audio_file=uploaded_file,
+                    original_filename=(getattr(uploaded_file, "name", "") or "")[:255],
+                    language_code=language_code,
+                )
 
-            transaction.on_commit(lambda: transcribe_session.delay(locked.id))
+            _start_transcription(locked)
 
         return Response(
             {"detail": "Upload successful. Transcription started.", "audio_id": audio.id},
@@ -107,19 +180,51 @@ class TherapySessionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        s3 = s3_client()
+        # presigned S3 URL, or a signed link to the range-capable stream endpoint;
+        # cold audio plays from its Opus copy, the original stays archived
+        return Response({"url": audio_playback_url(request, audio), "tier": audio.storage_tier})
 
-        url = s3.generate_presigned_url(
-            ClientMethod="get_object",
-            Params={
-                "Bucket": s3_bucket(),
-                "Key": str(audio.audio_file),
-            },
-            ExpiresIn=60 * 60,  # 1 hour
-        )
 
-        return Response({"url": url})
+    @action(detail=True, methods=["get"], url_path="audio/peaks")
+    def audio_peaks(self, request, pk=None):
+        session = self.get_object()
 
+        audio = getattr(session, "audio", None)
+        if not audio or not audio.peaks_file:
+            return Response(
+                {"detail": "Waveform not ready for this session."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        # peaks never change for a stored file; a replaced recording gets a new name
+        etag = f'"{audio.peaks_file.name.rsplit("/", 1)[-1]}-{audio.id}"'
+        if request.headers.get("If-None-Match") == etag:
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            with audio.peaks_file.open("rb") as fh:
+                response = HttpResponse(fh.read(), content_type="application/octet-stream")
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, max-age=86400"
+        return response
+
+    @action(detail=True, methods=["post"], url_path="audio/restore")
+    def restore_audio(self, request, pk=None):
+        session = self.get_object()
+
+        audio = getattr(session, "audio", None)
+        if not audio or not audio.audio_file:
+            return Response(
+                {"detail": "No audio available for this session."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        if audio.storage_tier != "cold":
+            return Response({"detail": "Original audio is already available."}, status=status.HTTP_200_OK)
+
+        restore_session_audio.delay(session.id)
+        return Response(
+            {"detail": "Restoring original audio. This can take a few hours."},
+            status=status.HTTP_202_ACCEPTED,
+        )
 
     @action(detail=True, methods=["post"], url_path="replace-audio")
     def replace_audio(self, request, pk=None):
@@ -141,12 +246,7 @@ class TherapySessionViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            try:
-                if old_audio.audio_file:
-                    old_audio.audio_file.delete(save=False)
-            except Exception:
-                pass
-
+            # the stored object is tombstoned and removed by the storage GC
             old_audio.delete()
 
             new_audio = SessionAudio.objects.create(
@@ -156,12 +256,7 @@ class TherapySessionViewSet(viewsets.ModelViewSet):
                 language_code=language_code,
             )
 
-            locked.status = "transcribing"
-            locked.last_error_stage = ""
-            locked.last_error_message = ""
-            locked.save(update_fields=["status", "last_error_stage", "last_error_message", "updated_at"])
-
-            transaction.on_commit(lambda: transcribe_session.delay(locked.id))
+            _start_transcription(locked)
 
         return Response(
             {"detail": "Audio replaced. Transcription restarted.", "audio_id": new_audio.id},
@@ -210,6 +305,271 @@ class TherapySessionViewSet(viewsets.ModelViewSet):
 
 
 
+# --------------------- AWS S3 DIRECT (PRESIGNED POST) UPLOADS ---------------------
+
+    @action(detail=True, methods=["post"], url_path="audio/direct/start")
+    def audio_direct_start(self, request, pk=None):
+        session = self.get_object()
+
+        if not getattr(settings, "USE_S3", False):
+            return Response({"detail": "S3 upload not enabled (USE_S3=1)."}, status=400)
+
+        ser = DirectUploadStartSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        data = ser.validated_data
+
+        with transaction.atomic():
+            locked = TherapySession.objects.select_for_update().get(pk=session.pk)
+
+            if not data["replace"] and SessionAudio.objects.filter(session=locked).exists():
+                return Response(
+                    {"detail": "Audio already exists for this session, start with replace=true."},
+                    status=409,
+                )
+
+            # unique per attempt so a replacement never overwrites the current audio
+            key = session_audio_key(locked, data["filename"], suffix=uuid.uuid4().hex[:12])
+            content_type = base_content_type(data["content_type"])
+
+            discard_replaced_upload(locked)
+            SessionAudioUpload.objects.update_or_create(
+                session=locked,
+                defaults={
+                    "upload_type": "presigned_post",
+                    "s3_key": key,
+                    "upload_id": "",
+                    "content_type": content_type,
+                    "status": "uploading",
+                },
+            )
+
+        post = presign_audio_post(key, content_type)
+        return Response(
+            {
+                "url": post["url"],
+                "fields": post["fields"],
+                "key": key,
+                "maxBytes": MAX_AUDIO_UPLOAD_BYTES,
+                "expiresIn": PRESIGNED_POST_EXPIRES,
+            },
+            status=201,
+        )
+
+    @action(detail=True, methods=["post"], url_path="audio/direct/confirm")
+    def audio_direct_confirm(self, request, pk=None):
+        session = self.get_object()
+
+        if not getattr(settings, "USE_S3", False):
+            return Response({"detail": "S3 upload not enabled (USE_S3=1)."}, status=400)
+
+        ser = DirectUploadConfirmSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        data = ser.validated_data
+
+        with transaction.atomic():
+            locked = TherapySession.objects.select_for_update().get(pk=session.pk)
+
+            upload = getattr(locked, "audio_upload", None)
+            if (
+                not upload
+                or upload.upload_type != "presigned_post"
+                or upload.status != "uploading"
+                or upload.s3_key != data["key"]
+            ):
+                return Response({"detail": "No active direct upload for this session."}, status=404)
+
+            # trust what S3 stored, not what the client claimed
+            head = head_audio_object(upload.s3_key)
+            if head is None:
+                return Response({"detail": "File not found in storage yet."}, status=400)
+
+            problem = None
+            if not 0 < head["size"] <= MAX_AUDIO_UPLOAD_BYTES:
+                problem = f"Audio file size should not exceed {MAX_AUDIO_UPLOAD_MB} MB."
+            elif base_content_type(head["content_type"]) != upload.content_type:
+                problem = "Stored content type does not match the declared audio type."
+
+            if problem:
+                tombstone([upload.s3_key], reason="rejected")
+                upload.status = "failed"
+                upload.save(update_fields=["status", "updated_at"])
+                return Response({"detail": problem}, status=400)
+
+            old_audio = SessionAudio.objects.filter(session=locked).first()
+            if old_audio:
+                old_audio.delete()  # storage object goes through the GC tombstone
+
+            audio = SessionAudio.objects.create(
+                session=locked,
+                audio_file=upload.s3_key,
+                original_filename=(data.get("original_filename") or "")[:255],
+                language_code=data.get("language_code") or "",
+            )
+
+            upload.status = "completed"
+            upload.save(update_fields=["status", "updated_at"])
+
+            _start_transcription(locked)
+
+        return Response({"detail": "Upload confirmed. Transcription started.", "audio_id": audio.id}, status=201)
+
+# --------------------- RESUMABLE CHUNKED UPLOADS (ANY STORAGE) ---------------------
+# tus-like: PATCH raw bytes with Upload-Id / Upload-Offset headers; on a dropped
+# connection GET status for the persisted offset and continue from there.
+
+    def _active_resumable_upload(self, session, upload_id):
+        upload = SessionAudioUpload.objects.filter(
+            session=session, upload_type="resumable", status="uploading"
+        ).first()
+        if not upload or upload.upload_id != upload_id:
+            return None
+        return upload
+
+    @action(detail=True, methods=["post"], url_path="audio/resumable/start")
+    def audio_resumable_start(self, request, pk=None):
+        session = self.get_object()
+
+        ser = ResumableUploadStartSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        data = ser.validated_data
+
+        with transaction.atomic():
+            locked = TherapySession.objects.select_for_update().get(pk=session.pk)
+
+            if not data["replace"] and SessionAudio.objects.filter(session=locked).exists():
+                return Response(
+                    {"detail": "Audio already exists for this session, start with replace=true."},
+                    status=409,
+                )
+
+            upload = start_upload(
+                locked,
+                data["filename"],
+                base_content_type(data["content_type"]),
+                data["total_size"],
+            )
+
+        return Response(
+            {"uploadId": upload.upload_id, "offset": 0, "chunkSize": RESUMABLE_CHUNK_SIZE},
+            status=201,
+        )
+
+    @action(detail=True, methods=["patch"], url_path="audio/resumable/chunk")
+    def audio_resumable_chunk(self, request, pk=None):
+        session = self.get_object()
+
+        upload = self._active_resumable_upload(session, request.headers.get("Upload-Id"))
+        if not upload:
+            return Response({"detail": "No active resumable upload for this session."}, status=404)
+
+        try:
+            offset = int(request.headers.get("Upload-Offset", ""))
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            return Response({"detail": "Upload-Offset and Content-Length are required."}, status=400)
+        if not 0 < length <= RESUMABLE_MAX_CHUNK_BYTES:
+            return Response(
+                {"detail": f"Chunks must be 1..{RESUMABLE_MAX_CHUNK_BYTES} bytes."},
+                status=400,
+            )
+
+        # raw body is streamed to disk, never parsed or buffered by DRF
+        try:
+            new_offset = append_chunk(upload, offset, request.stream, length)
+        except OffsetMismatch as e:
+            return Response(
+                {"detail": str(e), "offset": e.offset},
+                status=409,
+                headers={"Upload-Offset": str(e.offset)},
+            )
+        except ChunkInProgress as e:
+            return Response({"detail": str(e)}, status=409)
+        except UploadOverflow as e:
+            return Response({"detail": str(e)}, status=400)
+
+        return Response(
+            {"offset": new_offset, "totalSize": upload.total_size},
+            status=200,
+            headers={"Upload-Offset": str(new_offset)},
+        )
+
+    @action(detail=True, methods=["get"], url_path="audio/resumable/status")
+    def audio_resumable_status(self, request, pk=None):
+        session = self.get_object()
+
+        upload = SessionAudioUpload.objects.filter(session=session, upload_type="resumable").first()
+        if not upload:
+            return Response({"detail": "No resumable upload for this session."}, status=404)
+
+        return Response(
+            {
+                "uploadId": upload.upload_id,
+                "status": upload.status,
+                "offset": upload.received_bytes,
+                "totalSize": upload.total_size,
+                "chunkSize": RESUMABLE_CHUNK_SIZE,
+            },
+            headers={"Upload-Offset": str(upload.received_bytes)},
+        )
+
+    @action(detail=True, methods=["post"], url_path="audio/resumable/complete")
+    def audio_resumable_complete(self, request, pk=None):
+        session = self.get_object()
+
+        ser = ResumableUploadCompleteSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        data = ser.validated_data
+
+        with transaction.atomic():
+            locked = TherapySession.objects.select_for_update().get(pk=session.pk)
+
+            upload = self._active_resumable_upload(locked, data["uploadId"])
+            if not upload:
+                return Response({"detail": "No active resumable upload for this session."}, status=404)
+
+            if upload.received_bytes != upload.total_size:
+                return Response(
+                    {"detail": "Upload is not complete yet.", "offset": upload.received_bytes},
+                    status=409,
+                )
+
+            old_audio = SessionAudio.objects.filter(session=locked).first()
+            if old_audio:
+                old_audio.delete()  # storage object goes through the GC tombstone
+
+            # rename of the staging file, no copy
+            name = finalize_upload(upload)
+
+            audio = SessionAudio.objects.create(
+                session=locked,
+                audio_file=name,
+                original_filename=(data.get("original_filename") or "")[:255],
+                language_code=data.get("language_code") or "",
+            )
+
+            upload.status = "completed"
+            upload.save(update_fields=["status", "updated_at"])
+
+            _start_transcription(locked)
+
+        return Response({"detail": "Upload completed. Transcription started.", "audio_id": audio.id}, status=201)
+
+    @action(detail=True, methods=["post"], url_path="audio/resumable/abort")
+    def audio_resumable_abort(self, request, pk=None):
+        session = self.get_object()
+
+        upload = SessionAudioUpload.objects.filter(
+            session=session, upload_type="resumable", status="uploading"
+        ).first()
+        if not upload:
+            return Response({"detail": "No active resumable upload."}, status=404)
+
+        discard_staging(upload)
+        upload.status = "aborted"
+        upload.save(update_fields=["status", "updated_at"])
+
+        return Response({"detail": "Resumable upload aborted."}, status=200)
+
 # --------------------- AWS S3 MULTIPART UPLOADS ---------------------
     
 
@@ -220,36 +580,124 @@ class TherapySessionViewSet(viewsets.ModelViewSet):
         if not getattr(settings, "USE_S3", False):
             return Response({"detail": "S3 upload not enabled (USE_S3=1)."}, status=400)
 
+        ser = MultipartStartSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        data = ser.validated_data
+
         with transaction.atomic():
             locked = TherapySession.objects.select_for_update().get(pk=session.pk)
 
             if SessionAudio.objects.filter(session=locked).exists():
                 return Response({"detail": "Audio already exists for this session."}, status=409)
 
-            # If an upload exists and still uploading, you can either reuse or abort+restart
+            # An upload still in progress is handed back so the client can resume it (see audio/multipart/parts)
             existing = getattr(locked, "audio_upload", None)
-            if existing and existing.status == "uploading":
+            if existing and existing.upload_type == "multipart" and existing.status == "uploading":
                 return Response(
-                    {"detail": "Multipart upload already started for this session.", "uploadId": existing.upload_id, "key": existing.s3_key, "partSize": MULTIPART_PART_SIZE},
+                    {
+                        "detail": "Multipart upload already started for this session.",
+                        "uploadId": existing.upload_id,
+                        "key": existing.s3_key,
+                        "partSize": part_size_for(existing.total_size),
+                        "partCount": part_count_for(existing.total_size),
+                    },
                     status=200,
                 )
 
-            key = session_audio_key(locked, request.data.get("filename", "audio.webm"))
+            # unique per upload: a tombstoned key from earlier audio must never be reused
+            key = session_audio_key(locked, data["filename"], suffix=uuid.uuid4().hex[:12])
+            total_size = data.get("size")
 
             s3 = s3_client()
             resp = s3.create_multipart_upload(
                 Bucket=s3_bucket(),
                 Key=key,
-                ContentType=request.data.get("content_type") or "audio/webm",
+                ContentType=data["content_type"],
             )
             upload_id = resp["UploadId"]
 
+            discard_replaced_upload(locked)
             SessionAudioUpload.objects.update_or_create(
                 session=locked,
-                defaults={"s3_key": key, "upload_id": upload_id, "status": "uploading"},
+                defaults={
+                    "upload_type": "multipart",
+                    "s3_key": key,
+                    "upload_id": upload_id,
+                    "total_size": total_size,
+                    "received_bytes": 0,
+                    "status": "uploading",
+                },
             )
 
-        return Response({"uploadId": upload_id, "key": key, "partSize": MULTIPART_PART_SIZE}, status=201)
+        return Response(
+            {
+                "uploadId": upload_id,
+                "key": key,
+                "partSize": part_size_for(total_size),
+                "partCount": part_count_for(total_size),
+            },
+            status=201,
+        )
+
+    def _active_multipart_upload(self, session, upload_id):
+        # a resumable upload shares the row but has no S3 multipart behind its upload_id
+        upload = getattr(session, "audio_upload", None)
+        if (
+            not upload
+            or upload.upload_type != "multipart"
+            or upload.status != "uploading"
+            or upload.upload_id != upload_id
+        ):
+            return None
+        return upload
+
+    @action(detail=True, methods=["post"], url_path="audio/multipart/presign-batch")
+    def audio_multipart_presign_batch(self, request, pk=None):
+        session = self.get_object()
+
+        if not getattr(settings, "USE_S3", False):
+            return Response({"detail": "S3 upload not enabled (USE_S3=1)."}, status=400)
+
+        ser = MultipartPresignBatchSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        data = ser.validated_data
+
+        upload = self._active_multipart_upload(session, data["uploadId"])
+        if not upload:
+            return Response({"detail": "No active multipart upload for this session."}, status=404)
+
+        last_part = data["lastPart"]
+        part_count = part_count_for(upload.total_size)
+        if part_count:
+            if data["firstPart"] > part_count:
+                return Response({"detail": f"This upload only has {part_count} parts."}, status=400)
+            last_part = min(last_part, part_count)
+
+        urls = presign_upload_parts(upload.s3_key, upload.upload_id, range(data["firstPart"], last_part + 1))
+        return Response({"parts": urls}, status=200)
+
+    @action(detail=True, methods=["get"], url_path="audio/multipart/parts")
+    def audio_multipart_parts(self, request, pk=None):
+        session = self.get_object()
+
+        if not getattr(settings, "USE_S3", False):
+            return Response({"detail": "S3 upload not enabled (USE_S3=1)."}, status=400)
+
+        upload = self._active_multipart_upload(session, request.query_params.get("uploadId"))
+        if not upload:
+            return Response({"detail": "No active multipart upload for this session."}, status=404)
+
+        parts = list_uploaded_parts(upload.s3_key, upload.upload_id)
+        return Response(
+            {
+                "uploadId": upload.upload_id,
+                "key": upload.s3_key,
+                "partSize": part_size_for(upload.total_size),
+                "partCount": part_count_for(upload.total_size),
+                "parts": parts,
+            },
+            status=200,
+        )
 
     @action(detail=True, methods=["post"], url_path="audio/multipart/presign")
     def audio_multipart_presign(self, request, pk=None):
@@ -264,8 +712,8 @@ class TherapySessionViewSet(viewsets.ModelViewSet):
         upload_id = ser.validated_data["uploadId"]
         part_number = ser.validated_data["partNumber"]
 
-        upload = getattr(session, "audio_upload", None)
-        if not upload or upload.status != "uploading" or upload.upload_id != upload_id:
+        upload = self._active_multipart_upload(session, upload_id)
+        if not upload:
             return Response({"detail": "No active multipart upload for this session."}, status=404)
 
         s3 = s3_client()
@@ -282,6 +730,7 @@ class TherapySessionViewSet(viewsets.ModelViewSet):
         return Response({"url": url, "partNumber": part_number}, status=200)
 
     @action(detail=True, methods=["post"], url_path="audio/multipart/complete")
+    @traced_view("session.audio_multipart_complete")
     def audio_multipart_complete(self, request, pk=None):
         session = self.get_object()
 
@@ -295,23 +744,24 @@ class TherapySessionViewSet(viewsets.ModelViewSet):
         parts = ser.validated_data["parts"]
         parts_sorted = sorted(parts, key=lambda p: p["PartNumber"])
 
-        with transaction.atomic():
+        with traced_atomic("audio_multipart_complete"):
             locked = TherapySession.objects.select_for_update().get(pk=session.pk)
 
             if SessionAudio.objects.filter(session=locked).exists():
                 return Response({"detail": "Audio already exists for this session."}, status=409)
 
-            upload = getattr(locked, "audio_upload", None)
-            if not upload or upload.status != "uploading" or upload.upload_id != upload_id:
+            upload = self._active_multipart_upload(locked, upload_id)
+            if not upload:
                 return Response({"detail": "No active multipart upload for this session."}, status=404)
 
-            s3 = s3_client()
-            s3.complete_multipart_upload(
-                Bucket=s3_bucket(),
-                Key=upload.s3_key,
-                UploadId=upload_id,
-                MultipartUpload={"Parts": parts_sorted},
-            )
+            with span("storage.complete_multipart", kind=SpanKind.CLIENT, **{"storage.key": upload.s3_key}):
+                s3 = s3_client()
+                s3.complete_multipart_upload(
+                    Bucket=s3_bucket(),
+                    Key=upload.s3_key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": parts_sorted},
+                )
 
             # Create the final SessionAudio record.
             # With django-storages default storage = S3, FileField stores the key string.
@@ -325,12 +775,7 @@ class TherapySessionViewSet(viewsets.ModelViewSet):
             upload.status = "completed"
             upload.save(update_fields=["status"])
 
-            locked.status = "transcribing"
-            locked.last_error_stage = ""
-            locked.last_error_message = ""
-            locked.save(update_fields=["status", "last_error_stage", "last_error_message", "updated_at"])
-
-            transaction.on_commit(lambda: transcribe_session.delay(locked.id))
+            _start_transcription(locked)
 
         return Response({"detail": "Upload completed. Transcription started.", "audio_id": audio.id}, status=201)
 
@@ -345,6 +790,16 @@ class TherapySessionViewSet(viewsets.ModelViewSet):
         if not upload or upload.status != "uploading":
             return Response({"detail": "No active multipart upload."}, status=404)
 
+        if upload.upload_type == "presigned_post":
+            # nothing to abort on S3: the key goes to the GC in case the POST already landed
+            tombstone([upload.s3_key], reason="abandoned")
+            upload.status = "aborted"
+            upload.save(update_fields=["status", "updated_at"])
+            return Response({"detail": "Direct upload aborted."}, status=200)
+
+        if upload.upload_type != "multipart":
+            return Response({"detail": "No active multipart upload."}, status=404)
+
         s3 = s3_client()
         s3.abort_multipart_upload(
             Bucket=s3_bucket(),
@@ -0,0 +1,65 @@
+"""
+JWT authentication backed by a short-lived cache of the user row.
+
+The cached user carries its therapist profile (select_related), so neither
+authentication nor the profile permission hits the database on a warm cache.
+Entries are dropped whenever the user or profile is saved (users.signals).
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from core.instrumentation import record_cache_lookup
+from users.tokens import TOKEN_VERSION_CLAIM
+
+
+def _user_cache_key(user_id) -> str:
+    return f"auth:user:{user_id}"
+
+
+def get_cached_user(user_id):
+    """User with therapist_profile preloaded; raises User.DoesNotExist."""
+    key = _user_cache_key(user_id)
+    user = cache.get(key)
+    record_cache_lookup(hits=user is not None, misses=user is None)
+    if user is None:
+        user = get_user_model().objects.select_related("therapist_profile").get(pk=user_id)
+        # touch the reverse one-to-one so a missing profile is cached as None too
+        getattr(user, "therapist_profile", None)
+        cache.set(key, user, getattr(settings, "AUTH_USER_CACHE_TTL", 60))
+    return user
+
+
+def invalidate_cached_user(user_id) -> None:
+    cache.delete(_user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        version = validated_token.get(TOKEN_VERSION_CLAIM)
+        if version is None:
+            # issued before the version claim existed: plain database lookup
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = get_cached_user(user_id)
+        except get_user_model().DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        # the version is checked against the cached row rather than being part of
+        # the key, so a bump can never be shadowed by a stale entry
+        if user.token_version != version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        return user
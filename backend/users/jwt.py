@@ -2,14 +2,14 @@ from django.conf import settings
 from django.contrib.auth import authenticate, get_user_model
 from .serializers import UserPublicSerializer, GoogleLoginSerializer
 from rest_framework import status
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.decorators import api_view
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.decorators import api_view, permission_classes
+from .tokens import TherapistRefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework_simplejwt.exceptions import InvalidToken
-from .utils.google import verify_google_access_token
+from .utils.google import verify_google_access_token, verify_google_id_token
 from .models import TherapistProfile
 
 User = get_user_model()
@@ -56,14 +56,12 @@ class LoginView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        refresh = RefreshToken.for_user(user)
-
         if remember_me:
             refresh_lifetime = settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME_LONG"]
         else:
             refresh_lifetime = settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"]
 
-        refresh.set_exp(lifetime=refresh_lifetime)
+        refresh = TherapistRefreshToken.for_user(user, lifetime=refresh_lifetime)
 
         access = str(refresh.access_token)
 
@@ -111,13 +109,22 @@ def logout_view(request):
 
     if refresh:
         try:
-            RefreshToken(refresh).blacklist()
+            TherapistRefreshToken(refresh).blacklist()
         except Exception:
             pass
 
     clear_refresh_cookie(resp)
     return resp
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def logout_all_view(request):
+    # every access/refresh token issued so far carries the old version and is rejected
+    request.user.revoke_tokens()
+    resp = Response({"detail": "Logged out on all devices"}, status=status.HTTP_200_OK)
+    clear_refresh_cookie(resp)
+    return resp
+
 class GoogleLoginView(APIView):
     permission_classes = [AllowAny]
 
@@ -126,7 +133,10 @@ class GoogleLoginView(APIView):
         serializer.is_valid(raise_exception=True)
         remember_me = request.data.get("remember_me", False)
 
-        google_user = verify_google_access_token(serializer.validated_data["access_token"])
+        if serializer.validated_data.get("id_token"):
+            google_user = verify_google_id_token(serializer.validated_data["id_token"])
+        else:
+            google_user = verify_google_access_token(serializer.validated_data["access_token"])
         if not google_user:
             return Response({"detail": "Invalid Google token"}, status=status.HTTP_401_UNAUTHORIZED)
 
@@ -143,15 +153,16 @@ class GoogleLoginView(APIView):
             },
         )
 
-        TherapistProfile.objects.get_or_create(user=user)
+        if not user.is_active:
+            return Response({"detail": "This account is being deleted."}, status=status.HTTP_403_FORBIDDEN)
 
-        refresh = RefreshToken.for_user(user)
+        TherapistProfile.objects.get_or_create(user=user)
 
         if remember_me:
             refresh_lifetime = settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME_LONG"]
         else:
             refresh_lifetime = settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"]
-        refresh.set_exp(lifetime=refresh_lifetime)
+        refresh = TherapistRefreshToken.for_user(user, lifetime=refresh_lifetime)
 
         access = str(refresh.access_token)
 
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from users.services import CacheTokenStore, get_token_store, migrate_blacklist_to_cache, purge_token_rows
+from users.services.token_store import PURGE_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = "Prune the simplejwt outstanding/blacklisted token tables (optionally moving the blacklist to the cache store)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE)
+        parser.add_argument(
+            "--migrate",
+            action="store_true",
+            help="Copy still-valid blacklisted JTIs into the cache token store first.",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Delete every row, not only expired ones (after --migrate, once the cache store is live).",
+        )
+
+    def handle(self, *args, **options):
+        store = get_token_store()
+        cache_store = isinstance(store, CacheTokenStore)
+
+        if options["migrate"]:
+            if not cache_store:
+                raise CommandError("--migrate needs TOKEN_STORE_BACKEND set to the cache store.")
+            copied = migrate_blacklist_to_cache(store, batch_size=options["batch_size"])
+            self.stdout.write(f"copied {copied} blacklisted tokens to the cache store")
+
+        if options["all"] and not (cache_store and options["migrate"]):
+            raise CommandError("--all drops live blacklist entries; use it together with --migrate.")
+
+        purged = purge_token_rows(expired_only=not options["all"], batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. Removed {purged['outstanding']} outstanding and {purged['blacklisted']} blacklisted tokens."
+        ))
@@ -30,6 +30,8 @@ class User(AbstractUser):
 
     is_therapist = models.BooleanField(default=True)
     is_verified = models.BooleanField(default=False)
+    # embedded in issued tokens; bumping it revokes every token of the user
+    token_version = models.PositiveIntegerField(default=0)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -42,6 +44,17 @@ class User(AbstractUser):
     def __str__(self):
         return self.email
 
+    def revoke_tokens(self):
+        """
+        Invalidate every token issued so far (auth/logout/all/; password
+        change/reset flows should call it too). Not tied to set_password:
+        check_password also calls it to upgrade hashes and saves only the
+        password field.
+        """
+        self.token_version = models.F("token_version") + 1
+        self.save(update_fields=["token_version"])  # post_save drops the cached user
+        self.refresh_from_db(fields=["token_version"])
+
 
 # ---------- TherapistProfile (OneToOne with User) ----------
 class TherapistProfile(TimeStampedModel):
@@ -88,3 +101,77 @@ class EmailVerification(models.Model):
 
     def is_expired(self):
         return timezone.now() > self.expires_at
+
+
+# ---------- Background deletion of accounts / patients ----------
+class DeletionJob(TimeStampedModel):
+    """
+    Progress of an account or patient deletion running in the background.
+    Targets are plain ids: the rows are gone by the time the job finishes.
+    The token is the only handle the client needs to poll progress.
+    """
+
+    KIND_CHOICES = [
+        ("account", "Account"),
+        ("patient", "Patient"),
+    ]
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    therapist_id = models.BigIntegerField()
+    patient_id = models.BigIntegerField(null=True, blank=True)  # patient jobs only
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    sessions_total = models.PositiveIntegerField(default=0)
+    sessions_deleted = models.PositiveIntegerField(default=0)
+    patients_total = models.PositiveIntegerField(default=0)
+    patients_deleted = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "deletion_job"
+
+    def __str__(self):
+        return f"DeletionJob {self.kind} | therapist {self.therapist_id} | {self.status}"
+
+
+# ---------- Outgoing email ----------
+class EmailOutbox(TimeStampedModel):
+    """
+    An email waiting to be sent. Written in the same transaction as the
+    change that needs it (e.g. an EmailVerification) and drained in batches
+    by users.tasks.drain_email_outbox over one SMTP connection.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("sending", "Sending (leased to a worker until next_attempt_at)"),
+        ("sent", "Sent"),
+        ("dead", "Dead (gave up)"),
+    ]
+
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "email_outbox"
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"Email to {self.to_email} | {self.status}"
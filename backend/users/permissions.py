@@ -1,6 +1,13 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 from rest_framework.exceptions import PermissionDenied
 
+from users.tokens import IS_THERAPIST_CLAIM, PROFILE_COMPLETED_CLAIM
+
+
+def _claim(request, name):
+    token = getattr(request, "auth", None)
+    return token.get(name) if token is not None and hasattr(token, "get") else None
+
 
 class IsTherapistProfileCompleted(BasePermission):
     """
@@ -21,10 +28,19 @@ class IsTherapistProfileCompleted(BasePermission):
         if request.method in SAFE_METHODS:
             return True
 
+        # token claims first: no profile lookup for the common case
+        is_therapist = _claim(request, IS_THERAPIST_CLAIM)
+        if is_therapist is None:
+            is_therapist = getattr(user, "is_therapist", False)
+
         # must be therapist
-        if not getattr(user, "is_therapist", False):
+        if not is_therapist:
             raise PermissionDenied("Only therapists can perform this action.")
 
+        if _claim(request, PROFILE_COMPLETED_CLAIM) is True:
+            return True
+
+        # the claim may predate completion; the cached user carries the profile
         # must have profile
         profile = getattr(user, "therapist_profile", None)
         if not profile:
@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
-from users.models import TherapistProfile
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from users.models import DeletionJob, TherapistProfile
+from users.tokens import TherapistRefreshToken
 
 User = get_user_model()
 
@@ -80,4 +82,44 @@ class TherapistProfileUpdateSerializer(serializers.ModelSerializer):
 
 
 class GoogleLoginSerializer(serializers.Serializer):
-    access_token = serializers.CharField()
+    # id_token is verified locally; access_token needs a round trip to Google
+    id_token = serializers.CharField(required=False)
+    access_token = serializers.CharField(required=False)
+
+    def validate(self, attrs):
+        if not attrs.get("id_token") and not attrs.get("access_token"):
+            raise serializers.ValidationError("Provide id_token or access_token.")
+        return attrs
+
+
+
+class DeletionJobSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DeletionJob
+        fields = [
+            "token",
+            "kind",
+            "status",
+            "sessions_total",
+            "sessions_deleted",
+            "patients_total",
+            "patients_deleted",
+            "progress",
+            "error",
+            "created_at",
+            "finished_at",
+        ]
+
+    def get_progress(self, obj):
+        if obj.status == "completed":
+            return 1.0
+        total = obj.sessions_total + obj.patients_total
+        done = obj.sessions_deleted + obj.patients_deleted
+        return round(min(done / total, 1.0), 3) if total else 0.0
+
+
+class TherapistTokenRefreshSerializer(TokenRefreshSerializer):
+    # re-reads version/therapist/profile claims into every new access token
+    token_class = TherapistRefreshToken
@@ -0,0 +1,21 @@
+from .deletion import (
+    DELETE_CHUNK_SIZE,
+    purge_patients,
+    purge_sessions,
+    run_deletion_job,
+    start_account_deletion,
+    start_patient_deletion,
+)
+from .email_outbox import (
+    drain_outbox,
+    enqueue_email,
+    enqueue_verification_email,
+    purge_sent_messages,
+)
+from .token_store import (
+    CacheTokenStore,
+    DatabaseTokenStore,
+    get_token_store,
+    migrate_blacklist_to_cache,
+    purge_token_rows,
+)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from patients.models import Patient
+from patients.signals import patients_removed
+from therapy_sessions.models import (
+    SessionAudio,
+    SessionAudioUpload,
+    SessionProcessingTimeline,
+    SessionReport,
+    SessionTranscript,
+    TherapySession,
+)
+from therapy_sessions.services.storage import AUDIO_STORAGE_FIELDS, discard_staging, tombstone
+from users.authentication import invalidate_cached_user
+from users.models import DeletionJob
+
+DELETE_CHUNK_SIZE = 500
+
+# every table hanging off therapy_session, deleted before the sessions themselves
+SESSION_CHILD_MODELS = (
+    SessionAudio,
+    SessionAudioUpload,
+    SessionTranscript,
+    SessionReport,
+    SessionProcessingTimeline,
+)
+
+User = get_user_model()
+
+
+def _raw_delete(qs) -> None:
+    # one DELETE ... WHERE, skipping the cascade collector and per-row signals;
+    # callers take care of what those would have done (children, tombstones)
+    qs._raw_delete(qs.db)
+
+
+def _enqueue(job):
+    from users.tasks import process_deletion_job
+
+    transaction.on_commit(lambda: process_deletion_job.delay(job.id))
+
+
+def start_account_deletion(user) -> DeletionJob:
+    """Lock the account out right away and queue the purge of everything it owns."""
+    with transaction.atomic():
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        transaction.on_commit(lambda: invalidate_cached_user(user.pk))
+        job = DeletionJob.objects.create(
+            kind="account",
+            therapist_id=user.pk,
+            sessions_total=TherapySession.objects.filter(therapist_id=user.pk).count(),
+            patients_total=Patient.objects.filter(therapist_id=user.pk).count(),
+        )
+        _enqueue(job)
+    return job
+
+
+def start_patient_deletion(patient) -> DeletionJob:
+    """Hide the patient (and its sessions) right away and queue the purge."""
+    therapist_id = patient.therapist_id
+    with transaction.atomic():
+        Patient.objects.filter(pk=patient.pk).update(is_active=False, updated_at=timezone.now())
+        job = DeletionJob.objects.create(
+            kind="patient",
+            therapist_id=therapist_id,
+            patient_id=patient.pk,
+            sessions_total=TherapySession.objects.filter(patient_id=patient.pk).count(),
+            patients_total=1,
+        )
+        _enqueue(job)
+        transaction.on_commit(lambda: patients_removed.send(sender=Patient, therapist_id=therapist_id))
+    return job
+
+
+def _delete_session_chunk(sessions) -> int:
+    ids = list(sessions.order_by().values_list("id", flat=True)[:DELETE_CHUNK_SIZE])
+    if not ids:
+        return 0
+
+    with transaction.atomic():
+        # what the SessionAudio / SessionAudioUpload post_delete receivers would do
+        for field in AUDIO_STORAGE_FIELDS:
+            tombstone(SessionAudio.objects.filter(session_id__in=ids).values_list(field, flat=True))
+        pending = list(SessionAudioUpload.objects.filter(session_id__in=ids, status="uploading"))
+        tombstone(
+            (u.s3_key for u in pending if u.upload_type == "presigned_post"),
+            reason="abandoned",
+        )
+        staged = [u for u in pending if u.upload_type == "resumable"]
+        transaction.on_commit(lambda: [discard_staging(u) for u in staged])
+
+        for model in SESSION_CHILD_MODELS:
+            _raw_delete(model.objects.filter(session_id__in=ids))
+        _raw_delete(TherapySession.objects.filter(id__in=ids))
+    return len(ids)
+
+
+def _delete_patient_chunk(patients) -> int:
+    ids = list(patients.order_by().values_list("id", flat=True)[:DELETE_CHUNK_SIZE])
+    if ids:
+        _raw_delete(Patient.objects.filter(id__in=ids))
+    return len(ids)
+
+
+def purge_sessions(sessions) -> int:
+    """Delete sessions and everything under them, one transaction per chunk."""
+    deleted = 0
+    while n := _delete_session_chunk(sessions):
+        deleted += n
+    return deleted
+
+
+def purge_patients(patients) -> int:
+    """Delete patients chunk by chunk; their sessions must be gone already."""
+    deleted = 0
+    while n := _delete_patient_chunk(patients):
+        deleted += n
+    return deleted
+
+
+def _bump(job, field, n):
+    DeletionJob.objects.filter(pk=job.pk).update(**{field: F(field) + n}, updated_at=timezone.now())
+    setattr(job, field, getattr(job, field) + n)
+
+
+def run_deletion_job(job: DeletionJob, budget_seconds: float = 60) -> bool:
+    """
+    Purge the job's rows in bounded chunks, recording progress after each.
+    Returns True once everything is gone, False if the time budget ran out
+    first (the caller re-queues). Safe to re-run after a crash.
+    """
+    deadline = time.monotonic() + budget_seconds
+    if job.kind == "account":
+        sessions = TherapySession.objects.filter(therapist_id=job.therapist_id)
+        patients = Patient.objects.filter(therapist_id=job.therapist_id)
+    else:
+        sessions = TherapySession.objects.filter(patient_id=job.patient_id)
+        patients = Patient.objects.filter(pk=job.patient_id)
+
+    while n := _delete_session_chunk(sessions):
+        _bump(job, "sessions_deleted", n)
+        if time.monotonic() > deadline:
+            return False
+
+    while n := _delete_patient_chunk(patients):
+        _bump(job, "patients_deleted", n)
+        if time.monotonic() > deadline:
+            return False
+
+    with transaction.atomic():
+        if job.kind == "account":
+            # only small per-user tables are left for the cascade collector
+            User.objects.filter(pk=job.therapist_id).delete()
+        else:
+            therapist_id = job.therapist_id
+            transaction.on_commit(lambda: patients_removed.send(sender=Patient, therapist_id=therapist_id))
+
+        job.status = "completed"
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "finished_at", "updated_at"])
+    return True
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import logging
+import time
+from datetime import timedelta
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_BACKOFF_BASE = timedelta(seconds=30)
+OUTBOX_BACKOFF_MAX = timedelta(hours=1)
+# a claimed batch goes back to the queue if its worker has not reported within this
+OUTBOX_LEASE = timedelta(minutes=10)
+OUTBOX_SENT_RETENTION = timedelta(days=14)  # sent rows are only kept for troubleshooting
+
+
+def enqueue_email(to_email: str, subject: str, body: str) -> EmailOutbox:
+    """Queue an email; call inside the transaction that makes it necessary."""
+    from users.tasks import drain_email_outbox
+
+    message = EmailOutbox.objects.create(to_email=to_email, subject=subject, body=body)
+    # the beat schedule drains too; this just avoids waiting for it
+    transaction.on_commit(lambda: drain_email_outbox.delay())
+    return message
+
+
+def enqueue_verification_email(user_email: str, token: str) -> EmailOutbox:
+    verify_url = f"{settings.FRONTEND_URL}/#/verify-email?token={token}"
+    return enqueue_email(
+        user_email,
+        "Verify your email",
+        f"Click the link to verify your email:\n\n{verify_url}",
+    )
+
+
+def backoff_for(attempts: int) -> timedelta:
+    return min(OUTBOX_BACKOFF_BASE * (2 ** attempts), OUTBOX_BACKOFF_MAX)
+
+
+def _send(connection, row: EmailOutbox) -> None:
+    message = EmailMessage(
+        subject=row.subject,
+        body=row.body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[row.to_email],
+        connection=connection,
+    )
+    connection.send_messages([message])
+
+
+def _due():
+    # an expired lease means the claiming worker died mid-batch: send again
+    return EmailOutbox.objects.filter(status__in=["pending", "sending"], next_attempt_at__lte=timezone.now())
+
+
+def claim_batch(batch_size: int = OUTBOX_BATCH_SIZE) -> List[EmailOutbox]:
+    """
+    Lease due messages to this worker in a short transaction: SKIP LOCKED so
+    several workers can drain at once, and the locks are released before any
+    SMTP traffic.
+    """
+    with transaction.atomic():
+        batch = list(
+            _due().select_for_update(skip_locked=True).order_by("next_attempt_at")[:batch_size]
+        )
+        if batch:
+            EmailOutbox.objects.filter(pk__in=[row.pk for row in batch]).update(
+                status="sending", next_attempt_at=timezone.now() + OUTBOX_LEASE, updated_at=timezone.now(),
+            )
+    return batch
+
+
+def record_results(sent: List[EmailOutbox], failed: List[EmailOutbox]) -> int:
+    """Mark sent rows, back off or dead-letter failed ones; returns how many went dead."""
+    now = timezone.now()
+    EmailOutbox.objects.filter(pk__in=[row.pk for row in sent]).update(
+        status="sent", sent_at=now, updated_at=now,
+    )
+
+    dead = 0
+    for row in failed:
+        row.attempts += 1
+        row.next_attempt_at = now + backoff_for(row.attempts)
+        row.status = "pending"
+        if row.attempts >= OUTBOX_MAX_ATTEMPTS:
+            row.status = "dead"
+            dead += 1
+        row.updated_at = now
+    EmailOutbox.objects.bulk_update(
+        failed, ["attempts", "next_attempt_at", "status", "last_error", "updated_at"],
+    )
+    return dead
+
+
+def send_batch(connection, batch_size: int = OUTBOX_BATCH_SIZE) -> Tuple[int, int, int]:
+    """
+    Claim one batch of due messages and send it over an already open
+    connection. Returns (sent, retried, dead).
+    """
+    batch = claim_batch(batch_size)
+    if not batch:
+        return 0, 0, 0
+
+    sent, failed = [], []
+    for row in batch:
+        try:
+            _send(connection, row)
+        except Exception as e:
+            # a dropped connection would fail every following message: reopen once
+            row.last_error = str(e)[:1000]
+            failed.append(row)
+            connection.close()
+            try:
+                connection.open()
+            except Exception:
+                pass  # the remaining rows fail and back off like this one
+        else:
+            sent.append(row)
+
+    dead = record_results(sent, failed)
+    if failed:
+        logger.warning("email outbox: %d of %d sends failed (%d dead)", len(failed), len(batch), dead)
+    return len(sent), len(failed) - dead, dead
+
+
+def fail_batch(error: Exception, batch_size: int = OUTBOX_BATCH_SIZE) -> Tuple[int, int]:
+    """No connection at all: count the attempt on one batch so backoff and dead-lettering apply."""
+    batch = claim_batch(batch_size)
+    for row in batch:
+        row.last_error = str(error)[:1000]
+    dead = record_results([], batch)
+    if batch:
+        logger.warning("email outbox: SMTP connection failed, %d messages deferred (%d dead): %s",
+                       len(batch), dead, error)
+    return len(batch) - dead, dead
+
+
+def purge_sent_messages(retention: timedelta = OUTBOX_SENT_RETENTION) -> int:
+    deleted, _ = EmailOutbox.objects.filter(status="sent", sent_at__lt=timezone.now() - retention).delete()
+    return deleted
+
+
+def drain_outbox(max_batches: int = 20, batch_size: int = OUTBOX_BATCH_SIZE) -> Dict[str, float]:
+    """Send due messages over a single SMTP connection and report throughput."""
+    started = time.monotonic()
+    totals = {"sent": 0, "retried": 0, "dead": 0}
+
+    connection = None
+    try:
+        for _ in range(max_batches):
+            if not _due().exists():
+                break
+            if connection is None:
+                connection = get_connection(fail_silently=False)
+                try:
+                    connection.open()
+                except Exception as e:
+                    connection = None
+                    retried, dead = fail_batch(e, batch_size=batch_size)
+                    totals["retried"] += retried
+                    totals["dead"] += dead
+                    break
+            sent, retried, dead = send_batch(connection, batch_size=batch_size)
+            totals["sent"] += sent
+            totals["retried"] += retried
+            totals["dead"] += dead
+            if sent + retried + dead == 0:
+                break
+    finally:
+        if connection is not None:
+            connection.close()
+
+    elapsed = time.monotonic() - started
+    totals["seconds"] = round(elapsed, 3)
+    totals["per_second"] = round(totals["sent"] / elapsed, 2) if totals["sent"] and elapsed else 0.0
+    if totals["sent"] or totals["retried"] or totals["dead"]:
+        logger.info(
+            "email outbox: sent %d in %.2fs (%.1f/s), %d to retry, %d dead",
+            totals["sent"], elapsed, totals["per_second"], totals["retried"], totals["dead"],
+        )
+    return totals
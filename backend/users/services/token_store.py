@@ -0,0 +1,111 @@
+"""
+Where refresh-token JTIs are recorded (outstanding) and revoked (blacklist).
+
+DatabaseTokenStore is simplejwt's token_blacklist tables. CacheTokenStore
+keeps both sets in the cache (Redis in production) with a TTL equal to the
+token's remaining lifetime, so nothing needs pruning. While old blacklist
+rows may still matter, CacheTokenStore also consults the blacklist table
+(TOKEN_STORE_DB_FALLBACK); `manage.py purge_token_tables --migrate` copies
+those rows into the cache so the fallback can be switched off.
+"""
+from __future__ import annotations
+
+import time
+from typing import Dict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import BlacklistMixin
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+PURGE_BATCH_SIZE = 5_000
+
+
+def _jti(token) -> str:
+    return token.payload[api_settings.JTI_CLAIM]
+
+
+class DatabaseTokenStore:
+    def outstand(self, token) -> None:
+        BlacklistMixin.outstand(token)
+
+    def blacklist(self, token) -> None:
+        BlacklistMixin.blacklist(token)
+        # rows outstanding before their lifetime was final carry a short
+        # expires_at; purging keys off it, so align it with the token's exp
+        OutstandingToken.objects.filter(
+            jti=_jti(token), expires_at__lt=datetime_from_epoch(token.payload["exp"])
+        ).update(expires_at=datetime_from_epoch(token.payload["exp"]))
+
+    def is_blacklisted(self, jti: str) -> bool:
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+class CacheTokenStore:
+    OUTSTANDING_PREFIX = "jwt:out:"
+    BLACKLIST_PREFIX = "jwt:bl:"
+
+    def __init__(self):
+        self.cache = caches[getattr(settings, "TOKEN_STORE_CACHE", "default")]
+        self.db_fallback = getattr(settings, "TOKEN_STORE_DB_FALLBACK", True)
+
+    @staticmethod
+    def _ttl(exp: int) -> int:
+        return max(1, int(exp - time.time()))
+
+    def outstand(self, token) -> None:
+        self.cache.set(
+            self.OUTSTANDING_PREFIX + _jti(token),
+            token.payload.get(api_settings.USER_ID_CLAIM),
+            self._ttl(token.payload["exp"]),
+        )
+
+    def blacklist(self, token) -> None:
+        self.blacklist_jti(_jti(token), token.payload["exp"])
+
+    def blacklist_jti(self, jti: str, exp: int) -> None:
+        self.cache.set(self.BLACKLIST_PREFIX + jti, 1, self._ttl(exp))
+
+    def is_blacklisted(self, jti: str) -> bool:
+        if self.cache.get(self.BLACKLIST_PREFIX + jti) is not None:
+            return True
+        return self.db_fallback and BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+def get_token_store():
+    return import_string(settings.TOKEN_STORE_BACKEND)()
+
+
+def migrate_blacklist_to_cache(store: CacheTokenStore, batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """Copy still-valid blacklisted JTIs from the database into the cache store."""
+    rows = (
+        BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+        .values_list("token__jti", "token__expires_at")
+        .iterator(chunk_size=batch_size)
+    )
+    copied = 0
+    for jti, expires_at in rows:
+        store.blacklist_jti(jti, expires_at.timestamp())
+        copied += 1
+    return copied
+
+
+def purge_token_rows(expired_only: bool = True, batch_size: int = PURGE_BATCH_SIZE) -> Dict[str, int]:
+    """Delete outstanding/blacklisted rows in bounded batches (short locks, no huge transaction)."""
+    qs = OutstandingToken.objects.order_by("pk")
+    if expired_only:
+        qs = qs.filter(expires_at__lt=timezone.now())
+
+    purged = {"outstanding": 0, "blacklisted": 0}
+    while True:
+        ids = list(qs.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return purged
+        blacklisted, _ = BlacklistedToken.objects.filter(token_id__in=ids).delete()
+        outstanding, _ = OutstandingToken.objects.filter(pk__in=ids).delete()
+        purged["blacklisted"] += blacklisted
+        purged["outstanding"] += outstanding
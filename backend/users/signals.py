@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.authentication import invalidate_cached_user
+from users.models import TherapistProfile
+
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def drop_cached_user(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=TherapistProfile)
+def drop_cached_profile_owner(sender, instance, **kwargs):
+    invalidate_cached_user(instance.user_id)
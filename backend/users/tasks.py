@@ -1,15 +1,65 @@
-from django.conf import settings
-from django.core.mail import send_mail
-from django.urls import reverse
+from django.db import transaction
+from django.utils import timezone
 from celery import shared_task
+
+from users.models import DeletionJob
+from users.services import (
+    drain_outbox,
+    enqueue_verification_email,
+    purge_sent_messages,
+    purge_token_rows,
+    run_deletion_job,
+)
+
+
 @shared_task
 def send_verification_email(user_email, token):
-    verify_url = f"{settings.FRONTEND_URL}/#/verify-email?token={token}"
-
-    send_mail(
-        subject="Verify your email",
-        message=f"Click the link to verify your email:\n\n{verify_url}",
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[user_email],
-        fail_silently=False,
-    )
+    # kept for messages queued before the outbox; new code enqueues directly
+    with transaction.atomic():
+        enqueue_verification_email(user_email, token)
+
+
+@shared_task
+def drain_email_outbox():
+    """Send due outbox emails over one SMTP connection; failures back off, then dead-letter."""
+    return {"ok": True, **drain_outbox()}
+
+
+DELETION_TASK_BUDGET_SECONDS = 60
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=10)
+def process_deletion_job(self, job_id: int):
+    """
+    Works through a DeletionJob for a bounded time, then re-queues itself so
+    one large account never ties up a worker.
+    """
+    job = DeletionJob.objects.filter(pk=job_id).exclude(status__in=["completed", "failed"]).first()
+    if not job:
+        return {"ok": True, "skipped": True}
+
+    if job.status == "pending":
+        job.status = "running"
+        job.save(update_fields=["status", "updated_at"])
+
+    try:
+        done = run_deletion_job(job, budget_seconds=DELETION_TASK_BUDGET_SECONDS)
+    except Exception as e:
+        if self.request.retries >= self.max_retries:
+            job.status = "failed"
+            job.error = str(e)[:2000]
+            job.finished_at = timezone.now()
+            job.save(update_fields=["status", "error", "finished_at", "updated_at"])
+            return {"ok": False, "error": str(e)}
+        raise self.retry(exc=e)
+
+    if not done:
+        process_deletion_job.delay(job_id)
+    return {"ok": True, "done": done}
+
+
+@shared_task
+def purge_token_tables():
+    """Drop expired rows from the simplejwt outstanding/blacklist tables, and old sent outbox emails."""
+    return {"ok": True, **purge_token_rows(), "sent_emails": purge_sent_messages()}
+
@@ -1,7 +1,33 @@
+import json
+import time
+
+import jwt
 import pytest
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from cryptography.hazmat.primitives.asymmetric import rsa
 from django.contrib.auth import authenticate, get_user_model
-from users.models import TherapistProfile
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from patients.models import Patient
+from therapy_sessions.models import SessionAudio, SessionTranscript, StorageTombstone, TherapySession
+from users.models import DeletionJob, EmailOutbox, TherapistProfile
 from users.serializers import RegisterSerializer
+from users.services import drain_outbox, enqueue_email, get_token_store
+from users.services.email_outbox import OUTBOX_MAX_ATTEMPTS
+from users.tasks import process_deletion_job, purge_token_tables
+from users.utils.google import google_jwks
 
 User = get_user_model()
 
@@ -212,4 +238,497 @@ class TestTherapistProfile:
         TherapistProfile.objects.get_or_create(user=user)
 
         # There must be only one profile
-        assert TherapistProfile.objects.filter(user=user).count() == 1
\ No newline at end of file
+        assert TherapistProfile.objects.filter(user=user).count() == 1
+
+# =========================
+# BACKGROUND DELETION
+# =========================
+def _patient_with_sessions(therapist, n, suffix="1"):
+    patient = Patient.objects.create(
+        therapist=therapist,
+        full_name="Salma Hassan Omar",
+        patient_id=f"2980101123456{suffix}",
+        contact_phone=f"0101234567{suffix}",
+    )
+    sessions = [
+        TherapySession.objects.create(therapist=therapist, patient=patient, session_date=timezone.now())
+        for _ in range(n)
+    ]
+    for session in sessions:
+        SessionTranscript.objects.create(session=session, raw_transcript="...")
+    name = default_storage.save(f"recordings/patient_{patient.id}/session_{sessions[0].id}/audio.webm", ContentFile(b"a"))
+    SessionAudio.objects.create(session=sessions[0], audio_file=name, original_filename="audio.webm")
+    return patient, sessions, name
+
+
+@pytest.mark.django_db
+class TestBackgroundDeletion:
+    @pytest.fixture(autouse=True)
+    def _media(self, settings, tmp_path):
+        settings.USE_S3 = False
+        settings.MEDIA_ROOT = str(tmp_path)
+
+    def test_account_deletion_runs_as_job(self, auth_client_a, therapist_a, django_capture_on_commit_callbacks):
+        _, _, audio_name = _patient_with_sessions(therapist_a, 3)
+
+        with patch.object(process_deletion_job, "delay", side_effect=lambda job_id: process_deletion_job(job_id)), \
+             django_capture_on_commit_callbacks(execute=True):
+            res = auth_client_a.delete("/api/v1/therapist/profile/")
+
+        assert res.status_code == 202
+        assert not User.objects.filter(pk=therapist_a.pk).exists()
+        assert not TherapySession.objects.exists()
+        assert not Patient.objects.exists()
+        assert StorageTombstone.objects.filter(key=audio_name).exists()
+
+        status_res = APIClient().get(res.data["status_url"])
+        assert status_res.status_code == 200
+        assert status_res.data["status"] == "completed"
+        assert status_res.data["sessions_deleted"] == 3
+        assert status_res.data["progress"] == 1.0
+
+    def test_account_locked_out_before_purge(self, auth_client_a, therapist_a):
+        with patch.object(process_deletion_job, "delay"):
+            res = auth_client_a.delete("/api/v1/therapist/profile/")
+
+        assert res.status_code == 202
+        therapist_a.refresh_from_db()
+        assert therapist_a.is_active is False
+        assert DeletionJob.objects.get(token=res.data["token"]).status == "pending"
+        assert authenticate(username="a@test.com", password="pass1234") is None
+
+    def test_patient_deletion_hides_then_purges(self, auth_client_a, therapist_a):
+        TherapistProfile.objects.create(user=therapist_a, is_completed=True)
+        patient, _, _ = _patient_with_sessions(therapist_a, 2)
+        kept, kept_sessions, _ = _patient_with_sessions(therapist_a, 1, suffix="2")
+
+        with patch.object(process_deletion_job, "delay"):
+            res = auth_client_a.delete(f"/api/v1/patients/{patient.id}/")
+
+        assert res.status_code == 202
+        listed = auth_client_a.get("/api/v1/patients/").data
+        assert [p["id"] for p in listed] == [kept.id]
+
+        job = DeletionJob.objects.get(token=res.data["token"])
+        process_deletion_job(job.id)
+
+        job.refresh_from_db()
+        assert job.status == "completed"
+        assert (job.sessions_deleted, job.patients_deleted) == (2, 1)
+        assert list(Patient.objects.values_list("id", flat=True)) == [kept.id]
+        assert list(TherapySession.objects.values_list("id", flat=True)) == [kept_sessions[0].id]
+
+    def test_job_yields_when_budget_runs_out(self, therapist_a, monkeypatch):
+        from users.services import deletion
+
+        monkeypatch.setattr(deletion, "DELETE_CHUNK_SIZE", 2)
+        patient, _, _ = _patient_with_sessions(therapist_a, 5)
+        with patch.object(process_deletion_job, "delay"):
+            job = deletion.start_patient_deletion(patient)
+
+        assert deletion.run_deletion_job(job, budget_seconds=0) is False
+        job.refresh_from_db()
+        assert (job.sessions_deleted, job.status) == (2, "pending")
+        assert TherapySession.objects.count() == 3
+
+        assert deletion.run_deletion_job(job) is True
+        assert not TherapySession.objects.exists()
+
+
+# =========================
+# CACHED JWT AUTHENTICATION
+# =========================
+@pytest.fixture
+def logged_in(db):
+    cache.clear()
+    user = User.objects.create_user(email="cached@test.com", password=STRONG_PASSWORD, is_verified=True)
+    TherapistProfile.objects.create(user=user)
+    client = APIClient()
+    res = client.post("/api/v1/auth/login/", {"email": user.email, "password": STRONG_PASSWORD}, format="json")
+    assert res.status_code == 200, res.data
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+    return user, client, res.data["access"]
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    def test_access_token_carries_claims(self, logged_in):
+        user, _, access = logged_in
+        token = AccessToken(access)
+
+        assert token["ver"] == 0
+        assert token["is_therapist"] is True
+        assert token["profile_completed"] is False
+
+    def test_warm_cache_needs_no_queries(self, logged_in, django_assert_num_queries):
+        _, client, _ = logged_in
+        assert client.get("/api/v1/therapist/profile/").status_code == 200
+
+        with django_assert_num_queries(0):
+            assert client.get("/api/v1/auth/me/").status_code == 200
+            assert client.get("/api/v1/therapist/profile/").status_code == 200
+
+    def test_profile_save_invalidates_cache(self, logged_in):
+        user, client, _ = logged_in
+        client.get("/api/v1/therapist/profile/")
+
+        TherapistProfile.objects.filter(user=user).update(clinic_name="Nile Clinic")
+        assert client.get("/api/v1/therapist/profile/").data["clinic_name"] == ""  # still cached
+
+        profile = TherapistProfile.objects.get(user=user)
+        profile.save()
+        assert client.get("/api/v1/therapist/profile/").data["clinic_name"] == "Nile Clinic"
+
+    def test_password_change_revokes_tokens(self, logged_in):
+        user, client, _ = logged_in
+        assert client.get("/api/v1/auth/me/").status_code == 200
+
+        user.set_password("AnotherPass123")
+        user.save()
+        user.revoke_tokens()
+
+        assert client.get("/api/v1/auth/me/").status_code == 401
+
+    def test_logout_all_revokes_every_token(self, logged_in):
+        user, client, _ = logged_in
+        refresh = client.cookies["refresh_token"].value
+
+        assert client.post("/api/v1/auth/logout/all/").status_code == 200
+
+        assert client.get("/api/v1/auth/me/").status_code == 401
+        client.cookies["refresh_token"] = refresh
+        assert client.post("/api/v1/auth/token/refresh/", {}, format="json").status_code == 401
+
+    def test_login_with_hash_upgrade_issues_usable_tokens(self, db):
+        cache.clear()
+        user = User.objects.create_user(email="legacy@test.com", is_verified=True)
+        # fewer iterations than the current hasher: check_password re-hashes on login
+        User.objects.filter(pk=user.pk).update(
+            password=PBKDF2PasswordHasher().encode(STRONG_PASSWORD, "legacysalt", iterations=1000)
+        )
+        TherapistProfile.objects.create(user=user)
+        client = APIClient()
+
+        res = client.post("/api/v1/auth/login/", {"email": user.email, "password": STRONG_PASSWORD}, format="json")
+        assert res.status_code == 200, res.data
+        user.refresh_from_db()
+        assert "$1000$" not in user.password  # upgraded
+
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+        assert client.get("/api/v1/auth/me/").status_code == 200
+
+    def test_account_deletion_locks_out_cached_user(self, logged_in, django_capture_on_commit_callbacks):
+        _, client, _ = logged_in
+        assert client.get("/api/v1/auth/me/").status_code == 200
+
+        with patch("users.tasks.process_deletion_job.delay"), \
+             django_capture_on_commit_callbacks(execute=True):
+            assert client.delete("/api/v1/therapist/profile/").status_code == 202
+
+        assert client.get("/api/v1/auth/me/").status_code == 401
+
+    def test_refresh_picks_up_profile_completion(self, logged_in):
+        user, client, _ = logged_in
+        TherapistProfile.objects.filter(user=user).update(is_completed=True)
+        cache.clear()
+
+        res = client.post("/api/v1/auth/token/refresh/", {}, format="json")
+
+        assert res.status_code == 200, res.data
+        assert AccessToken(res.data["access"])["profile_completed"] is True
+
+
+# =========================
+# REFRESH TOKEN STORE
+# =========================
+CACHE_STORE = "users.services.token_store.CacheTokenStore"
+
+
+def _login(client, user):
+    res = client.post("/api/v1/auth/login/", {"email": user.email, "password": STRONG_PASSWORD}, format="json")
+    assert res.status_code == 200, res.data
+    return res
+
+
+@pytest.fixture
+def verified_user(db):
+    cache.clear()
+    return User.objects.create_user(email="store@test.com", password=STRONG_PASSWORD, is_verified=True)
+
+
+@pytest.mark.django_db
+class TestTokenStore:
+    def test_cache_store_rotation_writes_no_rows(self, settings, verified_user):
+        settings.TOKEN_STORE_BACKEND = CACHE_STORE
+        client = APIClient()
+        _login(client, verified_user)
+        old_refresh = client.cookies["refresh_token"].value
+
+        res = client.post("/api/v1/auth/token/refresh/", {}, format="json")
+        assert res.status_code == 200, res.data
+        assert not OutstandingToken.objects.exists()
+        assert not BlacklistedToken.objects.exists()
+
+        # the rotated-out token is rejected
+        client.cookies["refresh_token"] = old_refresh
+        assert client.post("/api/v1/auth/token/refresh/", {}, format="json").status_code == 401
+
+    def test_logout_blacklists_in_cache_store(self, settings, verified_user):
+        settings.TOKEN_STORE_BACKEND = CACHE_STORE
+        client = APIClient()
+        res = _login(client, verified_user)
+        refresh = client.cookies["refresh_token"].value
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+        assert client.post("/api/v1/auth/logout/").status_code == 200
+
+        client.cookies["refresh_token"] = refresh
+        assert client.post("/api/v1/auth/token/refresh/", {}, format="json").status_code == 401
+
+    def test_database_store_keeps_old_behaviour(self, settings, verified_user):
+        settings.TOKEN_STORE_BACKEND = "users.services.token_store.DatabaseTokenStore"
+        client = APIClient()
+        _login(client, verified_user)
+
+        assert client.post("/api/v1/auth/token/refresh/", {}, format="json").status_code == 200
+        assert OutstandingToken.objects.count() == 2
+        assert BlacklistedToken.objects.count() == 1
+
+    def test_purge_migrates_blacklist_and_drops_rows(self, settings, verified_user):
+        live = RefreshToken.for_user(verified_user)
+        live.blacklist()
+        expired = RefreshToken.for_user(verified_user)
+        expired.blacklist()
+        OutstandingToken.objects.filter(jti=expired["jti"]).update(expires_at=timezone.now() - timedelta(days=1))
+
+        settings.TOKEN_STORE_BACKEND = CACHE_STORE
+        settings.TOKEN_STORE_DB_FALLBACK = False
+        call_command("purge_token_tables", "--migrate", "--all", stdout=StringIO())
+
+        assert not OutstandingToken.objects.exists()
+        store = get_token_store()
+        assert store.is_blacklisted(live["jti"])
+        assert not store.is_blacklisted(expired["jti"])
+
+    def test_rotated_remember_me_token_stays_revoked_after_purge(self, settings, verified_user):
+        settings.TOKEN_STORE_BACKEND = "users.services.token_store.DatabaseTokenStore"
+        client = APIClient()
+        res = client.post(
+            "/api/v1/auth/login/",
+            {"email": verified_user.email, "password": STRONG_PASSWORD, "remember_me": True},
+            format="json",
+        )
+        assert res.status_code == 200, res.data
+        old_refresh = client.cookies["refresh_token"].value
+        assert OutstandingToken.objects.get().expires_at > timezone.now() + timedelta(days=29)
+
+        assert client.post("/api/v1/auth/token/refresh/", {}, format="json").status_code == 200
+
+        # the daily purge, two days later: the 30-day token must keep its blacklist row
+        with patch("users.services.token_store.timezone.now", return_value=timezone.now() + timedelta(days=2)):
+            call_command("purge_token_tables", stdout=StringIO())
+
+        client.cookies["refresh_token"] = old_refresh
+        assert client.post("/api/v1/auth/token/refresh/", {}, format="json").status_code == 401
+
+    def test_purge_keeps_unexpired_rows_by_default(self, verified_user):
+        RefreshToken.for_user(verified_user).blacklist()
+        stale = RefreshToken.for_user(verified_user)
+        OutstandingToken.objects.filter(jti=stale["jti"]).update(expires_at=timezone.now() - timedelta(days=1))
+
+        call_command("purge_token_tables", stdout=StringIO())
+
+        assert OutstandingToken.objects.count() == 1
+        assert BlacklistedToken.objects.count() == 1
+
+
+# =========================
+# GOOGLE ID TOKEN LOGIN
+# =========================
+GOOGLE_CLIENT_ID = "test-client.apps.googleusercontent.com"
+
+
+@pytest.fixture
+def google_key(settings):
+    settings.GOOGLE_CLIENT_IDS = [GOOGLE_CLIENT_ID]
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(key.public_key()))
+    jwk.update(kid="key-1", alg="RS256", use="sig")
+
+    response = MagicMock(status_code=200, headers={"Cache-Control": "public, max-age=21600"})
+    response.json.return_value = {"keys": [jwk]}
+    google_jwks.clear()
+    with patch("users.utils.google.http_session") as session:
+        session.return_value.get.return_value = response
+        yield key, session.return_value.get
+    google_jwks.clear()
+
+
+def _id_token(key, kid="key-1", **overrides):
+    now = int(time.time())
+    claims = {
+        "iss": "https://accounts.google.com",
+        "aud": GOOGLE_CLIENT_ID,
+        "sub": "1234567890",
+        "email": "google@test.com",
+        "email_verified": True,
+        "given_name": "Nour",
+        "family_name": "Adel",
+        "iat": now,
+        "exp": now + 3600,
+        **overrides,
+    }
+    return jwt.encode(claims, key, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.mark.django_db
+class TestGoogleIdTokenLogin:
+    URL = "/api/v1/auth/google/login/"
+
+    def test_login_verifies_locally_and_caches_keys(self, google_key):
+        key, fetch = google_key
+        client = APIClient()
+
+        for _ in range(3):
+            res = client.post(self.URL, {"id_token": _id_token(key)}, format="json")
+            assert res.status_code == 200, res.data
+
+        assert res.data["user"]["email"] == "google@test.com"
+        assert User.objects.get(email="google@test.com").first_name == "Nour"
+        assert fetch.call_count == 1  # only the JWKS, never userinfo
+
+    @pytest.mark.parametrize("overrides", [
+        {"aud": "someone-else"},
+        {"iss": "https://evil.example.com"},
+        {"exp": int(time.time()) - 3600},
+        {"email_verified": False},
+    ])
+    def test_rejects_invalid_claims(self, google_key, overrides):
+        key, _ = google_key
+        res = APIClient().post(self.URL, {"id_token": _id_token(key, **overrides)}, format="json")
+        assert res.status_code == 401
+
+    def test_rejects_foreign_signature(self, google_key):
+        other = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        res = APIClient().post(self.URL, {"id_token": _id_token(other)}, format="json")
+        assert res.status_code == 401
+
+    def test_unknown_kid_refetches_once(self, google_key):
+        key, fetch = google_key
+        google_jwks.get_key("key-1")
+
+        assert google_jwks.get_key("rotated") is None
+        assert google_jwks.get_key("rotated") is None
+        assert fetch.call_count == 1  # rate limited right after the first fetch
+
+    def test_requires_a_token(self, google_key):
+        assert APIClient().post(self.URL, {}, format="json").status_code == 400
+
+
+# =========================
+# EMAIL OUTBOX
+# =========================
+@pytest.fixture
+def no_drain_kick():
+    with patch("users.tasks.drain_email_outbox.delay") as delay_mock:
+        yield delay_mock
+
+
+@pytest.mark.django_db
+class TestEmailOutbox:
+    def test_register_writes_outbox_row(self, no_drain_kick, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            res = APIClient().post(
+                "/api/v1/auth/register/", _build_register_payload(email="new@test.com"), format="json",
+            )
+
+        assert res.status_code == 201, res.data
+        row = EmailOutbox.objects.get(to_email="new@test.com")
+        assert row.status == "pending"
+        assert "verify-email?token=" in row.body
+        no_drain_kick.assert_called_once()
+        assert mail.outbox == []
+
+    def test_drain_sends_batch_over_one_connection(self, no_drain_kick):
+        for i in range(5):
+            enqueue_email(f"user{i}@test.com", "Hello", "Body")
+
+        with patch("users.services.email_outbox.get_connection", wraps=mail.get_connection) as get_connection:
+            result = drain_outbox(batch_size=2)
+
+        assert get_connection.call_count == 1
+        assert result["sent"] == 5
+        assert len(mail.outbox) == 5
+        assert not EmailOutbox.objects.exclude(status="sent").exists()
+
+    def test_failures_back_off_then_dead_letter(self, no_drain_kick):
+        enqueue_email("bounce@test.com", "Hello", "Body")
+        enqueue_email("fine@test.com", "Hello", "Body")
+
+        def send(connection, row):
+            if row.to_email == "bounce@test.com":
+                raise OSError("550 mailbox unavailable")
+            mail.EmailMessage(row.subject, row.body, to=[row.to_email], connection=connection).send()
+
+        with patch("users.services.email_outbox._send", side_effect=send):
+            assert drain_outbox()["retried"] == 1
+
+            row = EmailOutbox.objects.get(to_email="bounce@test.com")
+            assert row.attempts == 1
+            assert row.next_attempt_at > timezone.now()
+            assert "550" in row.last_error
+            assert EmailOutbox.objects.get(to_email="fine@test.com").status == "sent"
+
+            # not due yet: nothing happens
+            assert drain_outbox()["retried"] == 0
+
+            EmailOutbox.objects.filter(pk=row.pk).update(
+                attempts=OUTBOX_MAX_ATTEMPTS - 1, next_attempt_at=timezone.now(),
+            )
+            assert drain_outbox()["dead"] == 1
+
+        assert EmailOutbox.objects.get(pk=row.pk).status == "dead"
+
+    def test_rows_are_leased_before_smtp_traffic(self, no_drain_kick):
+        enqueue_email("user@test.com", "Hello", "Body")
+        seen = []
+
+        def send(connection, row):
+            seen.append(EmailOutbox.objects.get(pk=row.pk).status)
+
+        with patch("users.services.email_outbox._send", side_effect=send):
+            assert drain_outbox()["sent"] == 1
+
+        assert seen == ["sending"]
+        assert EmailOutbox.objects.get().status == "sent"
+
+    def test_connection_failure_counts_attempts(self, no_drain_kick):
+        enqueue_email("a@test.com", "Hello", "Body")
+        enqueue_email("b@test.com", "Hello", "Body")
+        connection = MagicMock()
+        connection.open.side_effect = OSError("connection refused")
+
+        with patch("users.services.email_outbox.get_connection", return_value=connection):
+            assert drain_outbox()["retried"] == 2
+
+        for row in EmailOutbox.objects.all():
+            assert (row.status, row.attempts) == ("pending", 1)
+            assert row.next_attempt_at > timezone.now()
+            assert "refused" in row.last_error
+
+    def test_expired_lease_is_sent_again(self, no_drain_kick):
+        row = enqueue_email("user@test.com", "Hello", "Body")
+        EmailOutbox.objects.filter(pk=row.pk).update(status="sending", next_attempt_at=timezone.now())
+
+        assert drain_outbox()["sent"] == 1
+        assert len(mail.outbox) == 1
+
+    def test_purge_task_drops_old_sent_rows(self, no_drain_kick):
+        old = enqueue_email("old@test.com", "Hello", "Body")
+        recent = enqueue_email("recent@test.com", "Hello", "Body")
+        EmailOutbox.objects.filter(pk=old.pk).update(status="sent", sent_at=timezone.now() - timedelta(days=30))
+        EmailOutbox.objects.filter(pk=recent.pk).update(status="sent", sent_at=timezone.now())
+
+        assert purge_token_tables()["sent_emails"] == 1
+        assert list(EmailOutbox.objects.values_list("pk", flat=True)) == [recent.pk]
+
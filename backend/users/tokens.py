@@ -0,0 +1,75 @@
+"""
+Refresh/access tokens carrying the claims the permission classes need:
+token version (bumped by User.revoke_tokens, e.g. on logout from all
+devices), therapist flag and profile completion. Access tokens re-read
+them from the user on every refresh.
+Outstanding/blacklisted JTIs go to the configured token store
+(users.services.token_store) instead of the token_blacklist tables.
+"""
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import BlacklistMixin, RefreshToken
+
+TOKEN_VERSION_CLAIM = "ver"
+IS_THERAPIST_CLAIM = "is_therapist"
+PROFILE_COMPLETED_CLAIM = "profile_completed"
+
+
+def user_claims(user) -> dict:
+    profile = getattr(user, "therapist_profile", None)
+    return {
+        TOKEN_VERSION_CLAIM: user.token_version,
+        IS_THERAPIST_CLAIM: bool(user.is_therapist),
+        PROFILE_COMPLETED_CLAIM: bool(profile and profile.is_completed),
+    }
+
+
+class TherapistRefreshToken(RefreshToken):
+    _user = None
+
+    @classmethod
+    def for_user(cls, user, lifetime=None):
+        """
+        `lifetime` overrides REFRESH_TOKEN_LIFETIME (remember-me). It is set
+        before the token is outstanding so the store records the real expiry.
+        """
+        # skip BlacklistMixin.for_user: it inserts an OutstandingToken row
+        token = super(BlacklistMixin, cls).for_user(user)
+        if lifetime is not None:
+            token.set_exp(lifetime=lifetime)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        token._user = user
+        token.outstand()
+        return token
+
+    def check_blacklist(self):
+        from users.services.token_store import get_token_store
+
+        if get_token_store().is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        from users.services.token_store import get_token_store
+
+        get_token_store().blacklist(self)
+
+    def outstand(self):
+        from users.services.token_store import get_token_store
+
+        get_token_store().outstand(self)
+
+    @property
+    def access_token(self):
+        from users.authentication import get_cached_user
+
+        access = super().access_token
+        user = self._user or get_cached_user(self.payload[api_settings.USER_ID_CLAIM])
+
+        version = self.payload.get(TOKEN_VERSION_CLAIM)
+        if version is not None and version != user.token_version:
+            raise TokenError("Token has been revoked")
+
+        for claim, value in user_claims(user).items():
+            access[claim] = value
+        return access
@@ -1,15 +1,17 @@
 from django.urls import path
-from .views import RegisterView, MeView, TherapistProfileView, VerifyEmailView, ResendVerificationView
-from .jwt import LoginView, CookieTokenRefreshView, logout_view, GoogleLoginView
+from .views import RegisterView, MeView, TherapistProfileView, VerifyEmailView, ResendVerificationView, DeletionJobStatusView
+from .jwt import LoginView, CookieTokenRefreshView, logout_view, logout_all_view, GoogleLoginView
 
 urlpatterns = [
     path("auth/register/", RegisterView.as_view(), name="auth_register"),
     path("auth/login/", LoginView.as_view(), name="auth_login"),
     path("auth/token/refresh/", CookieTokenRefreshView.as_view(), name="token_refresh"),
     path("auth/logout/", logout_view, name="auth_logout"),
+    path("auth/logout/all/", logout_all_view, name="auth_logout_all"),
     path("auth/me/", MeView.as_view(), name="auth_me"),
     path("therapist/profile/", TherapistProfileView.as_view(), name="therapist_profile"),
     path("auth/google/login/", GoogleLoginView.as_view(), name="auth_google_login"),
     path("verify-email/", VerifyEmailView.as_view(), name="verify_email"),
     path("resend-verification/", ResendVerificationView.as_view(), name="resend_verification"),
+    path("deletion-jobs/<uuid:token>/", DeletionJobStatusView.as_view(), name="deletion_job_status"),
 ]
@@ -1,8 +1,142 @@
+import json
+import logging
+import re
+import threading
+import time
+
+import jwt
 import requests
+from django.conf import settings
+from jwt.algorithms import RSAAlgorithm
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v3/userinfo"
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+JWKS_DEFAULT_MAX_AGE = 3600  # when Google sends no usable Cache-Control
+JWKS_REFRESH_MARGIN = 300  # refresh in the background this long before expiry
+JWKS_MIN_REFETCH_INTERVAL = 60  # unknown kid: refetch at most this often
+
+_http = None
+_http_lock = threading.Lock()
+
+
+def http_session() -> requests.Session:
+    """Shared keep-alive session for the (rare) calls to Google."""
+    global _http
+    with _http_lock:
+        if _http is None:
+            _http = requests.Session()
+            _http.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=1))
+        return _http
+
+
+def _max_age(cache_control: str) -> int:
+    match = re.search(r"max-age=(\d+)", cache_control or "")
+    return int(match.group(1)) if match else JWKS_DEFAULT_MAX_AGE
+
+
+class JWKSCache:
+    """
+    Signing keys from a JWKS endpoint, kept for as long as its Cache-Control
+    allows. Requests never wait on a fetch except on a cold start, an
+    expired set, or a key id we have not seen (key rotation).
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self._keys = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def _fetch(self) -> None:
+        response = http_session().get(self.url, timeout=5)
+        response.raise_for_status()
+        keys = {
+            jwk["kid"]: RSAAlgorithm.from_jwk(json.dumps(jwk))
+            for jwk in response.json().get("keys", [])
+            if jwk.get("kty") == "RSA"
+        }
+        now = time.monotonic()
+        self._keys = keys
+        self._fetched_at = now
+        self._expires_at = now + _max_age(response.headers.get("Cache-Control", ""))
+
+    def _refresh(self) -> None:
+        with self._lock:
+            if time.monotonic() >= self._fetched_at + JWKS_MIN_REFETCH_INTERVAL:
+                self._fetch()
+
+    def _refresh_in_background(self) -> None:
+        def run():
+            try:
+                self._refresh()
+            except Exception:
+                logger.warning("Background JWKS refresh from %s failed", self.url, exc_info=True)
+            finally:
+                self._refreshing = False
+
+        if not self._refreshing:
+            self._refreshing = True
+            threading.Thread(target=run, name="jwks-refresh", daemon=True).start()
+
+    def get_key(self, kid: str):
+        now = time.monotonic()
+        if now >= self._expires_at:
+            with self._lock:
+                if time.monotonic() >= self._expires_at:  # another thread may have fetched already
+                    self._fetch()
+        elif now >= self._expires_at - JWKS_REFRESH_MARGIN:
+            self._refresh_in_background()
+
+        key = self._keys.get(kid)
+        if key is None:
+            self._refresh()
+            key = self._keys.get(kid)
+        return key
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys, self._expires_at, self._fetched_at = {}, 0.0, 0.0
+
+
+google_jwks = JWKSCache(GOOGLE_CERTS_URL)
+
+
+def verify_google_id_token(id_token: str):
+    """
+    Verify a Google ID token locally (signature, audience, issuer, expiry).
+    Returns claims shaped like the userinfo response, or None.
+    """
+    try:
+        header = jwt.get_unverified_header(id_token)
+        key = google_jwks.get_key(header.get("kid", ""))
+        if key is None:
+            return None
+        claims = jwt.decode(
+            id_token,
+            key,
+            algorithms=["RS256"],
+            audience=settings.GOOGLE_CLIENT_IDS,
+            issuer=GOOGLE_ISSUERS,
+            leeway=30,
+        )
+    except (jwt.PyJWTError, requests.RequestException, ValueError):
+        return None
+
+    if not claims.get("email_verified"):
+        return None
+    return claims
+
 
 def verify_google_access_token(access_token: str):
-    response = requests.get(
-        "https://www.googleapis.com/oauth2/v3/userinfo",
+    response = http_session().get(
+        GOOGLE_USERINFO_URL,
         headers={"Authorization": f"Bearer {access_token}"},
         timeout=5,
     )
@@ -5,12 +5,14 @@ from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.contrib.auth import authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
-from .models import TherapistProfile, EmailVerification
-from .serializers import RegisterSerializer, TherapistProfileUpdateSerializer, UserPublicSerializer, TherapistProfileSerializer
+from .tokens import TherapistRefreshToken
+from .models import TherapistProfile, EmailVerification, DeletionJob
+from .serializers import RegisterSerializer, TherapistProfileUpdateSerializer, UserPublicSerializer, TherapistProfileSerializer, DeletionJobSerializer
+from .services import enqueue_verification_email, start_account_deletion
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
-from .tasks import send_verification_email
 from django.shortcuts import get_object_or_404
 
 
@@ -26,18 +28,17 @@ class RegisterView(APIView):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        user = serializer.save()
-        EmailVerification.objects.filter(user=user).delete()
+        # the outbox row commits with the user, so no verification email is ever lost
+        with transaction.atomic():
+            user = serializer.save()
+            EmailVerification.objects.filter(user=user).delete()
 
-        verification = EmailVerification.objects.create(
-        user=user,
-        expires_at=timezone.now() + timedelta(minutes=25),
-        )
+            verification = EmailVerification.objects.create(
+            user=user,
+            expires_at=timezone.now() + timedelta(minutes=25),
+            )
 
-        send_verification_email.delay(
-         user.email,
-         str(verification.token),
-         )
+            enqueue_verification_email(user.email, str(verification.token))
 
         return Response(
             {
@@ -61,8 +62,11 @@ class MeView(APIView):
 class TherapistProfileView(APIView):
     permission_classes = [IsAuthenticated]
 
-    def get_object(self, user):
-        profile, _ = TherapistProfile.objects.get_or_create(user=user)
+    def get_object(self, user, fresh=False):
+        # reads use the profile preloaded by CachedJWTAuthentication; writes reload the row
+        profile = None if fresh else getattr(user, "therapist_profile", None)
+        if profile is None:
+            profile, _ = TherapistProfile.objects.get_or_create(user=user)
         return profile
 
     def get(self, request):
@@ -71,7 +75,7 @@ class TherapistProfileView(APIView):
         return Response(serializer.data)
 
     def patch(self, request):
-        profile = self.get_object(request.user)
+        profile = self.get_object(request.user, fresh=True)
 
         serializer = TherapistProfileUpdateSerializer(
             profile,
@@ -100,9 +104,26 @@ class TherapistProfileView(APIView):
         )
 
     def delete(self, request):
-        user = request.user
-        user.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        # the account is locked out now; its data is purged by a background job
+        job = start_account_deletion(request.user)
+        return Response(
+            {
+                "detail": "Account deletion started.",
+                "token": str(job.token),
+                "status_url": f"/api/v1/deletion-jobs/{job.token}/",
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class DeletionJobStatusView(APIView):
+    # the requester may already be logged out (account deletion): the token is the credential
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request, token):
+        job = get_object_or_404(DeletionJob, token=token)
+        return Response(DeletionJobSerializer(job).data)
 
 
 # =========================
@@ -128,7 +149,7 @@ class VerifyEmailView(APIView):
         verification.used = True
         verification.save()
 
-        refresh = RefreshToken.for_user(user)
+        refresh = TherapistRefreshToken.for_user(user)
 
         return Response({
             "access": str(refresh.access_token),
@@ -162,16 +183,16 @@ class ResendVerificationView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        verification, _ = EmailVerification.objects.update_or_create(
-            user=user,
-            defaults={
-                "token": uuid.uuid4(),
-                "expires_at": timezone.now() + timedelta(minutes=30),
-                "used": False,
-            },
-        )
-
-        send_verification_email.delay(user.email, str(verification.token))
+        with transaction.atomic():
+            verification, _ = EmailVerification.objects.update_or_create(
+                user=user,
+                defaults={
+                    "token": uuid.uuid4(),
+                    "expires_at": timezone.now() + timedelta(minutes=30),
+                    "used": False,
+                },
+            )
+            enqueue_verification_email(user.email, str(verification.token))
 
         return Response(
             {"detail": "Verification email resent"},
@@ -18,4 +18,19 @@ export async function replaceSessionAudio(sessionId, file, languageCode) {
     return api.post(`/sessions/${sessionId}/replace-audio/`, formData, {
         headers: { "Content-Type": "multipart/form-data" },
     });
-}
\ No newline at end of file
+}
+/**
+ * Precomputed waveform peaks (WPK1 blob), or null while the worker is still on it.
+ * Decode with parseWaveformPeaks from utils/waveformPeaks.
+ */
+export async function getSessionAudioPeaks(sessionId) {
+    try {
+        const { data } = await api.get(`/sessions/${sessionId}/audio/peaks/`, {
+            responseType: "arraybuffer",
+        });
+        return data;
+    } catch (err) {
+        if (err?.response?.status === 404) return null;
+        throw err;
+    }
+}
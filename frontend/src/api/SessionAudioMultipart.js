@@ -2,15 +2,18 @@ import api from "./axiosInstance";
 
 /**
  * Start multipart upload for a session.
- * Backend returns: { uploadId, key, partSize }
+ * Pass `size` when known so the backend can pick the part size.
+ * Backend returns: { uploadId, key, partSize, partCount }
+ * (status 200 instead of 201 means an unfinished upload was handed back)
  */
-export async function startSessionAudioMultipart(sessionId, { filename, contentType } = {}) {
+export async function startSessionAudioMultipart(sessionId, { filename, contentType, size } = {}) {
     const payload = {};
     if (filename) payload.filename = filename;
     if (contentType) payload.content_type = contentType;
+    if (size != null) payload.size = size;
 
     const { data } = await api.post(`/sessions/${sessionId}/audio/multipart/start/`, payload);
-    return data; // { uploadId, key, partSize }
+    return data; // { uploadId, key, partSize, partCount }
 }
 
 /**
@@ -25,6 +28,30 @@ export async function presignSessionAudioPart(sessionId, { uploadId, partNumber
     return data; // { url, partNumber }
 }
 
+/**
+ * Presigned URLs for a range of parts in one request (inclusive).
+ * Backend returns: { parts: [{ partNumber, url }] }
+ */
+export async function presignSessionAudioParts(sessionId, { uploadId, firstPart, lastPart }) {
+    const { data } = await api.post(`/sessions/${sessionId}/audio/multipart/presign-batch/`, {
+        uploadId,
+        firstPart,
+        lastPart,
+    });
+    return data.parts;
+}
+
+/**
+ * Parts S3 already has, used to resume without re-uploading them.
+ * Backend returns: { uploadId, key, partSize, partCount, parts: [{ PartNumber, ETag, Size }] }
+ */
+export async function listSessionAudioParts(sessionId, { uploadId }) {
+    const { data } = await api.get(`/sessions/${sessionId}/audio/multipart/parts/`, {
+        params: { uploadId },
+    });
+    return data;
+}
+
 /**
  * Complete multipart upload (this triggers transcription on backend).
  * parts: [{ PartNumber, ETag }]
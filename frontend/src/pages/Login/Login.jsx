@@ -1,7 +1,7 @@
 import React, { useState } from "react";
 import { Link, useNavigate } from "react-router-dom";
 import { Mail, Lock } from "lucide-react";
-import { useGoogleLogin } from "@react-oauth/google";
+import { useGoogleLogin, useGoogleOneTapLogin } from "@react-oauth/google";
 import { FaGoogle } from "react-icons/fa";
 import { toast } from "react-toastify";
 
@@ -87,25 +87,32 @@ export default function Login() {
     }
   };
 
-  const googleLogin = useGoogleLogin({
-    onSuccess: async (tokenResponse) => {
-      try {
-        const { data } = await api.post("/auth/google/login/", {
-          access_token: tokenResponse.access_token,
-          remember_me: formik.values.remember_me,
+  const completeGoogleLogin = async (credentials) => {
+    try {
+      const { data } = await api.post("/auth/google/login/", {
+        ...credentials,
+        remember_me: formik.values.remember_me,
+      });
 
-        });
+      setAuth({
+        accessToken: data.access,
+        user: data.user,
+      });
 
-        setAuth({
-          accessToken: data.access,
-          user: data.user,
-        });
+      navigate("/dashboard", { replace: true });
+    } catch {
+      setError("Google login failed.");
+    }
+  };
 
-        navigate("/dashboard", { replace: true });
-      } catch {
-        setError("Google login failed.");
-      }
-    },
+  // One Tap hands us an ID token, which the backend verifies without calling Google
+  useGoogleOneTapLogin({
+    onSuccess: (credentialResponse) => completeGoogleLogin({ id_token: credentialResponse.credential }),
+    onError: () => {},
+  });
+
+  const googleLogin = useGoogleLogin({
+    onSuccess: (tokenResponse) => completeGoogleLogin({ access_token: tokenResponse.access_token }),
     onError: () => setError("Google login failed."),
   });
 
@@ -1,31 +1,96 @@
-import { uploadMultipartUnified } from "./unifiedMultipartUploader";
+import {
+    startSessionAudioMultipart,
+    presignSessionAudioParts,
+    listSessionAudioParts,
+    completeSessionAudioMultipart,
+} from "../api/SessionAudioMultipart";
+import { uploadPartToS3 } from "../utils/s3MultipartUpload";
 
+const PRESIGN_BATCH = 100;
+
+/**
+ * Upload a whole file with parallel parts.
+ * Parts S3 already holds (from an earlier attempt of the same upload) are skipped,
+ * so calling this again after a crash resumes instead of starting over.
+ */
 export async function uploadFileAudio({
     sessionId,
     file,
     languageCode,
     onProgress,
+    concurrency = 4,
+    maxRetriesPerPart = 3,
 }) {
-    const partSize = 10 * 1024 * 1024; // should match backend’s returned partSize ideally
-    let offset = 0;
+    const started = await startSessionAudioMultipart(sessionId, {
+        filename: file.name,
+        contentType: file.type || "application/octet-stream",
+        size: file.size,
+    });
+    const { uploadId, partSize } = started;
+    const partCount = Math.max(1, Math.ceil(file.size / partSize));
 
-    async function getNextChunk() {
-        if (offset >= file.size) return { blob: new Blob([]), isLast: true }; // won't happen normally
+    const done = new Map();
+    if (!started.partCount || started.partCount === partCount) {
+        const existing = await listSessionAudioParts(sessionId, { uploadId });
+        existing.parts.forEach((p) => done.set(p.PartNumber, p.ETag));
+    }
+
+    let uploadedBytes = [...done.keys()].reduce(
+        (sum, n) => sum + Math.min(partSize, file.size - (n - 1) * partSize),
+        0
+    );
+    onProgress?.(uploadedBytes / file.size);
 
-        const end = Math.min(offset + partSize, file.size);
-        const blob = file.slice(offset, end);
-        offset = end;
+    const pending = [];
+    for (let n = 1; n <= partCount; n++) if (!done.has(n)) pending.push(n);
 
-        const isLast = offset >= file.size;
-        return { blob, isLast };
+    const urls = new Map();
+    async function urlFor(partNumber) {
+        if (!urls.has(partNumber)) {
+            const batch = await presignSessionAudioParts(sessionId, {
+                uploadId,
+                firstPart: partNumber,
+                lastPart: Math.min(partNumber + PRESIGN_BATCH - 1, partCount),
+            });
+            batch.forEach(({ partNumber: n, url }) => urls.set(n, url));
+        }
+        return urls.get(partNumber);
     }
 
-    return uploadMultipartUnified({
-        sessionId,
-        filename: file.name,
-        contentType: file.type || "application/octet-stream",
+    async function worker() {
+        while (pending.length) {
+            const partNumber = pending.shift();
+            const start = (partNumber - 1) * partSize;
+            const blob = file.slice(start, Math.min(start + partSize, file.size));
+
+            for (let attempt = 1; ; attempt++) {
+                try {
+                    done.set(partNumber, await uploadPartToS3(await urlFor(partNumber), blob));
+                    break;
+                } catch (err) {
+                    if (attempt === maxRetriesPerPart) throw err;
+                    urls.delete(partNumber); // may have expired
+                }
+            }
+
+            uploadedBytes += blob.size;
+            onProgress?.(uploadedBytes / file.size);
+        }
+    }
+
+    // first batch up front so workers don't all presign the same range
+    if (pending.length) await urlFor(pending[0]);
+    await Promise.all(Array.from({ length: Math.min(concurrency, pending.length) }, worker));
+
+    const parts = [...done.entries()]
+        .sort(([a], [b]) => a - b)
+        .map(([PartNumber, ETag]) => ({ PartNumber, ETag }));
+
+    // no abort on failure: the upload stays resumable until the next attempt
+    return completeSessionAudioMultipart(sessionId, {
+        uploadId,
+        parts,
+        originalFilename: file.name,
         languageCode,
-        getNextChunk,
-        onProgress: (bytes) => onProgress?.(bytes / file.size),
     });
-}
\ No newline at end of file
+}
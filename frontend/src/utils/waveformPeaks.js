@@ -0,0 +1,49 @@
+/**
+ * Decode a WPK1 peaks blob (see backend therapy_sessions/services/waveform.py).
+ * Returns { sampleRate, totalSamples, duration, levels: [{ samplesPerPeak, mins, maxs }] }
+ * with mins/maxs normalised to -1..1, finest level first.
+ */
+export function parseWaveformPeaks(buffer) {
+    const view = new DataView(buffer);
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== "WPK1") throw new Error("Not a WPK1 peaks blob");
+
+    const bits = view.getUint8(4);
+    const levelCount = view.getUint8(5);
+    const sampleRate = view.getUint32(8, true);
+    const totalSamples = Number(view.getBigUint64(12, true));
+
+    const scale = bits === 8 ? 128 : 32768;
+    let offset = 20 + levelCount * 8;
+    const levels = [];
+
+    for (let i = 0; i < levelCount; i++) {
+        const samplesPerPeak = view.getUint32(20 + i * 8, true);
+        const count = view.getUint32(24 + i * 8, true);
+        const mins = new Float32Array(count);
+        const maxs = new Float32Array(count);
+
+        for (let p = 0; p < count; p++) {
+            if (bits === 8) {
+                mins[p] = view.getInt8(offset) / scale;
+                maxs[p] = view.getInt8(offset + 1) / scale;
+                offset += 2;
+            } else {
+                mins[p] = view.getInt16(offset, true) / scale;
+                maxs[p] = view.getInt16(offset + 2, true) / scale;
+                offset += 4;
+            }
+        }
+        levels.push({ samplesPerPeak, mins, maxs });
+    }
+
+    return { sampleRate, totalSamples, duration: totalSamples / sampleRate, levels };
+}
+
+/**
+ * Coarsest level that still gives at least one peak per pixel.
+ */
+export function pickPeakLevel(peaks, widthPx) {
+    const fitting = peaks.levels.filter((l) => l.mins.length >= widthPx);
+    return fitting.length ? fitting[fitting.length - 1] : peaks.levels[0];
+}